@@ -1,38 +1,127 @@
 from flask import Flask
 from flask_cors import CORS
-from flasgger import Swagger
 from dotenv import load_dotenv
 import os
-from .extensions import db, migrate
+from werkzeug.middleware.proxy_fix import ProxyFix
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS
+from .extensions import db, migrate, cache, password_hasher
 from .routes.auth_routes import auth_bp
 from . import models
 from .routes.hotel_routes import hotel_bp
-from flask_jwt_extended import JWTManager
+from .routes.metrics_routes import metrics_bp
+from .utils.metrics import register_metrics
+from .commands import register_commands
+from .utils.auth import verified_tokens, reset_token_user
+from .utils.google_auth import google_certs, GOOGLE_CERTS_URL
+from .utils.rate_limit import limiter
+from .utils.database import engine_options, pool_stats, reset_replica_routing
+from .utils.apidocs import LazySwagger
+from .utils.fastjson import FastJSONProvider
+from .utils.http_cache import compress_response
+from .utils.weekend_feed import weekend_feed
 
 
 def create_app():
     load_dotenv()
 
     app = Flask(__name__)
+    # orjson varsa jsonify onunla kodlar (app/utils/fastjson.py)
+    app.json = FastJSONProvider(app)
 
     CORS(app, resources={r"/*": {"origins": [
         "http://localhost:4200",
         "https://hotel-frontend-lemon.vercel.app"
-    ]}}, supports_credentials=True)
+    ]}}, supports_credentials=True, expose_headers=["X-Next-Cursor"])
 
     app.config['SQLALCHEMY_DATABASE_URI'] = os.getenv("DATABASE_URL")
+    # Havuz ayarları DB_POOL_* / DB_STATEMENT_TIMEOUT_MS ortam değişkenlerinden (app/utils/database.py)
+    app.config["SQLALCHEMY_ENGINE_OPTIONS"] = engine_options(app.config['SQLALCHEMY_DATABASE_URI'])
+    replica_url = os.getenv("DATABASE_REPLICA_URL")
+    if replica_url:
+        # GET otel/yorum uçlarının okumaları bu bind'a gider
+        app.config["SQLALCHEMY_BINDS"] = {"replica": {"url": replica_url, **engine_options(replica_url)}}
     app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 
+    # Sayfalama
+    app.config["PAGE_SIZE"] = int(os.getenv("PAGE_SIZE", 10))
+    app.config["MAX_PAGE_SIZE"] = int(os.getenv("MAX_PAGE_SIZE", 50))
+    app.config["NEARBY_MAX_RADIUS_KM"] = float(os.getenv("NEARBY_MAX_RADIUS_KM", 100))
+    # GET /hotels/batch ile tek istekte istenebilecek otel sayısı
+    app.config["HOTEL_BATCH_MAX"] = int(os.getenv("HOTEL_BATCH_MAX", 50))
+    # ?format=ndjson yorum dışa aktarımında tek seferde okunan yorum sayısı
+    app.config["COMMENTS_EXPORT_CHUNK"] = int(os.getenv("COMMENTS_EXPORT_CHUNK", 1000))
+    # POST /comments/import: istek başına en fazla yorum ve tek insert'teki satır sayısı
+    app.config["COMMENTS_IMPORT_MAX"] = int(os.getenv("COMMENTS_IMPORT_MAX", 10000))
+    app.config["COMMENTS_IMPORT_BATCH"] = int(os.getenv("COMMENTS_IMPORT_BATCH", 1000))
+    # Haftasonu vitrini: liste boyutu; önbellek kapalıyken yenileme aralığı (sn)
+    app.config["WEEKEND_FEED_SIZE"] = int(os.getenv("WEEKEND_FEED_SIZE", 3))
+    app.config["WEEKEND_FEED_MAX_AGE"] = int(os.getenv("WEEKEND_FEED_MAX_AGE", 300))
+
+    # Önbellek: memory:// (worker başına), sqlite:///yol (makinedeki worker'lar ortak),
+    # redis://host:port/db (sunucular arası ortak) veya null:// (kapalı)
+    app.config["CACHE_URL"] = os.getenv("CACHE_URL", "memory://")
+    app.config["CACHE_DEFAULT_TTL"] = int(os.getenv("CACHE_DEFAULT_TTL", 60))
+    app.config["CACHE_MAX_ENTRIES"] = int(os.getenv("CACHE_MAX_ENTRIES", 1024))
+    app.config["CACHE_KEY_PREFIX"] = os.getenv("CACHE_KEY_PREFIX", "hotel")
+    # Sürüm sayaçlarının ömrü (saniye); kullanılmayan sayaçlar bu sürede silinir
+    app.config["CACHE_VERSION_TTL"] = int(os.getenv("CACHE_VERSION_TTL", 86400))
+    # Yazmadan sonra bu kadar saniye, o sürüme bağlanacak okumalar replika yerine birincilden
+    app.config["REPLICA_MAX_LAG"] = int(os.getenv("REPLICA_MAX_LAG", 5))
+
+    # Yanıt sıkıştırma (br varsa, yoksa gzip); bu boyutun altındaki gövdeler olduğu gibi gider
+    app.config["COMPRESS_ENABLED"] = os.getenv("COMPRESS_ENABLED", "1") not in ("0", "false", "False")
+    app.config["COMPRESS_MIN_SIZE"] = int(os.getenv("COMPRESS_MIN_SIZE", 1024))
+    app.config["COMPRESS_LEVEL"] = int(os.getenv("COMPRESS_LEVEL", 6))
+    app.config["COMPRESS_BROTLI_QUALITY"] = int(os.getenv("COMPRESS_BROTLI_QUALITY", 4))
+
     db.init_app(app)
     migrate.init_app(app, db)
+    cache.init_app(app)
+    register_metrics("cache", cache.stats)
+    register_metrics("db_pool", pool_stats(db))
+
+    # ✅ JWT CONFIG (tek doğrulama katmanı: app/utils/auth.py)
+    app.config["SECRET_KEY"] = os.getenv("SECRET_KEY")
+    # Kullanıcı token sürümünün önbellekte tutulma süresi (paylaşılmayan önbellekte iptal gecikmesi)
+    app.config["TOKEN_VERSION_TTL"] = int(os.getenv("TOKEN_VERSION_TTL", 300))
+    # Doğrulanmış token LRU boyutu
+    app.config["TOKEN_CACHE_SIZE"] = int(os.getenv("TOKEN_CACHE_SIZE", 4096))
+
+    # Parola hash'leme havuzu: iterasyon sayısı değişirse eski hash'ler girişte yenilenir
+    app.config["PASSWORD_HASH_ITERATIONS"] = int(os.getenv("PASSWORD_HASH_ITERATIONS", DEFAULT_PBKDF2_ITERATIONS))
+    app.config["PASSWORD_HASH_WORKERS"] = int(os.getenv("PASSWORD_HASH_WORKERS", 2))
+    app.config["PASSWORD_HASH_QUEUE"] = int(os.getenv("PASSWORD_HASH_QUEUE", 8))
+    app.config["PASSWORD_HASH_TIMEOUT"] = float(os.getenv("PASSWORD_HASH_TIMEOUT", 10))
+
+    # Hız sınırı: "memory" (worker başına) ya da "cache" (CACHE_URL arka ucu, paylaşılan)
+    app.config["RATE_LIMIT_ENABLED"] = os.getenv("RATE_LIMIT_ENABLED", "1") not in ("0", "false", "False")
+    app.config["RATE_LIMIT_STORAGE"] = os.getenv("RATE_LIMIT_STORAGE", "memory")
+    # Önümüzdeki güvenilir proxy sayısı (Render'da 1). remote_addr ve şema X-Forwarded-*
+    # başlıklarının sondan bu kadar adımından okunur; yoksa IP başına sınırlar proxy'nin
+    # tek adresine, yani tüm siteye uygulanır. Proxy'siz doğrudan yayında 0 verilmeli
+    # (yoksa istemci X-Forwarded-For ile adresini seçebilir)
+    app.config["TRUSTED_PROXY_COUNT"] = int(os.getenv("TRUSTED_PROXY_COUNT", 1))
+    if app.config["TRUSTED_PROXY_COUNT"] > 0:
+        hops = app.config["TRUSTED_PROXY_COUNT"]
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=hops, x_proto=hops)
 
-    # ✅ JWT CONFIG
-    app.config["JWT_SECRET_KEY"] = os.getenv("SECRET_KEY")
-    app.config["JWT_TOKEN_LOCATION"] = ["headers"]
-    app.config["JWT_HEADER_NAME"] = "Authorization"
-    app.config["JWT_HEADER_TYPE"] = "Bearer"
+    # Google login: verilirse token'ın aud claim'i bu client id ile eşleşmeli
+    app.config["GOOGLE_CLIENT_ID"] = os.getenv("GOOGLE_CLIENT_ID")
+    app.config["GOOGLE_CERTS_URL"] = os.getenv("GOOGLE_CERTS_URL", GOOGLE_CERTS_URL)
 
-    JWTManager(app)
+    verified_tokens.init_app(app)
+    google_certs.init_app(app)
+    password_hasher.init_app(app)
+    limiter.init_app(app)
+    register_metrics("rate_limit", limiter.stats)
+    register_metrics("password_hashing", password_hasher.stats)
+    register_metrics("google_certs", google_certs.stats)
+    app.before_request(reset_token_user)
+    app.before_request(reset_replica_routing)
+    app.after_request(compress_response)
+    register_metrics("auth", verified_tokens.stats)
+    weekend_feed.init_app(app)
+    register_metrics("weekend_feed", weekend_feed.stats)
 
     swagger_template = {
         "swagger": "2.0",
@@ -71,13 +160,15 @@ def create_app():
         "specs_route": "/apidocs/"
     }
 
-    Swagger(app, template=swagger_template, config=swagger_config)
+    # Spec ilk /apidocs isteğinde üretilir (app/utils/apidocs.py)
+    LazySwagger(swagger_template, swagger_config).init_app(app)
 
     app.register_blueprint(auth_bp, url_prefix="/auth")
     app.register_blueprint(hotel_bp)
+    app.register_blueprint(metrics_bp)
+    register_commands(app)
 
-    with app.app_context():
-        db.create_all()
+    # Şema açılışta oluşturulmaz; tablolar `flask db upgrade` (migrations/) ile kurulur
 
     @app.route('/')
     def home():
@@ -0,0 +1,49 @@
+import click
+from flask.cli import with_appcontext
+from .extensions import db
+from .models import User
+from .utils.review_stats import rebuild_review_stats
+from .utils.auth import revoke_user_tokens, publish_token_version
+
+
+@click.command("rebuild-review-stats")
+@click.option("--hotel-id", "hotel_ids", type=int, multiple=True, help="Sadece verilen otelleri yeniden hesapla")
+@with_appcontext
+def rebuild_review_stats_command(hotel_ids):
+    """Otel yorum istatistiklerini Comment/Rating tablolarından yeniden hesaplar."""
+    count = rebuild_review_stats(list(hotel_ids) or None)
+    db.session.commit()
+    click.echo(f"{count} otelin yorum istatistikleri güncellendi")
+
+
+@click.command("revoke-tokens")
+@click.argument("email")
+@with_appcontext
+def revoke_tokens_command(email):
+    """Kullanıcının mevcut tüm token'larını geçersiz kılar."""
+    user = User.query.filter_by(email=email).first()
+    if not user:
+        raise click.ClickException("Kullanıcı bulunamadı")
+    revoke_user_tokens(user)
+    click.echo(f"{email} için token'lar iptal edildi")
+
+
+@click.command("set-admin")
+@click.argument("email")
+@click.option("--revoke", is_flag=True, help="Admin yetkisini geri al")
+@with_appcontext
+def set_admin_command(email, revoke):
+    """Admin yetkisi verir/alır; eski token'lar yeni sürümle geçersiz olur."""
+    user = User.query.filter_by(email=email).first()
+    if not user:
+        raise click.ClickException("Kullanıcı bulunamadı")
+    user.is_admin = not revoke
+    db.session.commit()
+    publish_token_version(user.id, user.token_version)
+    click.echo(f"{email} admin: {user.is_admin}")
+
+
+def register_commands(app):
+    app.cli.add_command(rebuild_review_stats_command)
+    app.cli.add_command(revoke_tokens_command)
+    app.cli.add_command(set_admin_command)
@@ -1,5 +1,11 @@
 from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
+from .utils.cache import Cache
+from .utils.passwords import PasswordHasher
+from .utils.database import RoutingSession
 
-db = SQLAlchemy()
+# GET isteklerinde okumaları replikaya yönlendirebilmek için (app/utils/database.py)
+db = SQLAlchemy(session_options={"class_": RoutingSession})
 migrate = Migrate()
+cache = Cache()
+password_hasher = PasswordHasher()
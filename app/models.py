@@ -1,4 +1,5 @@
 from . import db
+from .utils.text import normalize_search_text
 
 class User(db.Model):
     __tablename__ = 'users'
@@ -12,8 +13,17 @@ class User(db.Model):
     profile_image_url = db.Column(db.Text, nullable=True)
     is_google_user = db.Column(db.Boolean, default=False)
     is_admin = db.Column(db.Boolean, default=False)
+    # Token'lardaki "ver" claim'i ile karşılaştırılır; artınca eski token'lar geçersiz olur
+    token_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
     comments = db.relationship('Comment', backref='user', lazy=True)
 
+    @db.validates('is_admin')
+    def _revoke_on_role_change(self, key, value):
+        # Admin yetkisi değişirse token'daki is_admin claim'i artık doğru değil
+        if self.id is not None and bool(self.is_admin) != bool(value):
+            self.token_version = (self.token_version or 0) + 1
+        return value
+
 class Hotel(db.Model):
     __tablename__ = 'hotels'
     id = db.Column(db.Integer, primary_key=True)
@@ -30,17 +40,55 @@ class Hotel(db.Model):
     amenities = db.relationship('HotelAmenity', backref='hotel', lazy=True)
     available_on_weekend = db.Column(db.Boolean, default=False)  # Dummy boolean örnek
     country = db.Column(db.String(100))
+    search_text = db.Column(db.String(150))  # location'ın küçük harfli, aksansız hali
+
+    @db.validates('location')
+    def _sync_search_text(self, key, value):
+        self.search_text = normalize_search_text(value)
+        return value
+
+# Sıralama anahtarları get_hotels'teki keyset sayfalama ile aynı ifadeler olmalı
+db.Index('ix_hotels_rating_sort', db.func.coalesce(Hotel.rating, 0), Hotel.id)
+db.Index('ix_hotels_price_sort', db.func.coalesce(Hotel.price, 0), Hotel.id)
+
+# Konum araması: Postgres'te pg_trgm GIN index, SQLite'ta FTS5 tablosu (trigger'larla senkron)
+db.event.listen(db.metadata, 'before_create', db.DDL(
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+).execute_if(dialect='postgresql'))
+db.Index('ix_hotels_search_text_trgm', Hotel.search_text,
+         postgresql_using='gin', postgresql_ops={'search_text': 'gin_trgm_ops'}).ddl_if(dialect='postgresql')
+
+HOTEL_SEARCH_SQLITE_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS hotel_search USING fts5(search_text, content='hotels', content_rowid='id')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS hotel_search_vocab USING fts5vocab(hotel_search, 'row')",
+    "CREATE TRIGGER IF NOT EXISTS hotels_search_ai AFTER INSERT ON hotels BEGIN "
+    "INSERT INTO hotel_search(rowid, search_text) VALUES (new.id, new.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS hotels_search_ad AFTER DELETE ON hotels BEGIN "
+    "INSERT INTO hotel_search(hotel_search, rowid, search_text) VALUES ('delete', old.id, old.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS hotels_search_au AFTER UPDATE OF search_text ON hotels BEGIN "
+    "INSERT INTO hotel_search(hotel_search, rowid, search_text) VALUES ('delete', old.id, old.search_text); "
+    "INSERT INTO hotel_search(rowid, search_text) VALUES (new.id, new.search_text); END",
+]
+for _statement in HOTEL_SEARCH_SQLITE_DDL:
+    db.event.listen(Hotel.__table__, 'after_create', db.DDL(_statement).execute_if(dialect='sqlite'))
+
 class Amenity(db.Model):
     __tablename__ = 'amenities'
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(100))
     hotels = db.relationship('HotelAmenity', backref='amenity', lazy=True)
+    __table_args__ = (
+        db.UniqueConstraint('name', name='uq_amenities_name'),
+    )
 
 class HotelAmenity(db.Model):
     __tablename__ = 'hotel_amenities'
     id = db.Column(db.Integer, primary_key=True)
     hotel_id = db.Column(db.Integer, db.ForeignKey('hotels.id', ondelete='CASCADE'))
-    amenity_id = db.Column(db.Integer, db.ForeignKey('amenities.id', ondelete='CASCADE'))
+    amenity_id = db.Column(db.Integer, db.ForeignKey('amenities.id', ondelete='CASCADE'), index=True)
+    __table_args__ = (
+        db.UniqueConstraint('hotel_id', 'amenity_id', name='uq_hotel_amenities_hotel_amenity'),
+    )
 
 class Comment(db.Model):
     __tablename__ = 'comments'
@@ -50,6 +98,9 @@ class Comment(db.Model):
     comment = db.Column(db.Text)
     created_at = db.Column(db.DateTime, server_default=db.func.current_timestamp())
     rating = db.relationship('Rating', backref='comment', uselist=False)
+    __table_args__ = (
+        db.Index('ix_comments_hotel_id_created_at', 'hotel_id', 'created_at', 'id'),
+    )
 
 class Rating(db.Model):
     __tablename__ = 'ratings'
@@ -60,11 +111,31 @@ class Rating(db.Model):
     facilities = db.Column(db.Float)
     location = db.Column(db.Float)
     eco_friendliness = db.Column(db.Float)
+    __table_args__ = (
+        db.UniqueConstraint('comment_id', name='uq_ratings_comment_id'),
+    )
 
 
-class HotelAvailability(db.Model):
-    __tablename__ = 'hotel_availabilities'
+class HotelAvailabilityMonth(db.Model):
+    __tablename__ = 'hotel_availability_months'
     id = db.Column(db.Integer, primary_key=True)
-    hotel_id = db.Column(db.Integer, db.ForeignKey('hotels.id', ondelete='CASCADE'))
-    date = db.Column(db.Date, nullable=False)
-    is_available = db.Column(db.Boolean, default=True)
+    hotel_id = db.Column(db.Integer, db.ForeignKey('hotels.id', ondelete='CASCADE'), nullable=False)
+    month = db.Column(db.Date, nullable=False)  # ayın ilk günü
+    available_mask = db.Column(db.Integer, nullable=False, default=0)  # bit i -> ayın (i+1). günü müsait
+    __table_args__ = (
+        db.UniqueConstraint('hotel_id', 'month', name='uq_hotel_availability_months_hotel_month'),
+        db.Index('ix_hotel_availability_months_month_hotel', 'month', 'hotel_id', 'available_mask'),
+    )
+
+
+class HotelReviewStats(db.Model):
+    __tablename__ = 'hotel_review_stats'
+    hotel_id = db.Column(db.Integer, db.ForeignKey('hotels.id', ondelete='CASCADE'), primary_key=True)
+    comment_count = db.Column(db.Integer, nullable=False, default=0)
+    rating_count = db.Column(db.Integer, nullable=False, default=0)
+    cleanliness_sum = db.Column(db.Float, nullable=False, default=0)
+    service_sum = db.Column(db.Float, nullable=False, default=0)
+    facilities_sum = db.Column(db.Float, nullable=False, default=0)
+    location_sum = db.Column(db.Float, nullable=False, default=0)
+    eco_friendliness_sum = db.Column(db.Float, nullable=False, default=0)
+    rating_average = db.Column(db.Float)  # beş boyutun genel ortalaması
@@ -1,15 +1,21 @@
-from google.oauth2 import id_token
-from google.auth.transport import requests as grequests
-from flask import Blueprint, request, jsonify
-from werkzeug.security import generate_password_hash, check_password_hash
+from flask import Blueprint, request, jsonify, current_app
 from .. import db
+from app.extensions import password_hasher
+from app.utils.passwords import PasswordHasherBusy
+from app.utils.rate_limit import rate_limit, json_email
 from app.models import User
 from app.utils.auth import generate_token
-from flasgger import swag_from
+from app.utils.google_auth import verify_google_id_token
+from app.utils.apidocs import swag_from
 
 
 auth_bp = Blueprint("auth", __name__)
 
+
+def _hashing_busy():
+    # Hash havuzu dolu: isteği bekletmek yerine hemen geri çevir
+    return jsonify({"error": "Server is busy, please try again"}), 503, {"Retry-After": "1"}
+
 @auth_bp.route("/register", methods=["POST"])
 @swag_from({
     'tags': ['Auth'],
@@ -39,11 +45,18 @@ auth_bp = Blueprint("auth", __name__)
         400: {
             'description': 'Missing fields'
         },
+        503: {
+            'description': 'Password hashing pool is saturated, retry later'
+        },
         409: {
             'description': 'Email already registered'
+        },
+        429: {
+            'description': 'Too many attempts'
         }
     }
 })
+@rate_limit("register_ip", 10, 60)
 def register():
     data = request.get_json()
     email = data.get("email")
@@ -59,7 +72,10 @@ def register():
     if User.query.filter_by(email=email).first():
         return jsonify({"error": "Email already registered"}), 409
 
-    hashed_pw = generate_password_hash(password, method='pbkdf2:sha256')
+    try:
+        hashed_pw = password_hasher.hash(password)
+    except PasswordHasherBusy:
+        return _hashing_busy()
     new_user = User(
         email=email,
         password_hash=hashed_pw,
@@ -98,17 +114,36 @@ def register():
         },
         401: {
             'description': 'Invalid credentials'
+        },
+        429: {
+            'description': 'Too many attempts'
+        },
+        503: {
+            'description': 'Password hashing pool is saturated, retry later'
         }
     }
 })
+@rate_limit("login_ip", 20, 60)
+@rate_limit("login_email", 5, 60, key=json_email)
 def login():
     data = request.get_json()
     email = data.get("email")
     password = data.get("password")
 
     user = User.query.filter_by(email=email).first()
-    if not user or not check_password_hash(user.password_hash, password):
-        return jsonify({"error": "Invalid credentials"}), 401
+    try:
+        if not user or not password_hasher.verify(user.password_hash, password):
+            return jsonify({"error": "Invalid credentials"}), 401
+    except PasswordHasherBusy:
+        return _hashing_busy()
+
+    if password_hasher.needs_rehash(user.password_hash):
+        # Hash ayarları değişmiş: parola elimizdeyken yeni ayarlarla yeniden hash'le
+        try:
+            user.password_hash = password_hasher.rehash(password)
+            db.session.commit()
+        except PasswordHasherBusy:
+            pass
 
     token = generate_token(user)
     return jsonify({"token": token, "user": {
@@ -148,15 +183,20 @@ def login():
         },
         401: {
             'description': 'Geçersiz ID token'
+        },
+        429: {
+            'description': 'Too many attempts'
         }
     }
 })
+@rate_limit("google_login_ip", 20, 60)
 def google_login():
     data = request.get_json()
     token = data.get("id_token")
 
     try:
-        idinfo = id_token.verify_oauth2_token(token, grequests.Request(), audience=None)
+        # Sertifikalar bellekte tutulur; istek başına Google'a gidilmez
+        idinfo = verify_google_id_token(token, audience=current_app.config.get("GOOGLE_CLIENT_ID"))
         email = idinfo['email']
         first_name = idinfo.get('given_name', '')
         last_name = idinfo.get('family_name', '')
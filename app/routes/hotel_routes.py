@@ -1,19 +1,197 @@
-from flask import Blueprint, request, jsonify
-from app.models import Hotel, Comment, HotelAmenity, Amenity, Rating, HotelAvailability
-from .. import db
-from flasgger import swag_from
+from flask import Blueprint, request, jsonify, current_app, stream_with_context
+from app.models import Hotel, Comment, HotelAmenity, Amenity, Rating
+from .. import db, cache
+from app.utils.apidocs import swag_from
 from app.utils.auth import admin_required
 from app.models import Comment, Rating
-from app.utils.auth import token_required
-from flask_jwt_extended import get_jwt_identity, jwt_required
+from app.utils.auth import token_required, optional_token_user, current_token_user
 from app.models import User
-from datetime import datetime, timedelta
+from datetime import datetime, timezone
 from sqlalchemy import func
+from app.utils.review_stats import RATING_FIELDS, record_comment, stats_for, average_ratings
+from app.utils.comment_import import insert_comments
+from app.utils.pagination import InvalidCursor, encode_cursor, decode_cursor, page_size, keyset_filter, keyset_order
+from app.utils.search import location_search
+from app.utils.text import normalize_search_text
+from app.utils.geo import nearby_hotels, hotel_grid
+from app.utils.availability import available_hotel_ids, set_availability, apply_availability
+from app.utils.database import reading_replica, use_replica, use_primary
+from app.utils.http_cache import make_etag, not_modified, with_etag
+from app.utils.serializers import HOTEL_KEYS, COMMENT_SORT_KEY, hotel_rows, hotel_summary, comment_rows, comment_item
+from app.utils.weekend_feed import weekend_feed
+import math
+import time
 
 hotel_bp = Blueprint("hotels", __name__)
 
+
+@hotel_bp.before_request
+def _route_reads_to_replica():
+    # DATABASE_REPLICA_URL verilmişse GET otel/yorum uçlarının sorguları replikadan okunur
+    if request.method == "GET":
+        use_replica()
+
+NEARBY_CHUNK_SIZE = 500
+
+
+def _review_stats_for(hotel_ids):
+    # hotel_id -> (yorum sayısı, ortalama rating); önceden hesaplanmış istatistiklerden
+    return {
+        hotel_id: (stats.comment_count, stats.rating_average)
+        for hotel_id, stats in stats_for(hotel_ids).items()
+    }
+
+
+def _hotel_sort_key(sort, lat=None, lng=None):
+    # (sıralama ifadesi, azalan mı); NULL değerler her veritabanında aynı sıralansın diye coalesce
+    if sort == "rating":
+        return func.coalesce(Hotel.rating, 0), True
+    if sort == "price":
+        return func.coalesce(Hotel.price, 0), False
+    if sort == "distance":
+        # Eşdikdörtgen yaklaşım: sıralama için mesafenin karesi yeterli, trigonometri gerekmez
+        dx = (Hotel.longitude - lng) * math.cos(math.radians(lat))
+        dy = Hotel.latitude - lat
+        return dx * dx + dy * dy, False
+    raise ValueError(sort)
+
+
+def _amenity_names_for(hotel_ids):
+    # hotel_id -> [olanak adları]; tek JOIN sorgusu
+    if not hotel_ids:
+        return {}
+    rows = db.session.query(HotelAmenity.hotel_id, Amenity.name)\
+        .join(Amenity, HotelAmenity.amenity_id == Amenity.id)\
+        .filter(HotelAmenity.hotel_id.in_(hotel_ids))\
+        .order_by(HotelAmenity.id).all()
+    result = {}
+    for hotel_id, name in rows:
+        result.setdefault(hotel_id, []).append(name)
+    return result
+
+
+def _primary_after_write(names):
+    # Son REPLICA_MAX_LAG saniyede yazılan sürüme bağlanacak veri birincil DB'den okunur:
+    # replika gecikirse eski veri yeni sürümle saklanır, sonraki yazmaya kadar 304 ile dönerdi.
+    # Diğer okumalar replikada kalır; sürüm değişince eski kayıtlar zaten okunmaz
+    if reading_replica() and cache.written_recently(names):
+        use_primary()
+
+
+def _versions(names, create=True):
+    versions = cache.versions(names, create=create)
+    if versions is not None:
+        _primary_after_write(names)
+    return versions
+
+
+def _cached_for_hotel(name, hotel_id, build, *parts, missing=None):
+    # Otel sürümüne bağlı önbellek + ETag. İstemcideki sürüm güncelse 304 (build çağrılmaz);
+    # build None dönerse (otel yok) önbelleğe yazılmaz, missing verilmişse 200 ile o gövde,
+    # yoksa 404 döner. parts: sayfa gibi ek anahtar parçaları
+    versions = _versions([f"hotel:{hotel_id}"], create=False)
+    if versions is None:
+        value, etag = build(), None
+    elif versions[0] is None:
+        # Sayaç yok: önce kayıt doğrulanır, sayaç yalnızca var olan otel için açılır.
+        # Bu yanıt önbelleğe yazılmaz (sayaçtan önce okunan veri yeni sürüme bağlanmasın)
+        value, etag = build(), None
+        if value is not None:
+            cache.versions([f"hotel:{hotel_id}"])
+    else:
+        etag = make_etag(name, hotel_id, versions[0], *parts)
+        response = not_modified(etag)
+        if response is not None:
+            return response
+        key = cache.key(name, hotel_id, versions[0], *parts)
+        value = cache.get(key)
+        if value is None:
+            value = build()
+            if value is not None:
+                cache.set(key, value)
+    if value is None:
+        if missing is not None:
+            return jsonify(missing), 200
+        return jsonify({"error": "Otel bulunamadı"}), 404
+    return with_etag(jsonify(value), etag), 200
+
+
+def _cached_search(parts, has_dates):
+    # Arama önbelleği okuma: anahtar genel sürümlere, kayıt da içindeki otellerin sürümlerine bağlı
+    names = ["hotels", "availability"] if has_dates else ["hotels"]
+    versions = _versions(names)
+    if versions is None:
+        return None, None
+    key = cache.key("search", *versions, *parts)
+    entry = cache.get(key)
+    if entry is not None:
+        hotel_names = [f"hotel:{hotel_id}" for hotel_id, _ in entry["hotels"]]
+        hotel_versions = cache.versions(hotel_names, create=False)
+        if hotel_versions != [version for _, version in entry["hotels"]]:
+            _primary_after_write(hotel_names)
+            entry = None
+    return key, entry
+
+
+def _store_search(key, items, next_cursor):
+    # Kaydedilen girdiyi döner; önbellek yoksa "hotels" (otel sürümleri) olmadan
+    entry = {"items": items, "next_cursor": next_cursor}
+    if key is None:
+        return entry
+    hotel_ids = [item["id"] for item in items]
+    names = [f"hotel:{hotel_id}" for hotel_id in hotel_ids]
+    hotel_versions = cache.versions(names)
+    if hotel_versions is None:
+        return entry
+    if reading_replica() and cache.written_recently(names):
+        # Sonuçlar replikadan okundu, içindeki bir otel az önce değişti: sürüme bağlanmaz
+        return entry
+    entry["hotels"] = list(zip(hotel_ids, hotel_versions))
+    cache.set(key, entry)
+    return entry
+
+
+def _search_etag(key, entry, guests, user_id):
+    # Aynı sorgu ve genel sürümler (key), aynı otel sürümleri, aynı kişiselleştirme
+    if key is None or "hotels" not in entry:
+        return None
+    return make_etag(key, entry["hotels"], guests, bool(user_id))
+
+
+def _search_items(hotels):
+    # Arama sonuçlarının misafir ve kullanıcıdan bağımsız kısmı (önbelleğe alınabilir);
+    # yorum sayısı, ortalama rating ve olanaklar tek seferde
+    hotel_ids = [hotel.id for hotel in hotels]
+    review_stats = _review_stats_for(hotel_ids)
+    amenity_map = _amenity_names_for(hotel_ids)
+
+    return [
+        hotel_summary(hotel, review_stats.get(hotel.id, (0, None)), amenity_map.get(hotel.id, []))
+        for hotel in hotels
+    ]
+
+
+def _personalize(items, guests, user_id):
+    # Misafir sayısına göre fiyat ve üye fiyatı; her istekte önbellekteki kopyanın üzerine uygulanır
+    result = []
+    for item in items:
+        base_price = item["price"]
+        total_price = base_price * guests if guests else base_price
+
+        member_price = None
+        if user_id and item["discount_percent"]:
+            member_price = round(total_price * (100 - item["discount_percent"]) / 100)
+
+        result.append({
+            **item,
+            "price": round(total_price, 2),
+            "member_price": member_price,
+            "message": "Üye fiyatı için giriş yapın" if item["is_flagged"] and not user_id else ""
+        })
+    return result
+
+
 @hotel_bp.route("/hotels", methods=["GET"])
-@jwt_required(optional=True)
 @swag_from({
     'tags': ['Hotels'],
     'parameters': [
@@ -22,7 +200,7 @@ hotel_bp = Blueprint("hotels", __name__)
             'in': 'query',
             'type': 'string',
             'required': False,
-            'description': 'Otelin bulunduğu şehir'
+            'description': 'Otelin bulunduğu şehir; aksan duyarsız, önek ve yazım hatası toleranslı'
         },
         {
             'name': 'guests',
@@ -44,11 +222,59 @@ hotel_bp = Blueprint("hotels", __name__)
             'type': 'string',
             'required': False,
             'description': 'Check-out tarihi (YYYY-MM-DD)'
+        },
+        {
+            'name': 'sort',
+            'in': 'query',
+            'type': 'string',
+            'enum': ['relevance', 'rating', 'price', 'distance'],
+            'required': False,
+            'description': 'Sıralama (city varsa relevance, yoksa rating); distance için lat ve lng gerekli'
+        },
+        {
+            'name': 'lat',
+            'in': 'query',
+            'type': 'number',
+            'required': False,
+            'description': 'Mesafe sıralaması için enlem'
+        },
+        {
+            'name': 'lng',
+            'in': 'query',
+            'type': 'number',
+            'required': False,
+            'description': 'Mesafe sıralaması için boylam'
+        },
+        {
+            'name': 'limit',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'description': 'Sayfa boyutu (MAX_PAGE_SIZE ile sınırlı)'
+        },
+        {
+            'name': 'cursor',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Önceki yanıtın X-Next-Cursor başlığındaki değer'
         }
     ],
     'responses': {
         200: {
-            'description': 'Otel listesi başarıyla getirildi'
+            'description': 'Otel listesi başarıyla getirildi',
+            'headers': {
+                'X-Next-Cursor': {
+                    'type': 'string',
+                    'description': 'Sonraki sayfa için cursor; son sayfada gönderilmez'
+                }
+            }
+        },
+        400: {
+            'description': 'Geçersiz sıralama veya cursor'
+        },
+        304: {
+            'description': 'Değişmedi (If-None-Match ETag ile eşleşti); gövde yok'
         }
     }
 })
@@ -61,118 +287,188 @@ def get_hotels():
     start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date() if start_date_str else None
     end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date() if end_date_str else None
 
-    user_id = None
-    try:
-        user_id = get_jwt_identity()
-    except:
-        pass
-
-    query = Hotel.query
-
-    if city:
-        query = query.filter(Hotel.location.ilike(f"%{city}%"))
-
-    if start_date and end_date:
-        selected_dates = [(start_date + timedelta(days=i)) for i in range((end_date - start_date).days + 1)]
-        subquery = db.session.query(HotelAvailability.hotel_id).filter(
-            HotelAvailability.date.in_(selected_dates),
-            HotelAvailability.is_available == True
-        ).group_by(HotelAvailability.hotel_id).having(
-            db.func.count(HotelAvailability.hotel_id) == len(selected_dates)
-        ).subquery()
-        query = query.filter(Hotel.id.in_(subquery))
-
-    hotels = query.order_by(Hotel.rating.desc()).limit(10).all()
-
-    result = []
-    for hotel in hotels:
-        base_price = hotel.price
-        total_price = base_price * guests if guests else base_price
-
-        member_price = None
-        if user_id and hotel.discount_percent:
-            member_price = round(total_price * (100 - hotel.discount_percent) / 100)
+    user = optional_token_user()
+    user_id = user.id if user else None
+
+    sort = request.args.get("sort", "relevance" if city else "rating")
+    lat = request.args.get("lat", type=float)
+    lng = request.args.get("lng", type=float)
+    cursor = request.args.get("cursor")
+    limit = page_size()
+    if sort not in ("rating", "price", "distance", "relevance") or (sort == "relevance" and not city):
+        return jsonify({"error": "Geçersiz sıralama"}), 400
+    if sort == "distance" and (lat is None or lng is None):
+        return jsonify({"error": "Mesafe sıralaması için lat ve lng gerekli"}), 400
+
+    has_dates = bool(start_date and end_date)
+    cache_key, cached = _cached_search((
+        normalize_search_text(city).strip() if city else None,
+        start_date.isoformat() if has_dates else None,
+        end_date.isoformat() if has_dates else None,
+        sort, lat, lng, cursor, limit
+    ), has_dates)
+
+    if cached is None:
+        query = hotel_rows()
+
+        relevance = None
+        if city:
+            query, relevance = location_search(query, city)
+
+        if has_dates:
+            query = query.filter(Hotel.id.in_(available_hotel_ids(start_date, end_date)))
+
+        if sort == "distance":
+            query = query.filter(Hotel.latitude.isnot(None), Hotel.longitude.isnot(None))
+
+        if sort == "relevance":
+            sort_key, descending = relevance
+        else:
+            sort_key, descending = _hotel_sort_key(sort, lat, lng)
+
+        if cursor:
+            try:
+                cursor_sort, last_key, last_id = decode_cursor(cursor)
+            except (InvalidCursor, ValueError):
+                return jsonify({"error": "Geçersiz cursor"}), 400
+            if cursor_sort != sort or not isinstance(last_id, int) or not isinstance(last_key, (int, float)):
+                return jsonify({"error": "Geçersiz cursor"}), 400
+            query = query.filter(keyset_filter(sort_key, Hotel.id, last_key, last_id, descending))
+
+        hotels = query.add_columns(sort_key.label("sort_key"))\
+            .order_by(*keyset_order(sort_key, Hotel.id, descending))\
+            .limit(limit + 1).all()
+
+        next_cursor = None
+        if len(hotels) > limit:
+            hotels = hotels[:limit]
+            next_cursor = encode_cursor(sort, hotels[-1].sort_key, hotels[-1].id)
+
+        cached = _store_search(cache_key, _search_items(hotels), next_cursor)
+
+    etag = _search_etag(cache_key, cached, guests, user_id)
+    response = not_modified(etag)
+    if response is not None:
+        return response
+
+    next_cursor = cached["next_cursor"]
+    result = _personalize(cached["items"], guests, user_id)
+
+    response = with_etag(jsonify(result), etag)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response, 200
+
+#nearby hotels
+
+@hotel_bp.route("/hotels/nearby", methods=["GET"])
+@swag_from({
+    'tags': ['Hotels'],
+    'parameters': [
+        {'name': 'lat', 'in': 'query', 'type': 'number', 'required': True, 'description': 'Enlem'},
+        {'name': 'lng', 'in': 'query', 'type': 'number', 'required': True, 'description': 'Boylam'},
+        {
+            'name': 'radius_km',
+            'in': 'query',
+            'type': 'number',
+            'required': False,
+            'description': 'Arama yarıçapı (km, varsayılan 10, NEARBY_MAX_RADIUS_KM ile sınırlı)'
+        },
+        {'name': 'city', 'in': 'query', 'type': 'string', 'required': False, 'description': 'Otelin bulunduğu şehir'},
+        {'name': 'guests', 'in': 'query', 'type': 'integer', 'required': False, 'description': 'Misafir sayısı'},
+        {'name': 'start_date', 'in': 'query', 'type': 'string', 'required': False, 'description': 'Check-in tarihi (YYYY-MM-DD)'},
+        {'name': 'end_date', 'in': 'query', 'type': 'string', 'required': False, 'description': 'Check-out tarihi (YYYY-MM-DD)'},
+        {'name': 'limit', 'in': 'query', 'type': 'integer', 'required': False, 'description': 'Sayfa boyutu'},
+        {'name': 'cursor', 'in': 'query', 'type': 'string', 'required': False, 'description': 'Önceki yanıtın X-Next-Cursor başlığındaki değer'}
+    ],
+    'responses': {
+        200: {
+            'description': 'Yakındaki oteller, yakından uzağa sıralı (distance_km alanı ile)',
+            'headers': {
+                'X-Next-Cursor': {'type': 'string', 'description': 'Sonraki sayfa için cursor'}
+            }
+        },
+        400: {'description': 'Eksik veya geçersiz parametre'}
+    }
+})
+def get_nearby_hotels():
+    lat = request.args.get("lat", type=float)
+    lng = request.args.get("lng", type=float)
+    radius_km = request.args.get("radius_km", 10.0, type=float)
+    city = request.args.get("city")
+    guests = request.args.get("guests", type=int)
+    start_date_str = request.args.get("start_date")
+    end_date_str = request.args.get("end_date")
 
-        # Yorum sayısı
-        comment_count = Comment.query.filter_by(hotel_id=hotel.id).count()
+    if lat is None or lng is None or not -90 <= lat <= 90 or not -180 <= lng <= 180:
+        return jsonify({"error": "Geçerli lat ve lng gerekli"}), 400
+    if radius_km <= 0:
+        return jsonify({"error": "radius_km pozitif olmalı"}), 400
+    radius_km = min(radius_km, current_app.config["NEARBY_MAX_RADIUS_KM"])
 
-        # Ortalama rating
-        avg_rating = db.session.query(func.avg(
-            (Rating.cleanliness + Rating.service + Rating.facilities + Rating.location + Rating.eco_friendliness) / 5
-        )).join(Comment, Rating.comment_id == Comment.id).filter(Comment.hotel_id == hotel.id).scalar()
+    try:
+        start_date = datetime.strptime(start_date_str, "%Y-%m-%d").date() if start_date_str else None
+        end_date = datetime.strptime(end_date_str, "%Y-%m-%d").date() if end_date_str else None
+    except ValueError:
+        return jsonify({"error": "Tarih formatı YYYY-MM-DD olmalı"}), 400
 
-        # Olanaklar
-        amenity_names = [ha.amenity.name for ha in hotel.amenities if ha.amenity]
+    user = optional_token_user()
+    user_id = user.id if user else None
 
-        result.append({
-            "id": hotel.id,
-            "name": hotel.name,
-            "location": hotel.location,
-            "price": round(total_price, 2),
-            "rating": hotel.rating,
-            "rating_average": round(avg_rating, 1) if avg_rating else None,
-            "comment_count": comment_count,
-            "amenities": amenity_names,
-            "image_url": hotel.image_url,
-            "latitude": hotel.latitude,
-            "longitude": hotel.longitude,
-            "is_flagged": hotel.is_flagged,
-            "discount_percent": hotel.discount_percent,
-            "member_price": member_price,
-            "message": "Üye fiyatı için giriş yapın" if hotel.is_flagged and not user_id else ""
-        })
+    # Izgara worker'a özel; "hotels" sürümü başka worker'da eklenen oteli de yeniden yükletir
+    versions = _versions(["hotels"])
+    candidates = nearby_hotels(lat, lng, radius_km, versions[0] if versions else None)
 
-    return jsonify(result), 200
+    cursor = request.args.get("cursor")
+    if cursor:
+        try:
+            cursor_sort, last_distance, last_id = decode_cursor(cursor)
+        except (InvalidCursor, ValueError):
+            return jsonify({"error": "Geçersiz cursor"}), 400
+        if cursor_sort != "nearby" or not isinstance(last_id, int) or not isinstance(last_distance, (int, float)):
+            return jsonify({"error": "Geçersiz cursor"}), 400
+        candidates = [c for c in candidates if c > (last_distance, last_id)]
+
+    query = hotel_rows()
+    if city:
+        query, _ = location_search(query, city)
+    if start_date and end_date:
+        query = query.filter(Hotel.id.in_(available_hotel_ids(start_date, end_date)))
+
+    # Adaylar yakından uzağa; filtreleri parça parça uygula, sayfa dolunca dur
+    limit = page_size()
+    page = []
+    for i in range(0, len(candidates), NEARBY_CHUNK_SIZE):
+        chunk = candidates[i:i + NEARBY_CHUNK_SIZE]
+        found = {hotel.id: hotel for hotel in query.filter(Hotel.id.in_([hotel_id for _, hotel_id in chunk]))}
+        page.extend((distance, found[hotel_id]) for distance, hotel_id in chunk if hotel_id in found)
+        if len(page) > limit:
+            break
+
+    next_cursor = None
+    if len(page) > limit:
+        page = page[:limit]
+        last_distance, last_hotel = page[-1]
+        next_cursor = encode_cursor("nearby", last_distance, last_hotel.id)
+
+    result = _personalize(_search_items([hotel for _, hotel in page]), guests, user_id)
+    for item, (distance, _) in zip(result, page):
+        item["distance_km"] = round(distance, 2)
+
+    response = jsonify(result)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    return response, 200
 
 #get hotels weekend
 
 @hotel_bp.route("/hotels/weekend", methods=["GET"])
-@jwt_required(optional=True)
 def get_weekend_hotels():
-    user_id = None
-    try:
-        user_id = get_jwt_identity()
-    except:
-        pass
-
-    hotels = Hotel.query.filter_by(available_on_weekend=True)\
-        .order_by(Hotel.rating.desc())\
-        .limit(3).all()
-
-    result = []
-    for hotel in hotels:
-        base_price = hotel.price
-        member_price = None
-        if user_id and hotel.discount_percent:
-            member_price = round(base_price * (100 - hotel.discount_percent) / 100)
-
-        # Ortalama rating
-        avg_rating = db.session.query(func.avg(
-            (Rating.cleanliness + Rating.service + Rating.facilities + Rating.location + Rating.eco_friendliness) / 5
-        )).join(Comment, Rating.comment_id == Comment.id).filter(Comment.hotel_id == hotel.id).scalar()
-
-        comment_count = Comment.query.filter_by(hotel_id=hotel.id).count()
-        amenity_names = [ha.amenity.name for ha in hotel.amenities if ha.amenity]
-
-        result.append({
-            "id": hotel.id,
-            "name": hotel.name,
-            "location": hotel.location,
-            "price": round(base_price, 2),
-            "rating": hotel.rating,
-            "rating_average": round(avg_rating, 1) if avg_rating else None,
-            "comment_count": comment_count,
-            "amenities": amenity_names,
-            "image_url": hotel.image_url,
-            "latitude": hotel.latitude,
-            "longitude": hotel.longitude,
-            "is_flagged": hotel.is_flagged,
-            "discount_percent": hotel.discount_percent,
-            "member_price": member_price,
-            "message": "Üye fiyatı için giriş yapın" if hotel.is_flagged and not user_id else ""
-        })
+    user = optional_token_user()
+    user_id = user.id if user else None
 
-    return jsonify(result), 200
+    # Bellekteki haftasonu listesi (app/utils/weekend_feed.py); istek başına sorgu yok
+    return jsonify(_personalize(weekend_feed.items(_search_items), None, user_id)), 200
 
 
 #POST HOTELS
@@ -230,6 +526,8 @@ def add_hotel():
 
         db.session.add(new_hotel)
         db.session.commit()
+        hotel_grid.invalidate()
+        cache.bump("hotels")
 
         return jsonify({"message": "Yeni otel başarıyla eklendi"}), 201
 
@@ -237,6 +535,96 @@ def add_hotel():
         return jsonify({"error": str(e)}), 400
     
 
+    #GET HOTELS BATCH
+
+@hotel_bp.route("/hotels/batch", methods=["GET"])
+@swag_from({
+    'tags': ['Hotels'],
+    'parameters': [
+        {
+            'name': 'ids',
+            'in': 'query',
+            'type': 'string',
+            'required': True,
+            'description': 'Virgülle ayrılmış otel ID değerleri (ör. 1,2,3); en fazla HOTEL_BATCH_MAX'
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Otel detayları id ile eşlenmiş halde; bulunamayan id değerleri missing listesinde',
+            'examples': {
+                'application/json': {
+                    "hotels": {
+                        "1": {"id": 1, "name": "Mersin Deluxe Hotel", "rating_average": 9.1, "comment_count": 3}
+                    },
+                    "missing": [3]
+                }
+            }
+        },
+        400: {
+            'description': 'Geçersiz ya da çok uzun id listesi'
+        },
+        304: {
+            'description': 'Değişmedi (If-None-Match ETag ile eşleşti); gövde yok'
+        }
+    }
+})
+def get_hotels_batch():
+    try:
+        hotel_ids = list(dict.fromkeys(int(part) for part in request.args.get("ids", "").split(",") if part.strip()))
+    except ValueError:
+        return jsonify({"error": "Geçersiz id listesi"}), 400
+    if not hotel_ids:
+        return jsonify({"error": "ids gerekli"}), 400
+    max_ids = current_app.config["HOTEL_BATCH_MAX"]
+    if len(hotel_ids) > max_ids:
+        return jsonify({"error": f"En fazla {max_ids} otel istenebilir"}), 400
+
+    # Tek tek /hotels/<id> ile aynı önbellek kayıtları; eksikler tek seferde kurulur.
+    # "hotels" sürümü: yeni otel eklenince bulunamayan id listesi de geçersiz olsun.
+    # Otel sayaçları burada açılmaz (var olmayan id'ler için sayaç birikmesin); sayacı
+    # olmayan id'ler DB'den okunur, bulunanların sayacı sonra açılır
+    names = [f"hotel:{hotel_id}" for hotel_id in hotel_ids]
+    versions = cache.versions(["hotels"])
+    if versions is not None:
+        hotel_versions = cache.versions(names, create=False)
+        versions = None if hotel_versions is None else versions + hotel_versions
+    if versions is not None:
+        _primary_after_write(["hotels", *names])
+    etag = None
+    details = {}
+    version_of = {}
+    if versions is not None:
+        etag = make_etag("hotel-batch", hotel_ids, versions)
+        response = not_modified(etag)
+        if response is not None:
+            return response
+        version_of = {hotel_id: version for hotel_id, version in zip(hotel_ids, versions[1:]) if version is not None}
+        keys = [cache.key("hotel", hotel_id, version) for hotel_id, version in version_of.items()]
+        details = {hotel_id: value for hotel_id, value in zip(version_of, cache.get_values(keys)) if value is not None}
+
+    missing = [hotel_id for hotel_id in hotel_ids if hotel_id not in details]
+    if missing:
+        built = _hotel_details(missing)
+        unversioned = []
+        for hotel_id, detail in built.items():
+            details[hotel_id] = detail
+            if hotel_id in version_of:
+                cache.set(cache.key("hotel", hotel_id, version_of[hotel_id]), detail)
+            else:
+                unversioned.append(hotel_id)
+        if versions is not None and unversioned:
+            # Sayacı yeni açılan otel: bu yanıt o sürüme bağlanamaz, ETag verilmez
+            cache.versions([f"hotel:{hotel_id}" for hotel_id in unversioned])
+            etag = None
+        missing = [hotel_id for hotel_id in missing if hotel_id not in built]
+
+    return with_etag(jsonify({
+        "hotels": {str(hotel_id): details[hotel_id] for hotel_id in hotel_ids if hotel_id in details},
+        "missing": missing
+    }), etag), 200
+
+
     #GET HOTELS BY ID
 
 @hotel_bp.route("/hotels/<int:hotel_id>", methods=["GET"])
@@ -268,39 +656,30 @@ def add_hotel():
         },
         404: {
             'description': 'Otel bulunamadı'
+        },
+        304: {
+            'description': 'Değişmedi (If-None-Match ETag ile eşleşti); gövde yok'
         }
     }
 })
 def get_hotel_by_id(hotel_id):
-    hotel = Hotel.query.get(hotel_id)
-    if not hotel:
-        return jsonify({"error": "Otel bulunamadı"}), 404
+    return _cached_for_hotel("hotel", hotel_id, lambda: _hotel_detail(hotel_id))
 
-    comments = Comment.query.filter_by(hotel_id=hotel_id).all()
-    comment_count = len(comments)
-    if comment_count > 0:
-        rating_avg = sum(c.rating.service + c.rating.cleanliness + c.rating.facilities + c.rating.location + c.rating.eco_friendliness for c in comments if c.rating) / (comment_count * 5)
-    else:
-        rating_avg = None
 
-    amenity_links = HotelAmenity.query.filter_by(hotel_id=hotel_id).all()
-    amenity_names = [a.amenity.name for a in amenity_links]
+def _hotel_detail(hotel_id):
+    return _hotel_details([hotel_id]).get(hotel_id)
 
-    return jsonify({
-        "id": hotel.id,
-        "name": hotel.name,
-        "location": hotel.location,
-        "price": hotel.price,
-        "rating": hotel.rating,
-        "rating_average": round(rating_avg, 2) if rating_avg else None,
-        "comment_count": comment_count,
-        "image_url": hotel.image_url,
-        "latitude": hotel.latitude,
-        "longitude": hotel.longitude,
-        "is_flagged": hotel.is_flagged,
-        "discount_percent": hotel.discount_percent,
-        "amenities": amenity_names
-    }), 200
+
+def _hotel_details(hotel_ids):
+    # hotel_id -> detay; kaç id olursa olsun 3 sorgu (oteller, yorum istatistikleri, olanaklar)
+    hotels = hotel_rows().filter(Hotel.id.in_(hotel_ids)).all()
+    found_ids = [hotel.id for hotel in hotels]
+    review_stats = _review_stats_for(found_ids)
+    amenity_map = _amenity_names_for(found_ids)
+    return {
+        hotel.id: hotel_summary(hotel, review_stats.get(hotel.id, (0, None)), amenity_map.get(hotel.id, []), digits=2)
+        for hotel in hotels
+    }
 
 #POST COMMENT
 
@@ -337,32 +716,182 @@ def post_comment(current_user):
     data = request.get_json()
 
     try:
-        comment = Comment(
-            user_id=current_user.id,
-            hotel_id=data["hotel_id"],
-            comment=data["comment"]
-        )
-        db.session.add(comment)
-        db.session.commit()
-
+        # Yorum, puanı ve istatistik güncellemesi tek transaction'da: puansız yorum kalmaz
         rating = Rating(
-            comment_id=comment.id,
             cleanliness=data["cleanliness"],
             service=data["service"],
             facilities=data["facilities"],
             location=data["location"],
             eco_friendliness=data["eco_friendliness"]
         )
-        db.session.add(rating)
+        comment = Comment(
+            user_id=current_user.id,
+            hotel_id=data["hotel_id"],
+            comment=data["comment"],
+            rating=rating
+        )
+        db.session.add(comment)
+        db.session.flush()
+        record_comment(comment.hotel_id, rating)
         db.session.commit()
+        cache.bump(f"hotel:{comment.hotel_id}")
 
         return jsonify({"message": "Yorum başarıyla eklendi"}), 201
 
     except Exception as e:
+        db.session.rollback()
         return jsonify({"error": str(e)}), 400
-    
 
 
+#bulk comment import (partner review migration)
+@hotel_bp.route("/comments/import", methods=["POST"])
+@swag_from({
+    'tags': ['Comments'],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'comments': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'hotel_id': {'type': 'integer', 'example': 1},
+                                'user_id': {'type': 'integer', 'example': 5,
+                                            'description': 'Verilmezse yorum aktarımı yapan admin adına yazılır'},
+                                'comment': {'type': 'string', 'example': 'Temiz ve sessiz bir otel'},
+                                'created_at': {'type': 'string', 'example': '2024-08-14T10:30:00',
+                                               'description': 'ISO 8601; verilmezse aktarım zamanı'},
+                                'cleanliness': {'type': 'number', 'example': 9},
+                                'service': {'type': 'number', 'example': 8},
+                                'facilities': {'type': 'number', 'example': 8},
+                                'location': {'type': 'number', 'example': 10},
+                                'eco_friendliness': {'type': 'number', 'example': 7}
+                            },
+                            'required': ['hotel_id', 'comment', 'cleanliness', 'service', 'facilities',
+                                         'location', 'eco_friendliness']
+                        }
+                    }
+                },
+                'required': ['comments']
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Geçerli yorumlar tek transaction\'da eklendi; hatalı satırlar errors listesinde',
+            'examples': {
+                'application/json': {
+                    "imported": 4998,
+                    "errors": [{"index": 17, "error": "Otel bulunamadı"},
+                               {"index": 250, "error": "service sayı olmalı"}],
+                    "hotels": 42,
+                    "elapsed_ms": 412.5,
+                    "rows_per_second": 12116
+                }
+            }
+        },
+        400: {'description': 'Geçersiz giriş ya da COMMENTS_IMPORT_MAX aşıldı'}
+    }
+})
+@admin_required
+def import_comments():
+    started = time.perf_counter()
+    data = request.get_json(silent=True) or {}
+    items = data.get("comments")
+    if not isinstance(items, list):
+        return jsonify({"error": "comments listesi gerekli"}), 400
+    maximum = current_app.config["COMMENTS_IMPORT_MAX"]
+    if len(items) > maximum:
+        return jsonify({"error": f"En fazla {maximum} yorum aktarılabilir"}), 400
+
+    admin, _ = current_token_user()
+    entries = []
+    errors = []
+    for index, item in enumerate(items):
+        try:
+            entries.append((index, _import_record(item, admin.id)))
+        except ValueError as e:
+            errors.append({"index": index, "error": str(e)})
+
+    # Otel ve kullanıcı varlığını tek sorguda kontrol et
+    hotel_ids = {comment["hotel_id"] for _, (comment, _) in entries}
+    user_ids = {comment["user_id"] for _, (comment, _) in entries}
+    known_hotels = {
+        row.id for row in db.session.query(Hotel.id).filter(Hotel.id.in_(hotel_ids))
+    } if hotel_ids else set()
+    known_users = {
+        row.id for row in db.session.query(User.id).filter(User.id.in_(user_ids))
+    } if user_ids else set()
+
+    records = []
+    for index, (comment, rating) in entries:
+        if comment["hotel_id"] not in known_hotels:
+            errors.append({"index": index, "error": "Otel bulunamadı"})
+        elif comment["user_id"] not in known_users:
+            errors.append({"index": index, "error": "Kullanıcı bulunamadı"})
+        else:
+            records.append((comment, rating))
+
+    try:
+        touched = insert_comments(records, current_app.config["COMMENTS_IMPORT_BATCH"])
+        db.session.commit()
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
+    if touched:
+        cache.bump(*(f"hotel:{hotel_id}" for hotel_id in touched))
+
+    elapsed = time.perf_counter() - started
+    errors.sort(key=lambda e: e["index"])
+    return jsonify({
+        "imported": len(records),
+        "errors": errors,
+        "hotels": len(touched),
+        "elapsed_ms": round(elapsed * 1000, 1),
+        "rows_per_second": round(len(records) / elapsed)
+    }), 200
+
+
+def _import_record(item, default_user_id):
+    # Aktarılan satırı (yorum, puan) sütun sözlüklerine çevirir; hatalı alanda ValueError
+    if not isinstance(item, dict):
+        raise ValueError("Satır bir nesne olmalı")
+    for field in ("hotel_id", "comment"):
+        if item.get(field) in (None, ""):
+            raise ValueError(f"{field} gerekli")
+    user_id = item.get("user_id", default_user_id)
+    for value in (item["hotel_id"], user_id):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError("hotel_id ve user_id tam sayı olmalı")
+    if not isinstance(item["comment"], str):
+        raise ValueError("comment metin olmalı")
+
+    comment = {"user_id": user_id, "hotel_id": item["hotel_id"], "comment": item["comment"]}
+    if item.get("created_at") is not None:
+        try:
+            created_at = datetime.fromisoformat(item["created_at"])
+        except (TypeError, ValueError):
+            raise ValueError("created_at ISO 8601 tarih olmalı")
+        if created_at.tzinfo is not None:
+            # Sunucu varsayılanı gibi UTC, saat dilimsiz sakla
+            created_at = created_at.astimezone(timezone.utc).replace(tzinfo=None)
+        comment["created_at"] = created_at
+
+    rating = {}
+    for field in RATING_FIELDS:
+        value = item.get(field)
+        if value is None:
+            raise ValueError(f"{field} gerekli")
+        if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            raise ValueError(f"{field} sayı olmalı")
+        rating[field] = value
+    return comment, rating
+
 
 @hotel_bp.route("/comments/<int:hotel_id>", methods=["GET"])
 @swag_from({
@@ -374,6 +903,28 @@ def post_comment(current_user):
             'type': 'integer',
             'required': True,
             'description': 'Yorumları getirilecek otelin ID’si'
+        },
+        {
+            'name': 'limit',
+            'in': 'query',
+            'type': 'integer',
+            'required': False,
+            'description': 'Sayfa boyutu (varsayılan PAGE_SIZE, en fazla MAX_PAGE_SIZE)'
+        },
+        {
+            'name': 'cursor',
+            'in': 'query',
+            'type': 'string',
+            'required': False,
+            'description': 'Önceki yanıttaki next_cursor; yorumlar en yeniden eskiye'
+        },
+        {
+            'name': 'format',
+            'in': 'query',
+            'type': 'string',
+            'enum': ['ndjson'],
+            'required': False,
+            'description': 'ndjson: tüm yorumlar satır başına bir JSON olarak akış halinde (dışa aktarma)'
         }
     ],
     'responses': {
@@ -401,55 +952,83 @@ def post_comment(current_user):
                                 "eco_friendliness": 8
                             }
                         }
-                    ]
+                    ],
+                    "next_cursor": "WyJjb21tZW50cyIsIjIwMjUtMDYtMjggMTQ6MDA6MDAiLDEyXQ"
                 }
             }
+        },
+        400: {
+            'description': 'Geçersiz cursor'
+        },
+        304: {
+            'description': 'Değişmedi (If-None-Match ETag ile eşleşti); gövde yok'
         }
     }
 })
 def get_comments_by_hotel(hotel_id):
-    comments = Comment.query.filter_by(hotel_id=hotel_id).all()
-    if not comments:
-        return jsonify({"comments": [], "average_ratings": {}}), 200
-
-    totals = {
-        "cleanliness": 0,
-        "service": 0,
-        "facilities": 0,
-        "location": 0,
-        "eco_friendliness": 0
+    cursor = request.args.get("cursor")
+    after = None
+    if cursor:
+        try:
+            cursor_sort, last_key, last_id = decode_cursor(cursor)
+        except (InvalidCursor, ValueError):
+            return jsonify({"error": "Geçersiz cursor"}), 400
+        if cursor_sort != "comments" or not isinstance(last_id, int) or not isinstance(last_key, str):
+            return jsonify({"error": "Geçersiz cursor"}), 400
+        after = (last_key, last_id)
+
+    if request.args.get("format") == "ndjson":
+        return _stream_comments(hotel_id, after)
+
+    limit = page_size()
+    # Olmayan otel yorumsuz otel gibi boş liste alır (sürüm sayacı açılmaz)
+    empty = {"average_ratings": average_ratings(None), "comments": [], "next_cursor": None}
+    return _cached_for_hotel("comments", hotel_id, lambda: _hotel_comments(hotel_id, after, limit),
+                             cursor, limit, missing=empty)
+
+
+def _comments_after(query, after):
+    if after is None:
+        return query
+    return query.filter(keyset_filter(COMMENT_SORT_KEY, Comment.id, after[0], after[1], True))
+
+
+def _hotel_comments(hotel_id, after, limit):
+    # Ortalamalar tüm yorumlardan (istatistik satırı), sayfadan değil
+    rows = _comments_after(comment_rows(hotel_id), after).limit(limit + 1).all()
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor("comments", str(rows[-1].sort_key), rows[-1].id)
+    stats = stats_for([hotel_id]).get(hotel_id)
+    if not rows and stats is None and not db.session.query(Hotel.id).filter(Hotel.id == hotel_id).first():
+        # Yorumsuz otel ile olmayan oteli ayır: olmayan otel için sürüm sayacı açılmaz
+        return None
+    return {
+        "average_ratings": average_ratings(stats),
+        "comments": [comment_item(row) for row in rows],
+        "next_cursor": next_cursor
     }
-    count = 0
-    comment_list = []
-
-    for c in comments:
-        if c.rating:
-            count += 1
-            totals["cleanliness"] += c.rating.cleanliness
-            totals["service"] += c.rating.service
-            totals["facilities"] += c.rating.facilities
-            totals["location"] += c.rating.location
-            totals["eco_friendliness"] += c.rating.eco_friendliness
-
-            comment_list.append({
-                "user": f"{c.user.first_name} {c.user.last_name}",
-                "comment": c.comment,
-                "created_at": c.created_at.strftime("%Y-%m-%d %H:%M:%S"),
-                "ratings": {
-                    "cleanliness": c.rating.cleanliness,
-                    "service": c.rating.service,
-                    "facilities": c.rating.facilities,
-                    "location": c.rating.location,
-                    "eco_friendliness": c.rating.eco_friendliness
-                }
-            })
 
-    avg_ratings = {k: round(v / count, 1) for k, v in totals.items()}
 
-    return jsonify({
-        "average_ratings": avg_ratings,
-        "comments": comment_list
-    }), 200
+def _stream_comments(hotel_id, after):
+    # Dışa aktarma: satır başına bir yorum (NDJSON). Yorumlar COMMENTS_EXPORT_CHUNK'lık
+    # parçalarla okunur; bellek parça boyutuyla sınırlı, parça yazılırken DB bağlantısı tutulmaz
+    chunk_size = current_app.config["COMMENTS_EXPORT_CHUNK"]
+
+    def generate():
+        last = after
+        while True:
+            rows = _comments_after(comment_rows(hotel_id), last).limit(chunk_size).all()
+            # Bağlantıyı havuza bırak: yavaş istemci indirirken bağlantı meşgul kalmasın
+            db.session.rollback()
+            if rows:
+                yield "".join(current_app.json.dumps(comment_item(row)) + "\n" for row in rows)
+            if len(rows) < chunk_size:
+                return
+            last = (str(rows[-1].sort_key), rows[-1].id)
+
+    return current_app.response_class(stream_with_context(generate()), mimetype="application/x-ndjson")
 
 
 #AVAILABILITY
@@ -465,38 +1044,14 @@ def get_comments_by_hotel(hotel_id):
 })
 def get_available_weekend_hotels():
     # Eğer kullanıcı login olduysa token'dan ülkesini al
-    user_country = None
-    token = request.headers.get("Authorization")
-    if token and "Bearer" in token:
-        try:
-            import jwt
-            token_data = jwt.decode(token.replace("Bearer ", ""), os.getenv("SECRET_KEY"), algorithms=["HS256"])
-            user = User.query.get(token_data["user_id"])
-            user_country = user.country
-        except:
-            pass
-
-    query = Hotel.query.filter_by(available_on_weekend=True)
-
-    if user_country:
-        query = query.filter(Hotel.country == user_country)
-
-    hotels = query.order_by(Hotel.rating.desc()).limit(3).all()
+    user = optional_token_user()
+    user_country = user.country if user else None
 
     result = []
-    for h in hotels:
+    for item in weekend_feed.items(_search_items, user_country):
         result.append({
-            "id": h.id,
-            "name": h.name,
-            "location": h.location,
-            "price": h.price,
-            "rating": h.rating,
-            "image_url": h.image_url,
-            "latitude": h.latitude,
-            "longitude": h.longitude,
-            "is_flagged": h.is_flagged,
-            "discount_percent": h.discount_percent,
-            "message": "Üye fiyatı için giriş yapın" if h.is_flagged and not user_country else ""
+            **{key: item[key] for key in HOTEL_KEYS},
+            "message": "Üye fiyatı için giriş yapın" if item["is_flagged"] and not user_country else ""
         })
 
     return jsonify(result), 200
@@ -531,16 +1086,21 @@ def get_available_weekend_hotels():
         },
         404: {
             'description': 'Otel bulunamadı'
+        },
+        304: {
+            'description': 'Değişmedi (If-None-Match ETag ile eşleşti); gövde yok'
         }
     }
 })
 def get_amenities(hotel_id):
+    return _cached_for_hotel("amenities", hotel_id, lambda: _hotel_amenities(hotel_id))
+
+
+def _hotel_amenities(hotel_id):
     hotel = Hotel.query.get(hotel_id)
     if not hotel:
-        return jsonify({"error": "Otel bulunamadı"}), 404
-
-    amenities = [ha.amenity.name for ha in hotel.amenities if ha.amenity]
-    return jsonify(amenities), 200
+        return None
+    return [ha.amenity.name for ha in hotel.amenities if ha.amenity]
 
 
 
@@ -605,6 +1165,7 @@ def add_amenities_to_hotel(hotel_id):
             db.session.add(HotelAmenity(hotel_id=hotel.id, amenity_id=amenity.id))
 
     db.session.commit()
+    cache.bump(f"hotel:{hotel.id}")
     return jsonify({"message": "Olanaklar başarıyla eklendi"}), 201
 
 #hotel availability update
@@ -641,28 +1202,125 @@ def add_amenities_to_hotel(hotel_id):
 })
 # @admin_required
 def add_availability_range(hotel_id):
-    from datetime import datetime, timedelta
     data = request.get_json()
+    # is_available yalnızca JSON boolean: "false" / "0" günleri uygun işaretlerdi
+    if isinstance(data, dict) and not isinstance(data.get("is_available", True), bool):
+        return jsonify({"error": "is_available true ya da false olmalı"}), 400
 
     try:
         start_date = datetime.strptime(data["start_date"], "%Y-%m-%d").date()
         end_date = datetime.strptime(data["end_date"], "%Y-%m-%d").date()
         is_available = data.get("is_available", True)
 
-        current = start_date
-        while current <= end_date:
-            exists = HotelAvailability.query.filter_by(hotel_id=hotel_id, date=current).first()
-            if not exists:
-                availability = HotelAvailability(
-                    hotel_id=hotel_id,
-                    date=current,
-                    is_available=is_available
-                )
-                db.session.add(availability)
-            current += timedelta(days=1)
-
+        set_availability(hotel_id, start_date, end_date, is_available)
         db.session.commit()
+        # Uygunluk sadece tarih filtreli aramaları etkiler
+        cache.bump("availability")
         return jsonify({"message": "Uygunluk aralığı başarıyla eklendi"}), 201
 
     except Exception as e:
         return jsonify({"error": str(e)}), 400
+
+
+#bulk availability (channel manager sync)
+@hotel_bp.route("/hotels/availability/bulk", methods=["POST"])
+@swag_from({
+    'tags': ['Hotels'],
+    'parameters': [
+        {
+            'name': 'body',
+            'in': 'body',
+            'required': True,
+            'schema': {
+                'type': 'object',
+                'properties': {
+                    'ranges': {
+                        'type': 'array',
+                        'items': {
+                            'type': 'object',
+                            'properties': {
+                                'hotel_id': {'type': 'integer', 'example': 1},
+                                'start_date': {'type': 'string', 'example': '2025-07-01'},
+                                'end_date': {'type': 'string', 'example': '2025-07-07'},
+                                'is_available': {'type': 'boolean', 'example': True}
+                            },
+                            'required': ['hotel_id', 'start_date', 'end_date']
+                        }
+                    }
+                },
+                'required': ['ranges']
+            }
+        }
+    ],
+    'responses': {
+        200: {
+            'description': 'Uygunluk aralıkları uygulandı; hatalı satırlar errors listesinde',
+            'examples': {
+                'application/json': {
+                    "applied": 2,
+                    "months_written": 3,
+                    "errors": [{"index": 2, "error": "Otel bulunamadı"}]
+                }
+            }
+        },
+        400: {'description': 'ranges listesi yok ya da is_available boolean değil'}
+    }
+})
+@admin_required
+def bulk_availability():
+    data = request.get_json(silent=True) or {}
+    ranges = data.get("ranges")
+    if not isinstance(ranges, list):
+        return jsonify({"error": "ranges listesi gerekli"}), 400
+
+    # is_available yalnızca JSON boolean: "false" / "0" gibi değerler bool() ile True olurdu
+    for index, item in enumerate(ranges):
+        if isinstance(item, dict) and not isinstance(item.get("is_available", True), bool):
+            return jsonify({"error": "is_available true ya da false olmalı", "index": index}), 400
+
+    entries = []
+    errors = []
+    for index, item in enumerate(ranges):
+        hotel_id = item.get("hotel_id") if isinstance(item, dict) else None
+        # "1", 1.9 ya da true int() ile 1 numaralı otele yazılırdı
+        if isinstance(hotel_id, bool) or not isinstance(hotel_id, int):
+            errors.append({"index": index, "error": "hotel_id tam sayı olmalı"})
+            continue
+        try:
+            start_date = datetime.strptime(item["start_date"], "%Y-%m-%d").date()
+            end_date = datetime.strptime(item["end_date"], "%Y-%m-%d").date()
+        except (KeyError, TypeError, ValueError):
+            errors.append({"index": index, "error": "YYYY-MM-DD biçiminde start_date ve end_date gerekli"})
+            continue
+        if end_date < start_date:
+            errors.append({"index": index, "error": "end_date, start_date'ten önce olamaz"})
+            continue
+        entries.append((index, hotel_id, start_date, end_date, item.get("is_available", True)))
+
+    # Otel varlığını tek sorguda kontrol et
+    hotel_ids = {hotel_id for _, hotel_id, _, _, _ in entries}
+    known_ids = {
+        row.id for row in db.session.query(Hotel.id).filter(Hotel.id.in_(hotel_ids))
+    } if hotel_ids else set()
+
+    valid = []
+    for index, hotel_id, start_date, end_date, is_available in entries:
+        if hotel_id not in known_ids:
+            errors.append({"index": index, "error": "Otel bulunamadı"})
+            continue
+        valid.append((hotel_id, start_date, end_date, is_available))
+
+    try:
+        months_written = apply_availability(valid)
+        db.session.commit()
+        cache.bump("availability")
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({"error": str(e)}), 400
+
+    errors.sort(key=lambda e: e["index"])
+    return jsonify({
+        "applied": len(valid),
+        "months_written": months_written,
+        "errors": errors
+    }), 200
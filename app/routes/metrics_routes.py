@@ -0,0 +1,23 @@
+from flask import Blueprint, jsonify
+from app.utils.apidocs import swag_from
+from app.utils.metrics import collect_metrics
+
+metrics_bp = Blueprint("metrics", __name__)
+
+
+@metrics_bp.route("/metrics", methods=["GET"])
+@swag_from({
+    'tags': ['Metrics'],
+    'responses': {
+        200: {
+            'description': 'Önbellek ve diğer çalışma zamanı sayaçları',
+            'examples': {
+                'application/json': {
+                    "cache": {"backend": "redis", "hits": 120, "misses": 14, "errors": 0}
+                }
+            }
+        }
+    }
+})
+def get_metrics():
+    return jsonify(collect_metrics()), 200
@@ -0,0 +1,70 @@
+# Swagger dokümanı tembel yüklenir: flasgger (jsonschema, yaml, mistune) açılışta
+# import edilmez, spec ilk /apidocs veya /apispec_1.json isteğinde üretilip saklanır.
+import importlib.util
+import os
+import threading
+
+from flask import Blueprint, current_app, jsonify, redirect, render_template, url_for
+
+
+def swag_from(specs):
+    # flasgger.swag_from(dict) ile aynı iz: spec fonksiyonun üzerinde durur, spec üretilirken okunur
+    def decorator(function):
+        function.specs_dict = specs
+        return function
+    return decorator
+
+
+def _flasgger_dir():
+    # Paketin yerini import etmeden bul (statik dosyalar / şablonlar için)
+    return importlib.util.find_spec("flasgger").submodule_search_locations[0]
+
+
+class LazySwagger:
+    def __init__(self, template, config):
+        self.template = template
+        self.config = config
+        self._swagger = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        # flasgger'ın kendi blueprint'iyle aynı isim ve url'ler (şablonlar url_for('flasgger.*') kullanıyor)
+        ui_dir = os.path.join(_flasgger_dir(), "ui3")
+        blueprint = Blueprint(
+            "flasgger",
+            __name__,
+            template_folder=os.path.join(ui_dir, "templates"),
+            static_folder=os.path.join(ui_dir, "static"),
+            static_url_path=self.config.get("static_url_path"),
+        )
+        blueprint.add_url_rule(self.config.get("specs_route", "/apidocs/"), "apidocs", self.apidocs)
+        blueprint.add_url_rule("/oauth2-redirect.html", "oauth_redirect", self.oauth_redirect)
+        blueprint.add_url_rule("/apidocs/index.html", view_func=lambda: redirect(url_for("flasgger.apidocs")))
+        for spec in self.config["specs"]:
+            blueprint.add_url_rule(spec["route"], spec["endpoint"], self.apispec,
+                                   defaults={"endpoint": spec["endpoint"]})
+        app.register_blueprint(blueprint)
+
+    def swagger(self):
+        if self._swagger is None:
+            with self._lock:
+                if self._swagger is None:
+                    from flasgger import Swagger
+
+                    swagger = Swagger(template=self.template, config=self.config)
+                    swagger.app = current_app._get_current_object()
+                    swagger.load_config(current_app)
+                    self._swagger = swagger
+        return self._swagger
+
+    def apispec(self, endpoint):
+        # get_apispecs debug kapalıyken sonucu kendi içinde saklar; sonraki istekler hazır spec'i döner
+        return jsonify(self.swagger().get_apispecs(endpoint))
+
+    def apidocs(self):
+        from flasgger.base import APIDocsView
+
+        return APIDocsView(view_args={"config": self.swagger().config}).get()
+
+    def oauth_redirect(self):
+        return render_template(["flasgger/oauth2-redirect.html", "flasgger/o2c.html"])
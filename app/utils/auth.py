@@ -1,41 +1,176 @@
 from functools import wraps
-from flask import request, jsonify
+from collections import namedtuple
+from flask import request, jsonify, current_app, g
 import jwt
-import os
+import threading
+import time
+from cachetools import LRUCache
 from datetime import datetime, timedelta
+from app.extensions import db, cache
 from app.models import User
 
+# Token'dan okunan kimlik; route'lar User yerine bunu alır (DB sorgusu yok)
+TokenUser = namedtuple("TokenUser", ["id", "email", "is_admin", "country"])
+
+# Silinmiş kullanıcılar için önbelleğe yazılan sürüm (hiçbir token ile eşleşmez)
+DELETED_USER_VERSION = -1
+
+
+class TokenRevoked(Exception):
+    pass
+
+
+class VerifiedTokenCache:
+    # Doğrulanmış token -> claim'ler. Aynı token'la sık istek atan istemciler
+    # her seferinde HMAC doğrulaması + JSON çözümleme maliyeti ödemesin.
+    # Anahtar token'ın tamamıdır (imza tek başına payload'ı bağlamaz).
+
+    def __init__(self, maxsize=4096):
+        self._tokens = LRUCache(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def init_app(self, app):
+        with self._lock:
+            self._tokens = LRUCache(maxsize=app.config.get("TOKEN_CACHE_SIZE", 4096))
+            self.hits = 0
+            self.misses = 0
+
+    def decode(self, token, secret):
+        with self._lock:
+            claims = self._tokens.get(token)
+            if claims is not None:
+                exp = claims.get("exp")
+                if exp is not None and exp <= time.time():
+                    del self._tokens[token]
+                    raise jwt.ExpiredSignatureError("Signature has expired")
+                self.hits += 1
+                return claims
+
+        claims = jwt.decode(token, secret, algorithms=["HS256"])
+        with self._lock:
+            self.misses += 1
+            self._tokens[token] = claims
+        return claims
+
+    def stats(self):
+        return {"size": len(self._tokens), "hits": self.hits, "misses": self.misses}
+
+
+verified_tokens = VerifiedTokenCache()
+
+
 def generate_token(user):
     payload = {
         "user_id": user.id,  # ← sub yerine bunu koy
         "email": user.email,
+        "is_admin": bool(user.is_admin),
+        "country": user.country,
+        "ver": user.token_version or 0,
         "exp": datetime.utcnow() + timedelta(hours=3)
     }
-    token = jwt.encode(payload, os.getenv("SECRET_KEY"), algorithm="HS256")
+    token = jwt.encode(payload, current_app.config["SECRET_KEY"], algorithm="HS256")
     return token
 
 
+def _token_version_key(user_id):
+    return cache.key("token_version", user_id)
+
+
+def current_token_version(user_id):
+    # Önbellekte yoksa DB'den bir kez okunur; TOKEN_VERSION_TTL kadar tutulur
+    version = cache.get(_token_version_key(user_id))
+    if version is None:
+        version = db.session.query(User.token_version).filter(User.id == user_id).scalar()
+        version = DELETED_USER_VERSION if version is None else version
+        publish_token_version(user_id, version)
+    return version
+
+
+def publish_token_version(user_id, version):
+    # Commit'ten sonra çağrılmalı; paylaşılan önbellekte tüm worker'lar hemen görür
+    cache.set(_token_version_key(user_id), version, current_app.config.get("TOKEN_VERSION_TTL", 300))
+
+
+def revoke_user_tokens(user):
+    user.token_version = (user.token_version or 0) + 1
+    db.session.commit()
+    publish_token_version(user.id, user.token_version)
+
+
+def user_from_claims(data):
+    user_id = data["user_id"]
+    if "ver" not in data:
+        # Claim'siz eski token'lar: süreleri dolana kadar DB'den okunur
+        user = User.query.get(user_id)
+        if not user:
+            return None
+        return TokenUser(user.id, user.email, bool(user.is_admin), user.country)
+
+    version = current_token_version(user_id)
+    if version == DELETED_USER_VERSION:
+        return None
+    if version != data["ver"]:
+        raise TokenRevoked()
+    return TokenUser(user_id, data.get("email"), bool(data.get("is_admin")), data.get("country"))
+
+
+def _bearer_token():
+    bearer = request.headers.get('Authorization')
+    if not bearer:
+        return None
+    return bearer.replace("Bearer ", "")
+
+
+def _authenticate():
+    token = _bearer_token()
+    if not token:
+        return None, ('Token eksik', 401)
+
+    try:
+        data = verified_tokens.decode(token, current_app.config["SECRET_KEY"])
+        user = user_from_claims(data)
+        if not user:
+            return None, ('Kullanıcı bulunamadı', 403)
+    except jwt.ExpiredSignatureError:
+        return None, ('Token süresi dolmuş', 401)
+    except TokenRevoked:
+        return None, ('Token iptal edilmiş, tekrar giriş yapın', 401)
+    except Exception:
+        return None, ('Geçersiz token', 401)
+    return user, None
+
+
+def reset_token_user():
+    # g uygulama bağlamına aittir; dışarıda açık bir app context varken
+    # (CLI, testler) önceki isteğin kimliği taşınmasın
+    g.pop("token_user", None)
+    g.pop("token_error", None)
+
+
+def current_token_user():
+    # Token istek başına bir kez doğrulanır; sonuç (ya da hata) g üzerinde tutulur
+    if "token_user" not in g:
+        g.token_user, g.token_error = _authenticate()
+    return g.token_user, g.token_error
+
+
+def optional_token_user():
+    # Token yoksa ya da geçersizse None döner (anonim istek gibi davranılır)
+    user, _ = current_token_user()
+    return user
+
 
 def admin_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        if 'Authorization' in request.headers:
-            bearer = request.headers['Authorization']
-            token = bearer.replace("Bearer ", "")
-
-        if not token:
-            return jsonify({'error': 'Token eksik'}), 401
-
-        try:
-            data = jwt.decode(token, os.getenv("SECRET_KEY"), algorithms=["HS256"])
-            user = User.query.get(data["user_id"])
-            if not user or not user.is_admin:
-                return jsonify({'error': 'Bu işlem sadece adminlere açıktır'}), 403
-        except jwt.ExpiredSignatureError:
-            return jsonify({'error': 'Token süresi dolmuş'}), 401
-        except Exception:
-            return jsonify({'error': 'Geçersiz token'}), 401
+        user, error = current_token_user()
+
+        if error and error[1] == 401:
+            return jsonify({'error': error[0]}), 401
+        if not user or not user.is_admin:
+            return jsonify({'error': 'Bu işlem sadece adminlere açıktır'}), 403
 
         return f(*args, **kwargs)
     return decorated
@@ -44,23 +179,10 @@ def admin_required(f):
 def token_required(f):
     @wraps(f)
     def decorated(*args, **kwargs):
-        token = None
-        if 'Authorization' in request.headers:
-            bearer = request.headers['Authorization']
-            token = bearer.replace("Bearer ", "")
-
-        if not token:
-            return jsonify({'error': 'Token eksik'}), 401
-
-        try:
-            data = jwt.decode(token, os.getenv("SECRET_KEY"), algorithms=["HS256"])
-            user = User.query.get(data["user_id"])
-            if not user:
-                return jsonify({'error': 'Kullanıcı bulunamadı'}), 403
-        except jwt.ExpiredSignatureError:
-            return jsonify({'error': 'Token süresi dolmuş'}), 401
-        except Exception:
-            return jsonify({'error': 'Geçersiz token'}), 401
+        user, error = current_token_user()
+
+        if error:
+            return jsonify({'error': error[0]}), error[1]
 
         return f(user, *args, **kwargs)
     return decorated
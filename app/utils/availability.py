@@ -0,0 +1,108 @@
+from datetime import timedelta
+from sqlalchemy import select, and_, or_, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from app.extensions import db
+from app.models import HotelAvailabilityMonth
+
+ALL_DAYS = (1 << 31) - 1
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def _next_month(day):
+    return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def month_masks(start_date, end_date):
+    # [start_date, end_date] aralığını {ayın ilk günü: gün bitmask'i} olarak böler
+    masks = {}
+    current = start_date
+    while current <= end_date:
+        month = month_start(current)
+        last_day = min(end_date, _next_month(month) - timedelta(days=1))
+        bits = (1 << last_day.day) - (1 << (current.day - 1))
+        masks[month] = masks.get(month, 0) | bits
+        current = last_day + timedelta(days=1)
+    return masks
+
+
+def _upsert(table):
+    if db.engine.dialect.name == "postgresql":
+        return pg_insert(table)
+    return sqlite_insert(table)
+
+
+def fold_ranges(entries):
+    # (hotel_id, start, end, is_available) listesini {(hotel_id, ay): (açılacak, kapatılacak)} bitlerine indirger;
+    # aynı gün birden çok kez geçerse sonraki kayıt kazanır
+    folded = {}
+    for hotel_id, start_date, end_date, is_available in entries:
+        for month, bits in month_masks(start_date, end_date).items():
+            set_bits, clear_bits = folded.get((hotel_id, month), (0, 0))
+            if is_available:
+                set_bits, clear_bits = set_bits | bits, clear_bits & ~bits
+            else:
+                set_bits, clear_bits = set_bits & ~bits, clear_bits | bits
+            folded[(hotel_id, month)] = (set_bits, clear_bits)
+    return folded
+
+
+def apply_availability(entries, batch_size=1000):
+    # Toplu upsert; commit çağıran tarafta yapılır. Yazılan (otel, ay) satırı sayısını döner
+    folded = fold_ranges(entries)
+    table = HotelAvailabilityMonth.__table__
+    items = list(folded.items())
+
+    for i in range(0, len(items), batch_size):
+        batch = items[i:i + batch_size]
+
+        # 1) Eksik ayları oluştur ve açılacak bitleri OR'la
+        stmt = _upsert(table).values([
+            {"hotel_id": hotel_id, "month": month, "available_mask": set_bits}
+            for (hotel_id, month), (set_bits, _) in batch
+        ])
+        db.session.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.hotel_id, table.c.month],
+            set_={"available_mask": table.c.available_mask.bitwise_or(stmt.excluded.available_mask)}
+        ))
+
+        # 2) Kapatılacak bitleri AND ile temizle; satırlar artık var, her zaman conflict yolu çalışır
+        clears = [
+            {"hotel_id": hotel_id, "month": month, "available_mask": ALL_DAYS & ~clear_bits}
+            for (hotel_id, month), (_, clear_bits) in batch if clear_bits
+        ]
+        if clears:
+            stmt = _upsert(table).values(clears)
+            db.session.execute(stmt.on_conflict_do_update(
+                index_elements=[table.c.hotel_id, table.c.month],
+                set_={"available_mask": table.c.available_mask.bitwise_and(stmt.excluded.available_mask)}
+            ))
+
+    return len(items)
+
+
+def set_availability(hotel_id, start_date, end_date, is_available=True):
+    return apply_availability([(hotel_id, start_date, end_date, is_available)])
+
+
+def available_hotel_ids(start_date, end_date):
+    # Aralıktaki her gece müsait olan otellerin id'leri (IN (...) içinde kullanılacak select)
+    masks = month_masks(start_date, end_date)
+    if not masks:
+        return select(HotelAvailabilityMonth.hotel_id).where(False)
+
+    conditions = [
+        and_(
+            HotelAvailabilityMonth.month == month,
+            HotelAvailabilityMonth.available_mask.bitwise_and(bits) == bits
+        )
+        for month, bits in masks.items()
+    ]
+    query = select(HotelAvailabilityMonth.hotel_id).where(or_(*conditions))
+    if len(masks) == 1:
+        return query
+    return query.group_by(HotelAvailabilityMonth.hotel_id)\
+        .having(func.count(HotelAvailabilityMonth.id) == len(masks))
@@ -0,0 +1,490 @@
+import hashlib
+import json
+import logging
+import os
+import socket
+import sqlite3
+import queue
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from cachetools import LRUCache
+
+from app.utils import fastjson
+
+logger = logging.getLogger(__name__)
+
+
+class ConnectionPool:
+    # Boşta bekleyen bağlantıları tutar. threading.local yerine kullanılır: gevent
+    # altında local her greenlet'e (yani her isteğe) yeni bağlantı açtırırdı.
+    def __init__(self, connect, max_idle=8):
+        self._connect = connect
+        self._idle = queue.LifoQueue(maxsize=max_idle)
+
+    @contextmanager
+    def connection(self):
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = self._connect()
+        try:
+            yield conn
+        except Exception:
+            # Hatalı bağlantı havuza geri konmaz
+            conn.close()
+            raise
+        try:
+            self._idle.put_nowait(conn)
+        except queue.Full:
+            conn.close()
+
+
+class NullBackend:
+    name = "null"
+
+    def get_many(self, keys):
+        return [None] * len(keys)
+
+    def set(self, key, value, ttl):
+        pass
+
+    def add(self, key, value, ttl):
+        return False
+
+    def incr(self, key, ttl):
+        return 0
+
+    def bump(self, key, seed, ttl):
+        return 0
+
+
+class MemoryBackend:
+    # Süreç içi; her gunicorn worker'ının kendi kopyası olur
+    name = "memory"
+
+    def __init__(self, max_entries=1024):
+        self._values = LRUCache(maxsize=max_entries)
+        # Sürüm sayaçları ayrı LRU'da: değerler sayaçları, sayaçlar değerleri taşırmasın.
+        # Atılan sayaç yeniden zaman tabanlı değerle başlar, eski kayıtlar okunmaz olur
+        self._counters = LRUCache(maxsize=max_entries)
+        self._lock = threading.Lock()
+
+    def _live(self, store, key, now):
+        entry = store.get(key)
+        if entry is None or entry[0] < now:
+            return None
+        return entry[1]
+
+    def get_many(self, keys):
+        now = time.monotonic()
+        result = []
+        with self._lock:
+            for key in keys:
+                counter = self._live(self._counters, key, now)
+                result.append(str(counter) if counter is not None else self._live(self._values, key, now))
+        return result
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._values[key] = (time.monotonic() + ttl, value)
+
+    def add(self, key, value, ttl):
+        now = time.monotonic()
+        with self._lock:
+            if self._live(self._counters, key, now) is not None:
+                return False
+            self._counters[key] = (now + ttl, int(value))
+            return True
+
+    def bump(self, key, seed, ttl):
+        now = time.monotonic()
+        with self._lock:
+            value = self._live(self._counters, key, now)
+            value = seed if value is None else value + 1
+            self._counters[key] = (now + ttl, value)
+            return value
+
+    def incr(self, key, ttl):
+        with self._lock:
+            # Süreli sayaç (ör. hız sınırı pencereleri): süre dolunca sıfırdan başlar
+            now = time.monotonic()
+            entry = self._values.get(key)
+            if entry is None or entry[0] < now:
+                entry = (now + ttl, "0")
+            value = int(entry[1]) + 1
+            self._values[key] = (entry[0], str(value))
+            return value
+
+
+class SQLiteBackend:
+    # Aynı makinedeki worker'lar arasında paylaşılan dosya tabanlı önbellek (WAL modunda)
+    name = "sqlite"
+
+    def __init__(self, path):
+        self.path = path
+        self._pool = ConnectionPool(self._connect)
+        self._writes = 0
+
+    def _connect(self):
+        conn = sqlite3.connect(self.path, timeout=5, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value, expires_at REAL)")
+        return conn
+
+    def _execute(self, sql, params=()):
+        with self._pool.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        placeholders = ",".join("?" * len(keys))
+        rows = self._execute(f"SELECT key, value, expires_at FROM cache WHERE key IN ({placeholders})", keys)
+        now = time.time()
+        found = {key: str(value) for key, value, expires_at in rows if expires_at is None or expires_at >= now}
+        return [found.get(key) for key in keys]
+
+    def set(self, key, value, ttl):
+        self._execute(
+            "INSERT OR REPLACE INTO cache (key, value, expires_at) VALUES (?, ?, ?)",
+            (key, value, time.time() + ttl)
+        )
+        self._writes += 1
+        if self._writes % 1000 == 0:
+            self._execute("DELETE FROM cache WHERE expires_at IS NOT NULL AND expires_at < ?", (time.time(),))
+
+    def add(self, key, value, ttl):
+        now = time.time()
+        with self._pool.connection() as conn:
+            # Süresi dolmuş kayıt yokmuş gibi ezilir
+            cursor = conn.execute(
+                "INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value, expires_at = excluded.expires_at "
+                "WHERE expires_at IS NOT NULL AND expires_at < ?",
+                (key, int(value), now + ttl, now)
+            )
+            return cursor.rowcount == 1
+
+    def bump(self, key, seed, ttl):
+        now = time.time()
+        row = self._execute(
+            "INSERT INTO cache (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "value = CASE WHEN expires_at < ? THEN excluded.value ELSE CAST(value AS INTEGER) + 1 END, "
+            "expires_at = excluded.expires_at "
+            "RETURNING value",
+            (key, int(seed), now + ttl, now)
+        )[0]
+        return int(row[0])
+
+    def incr(self, key, ttl):
+        now = time.time()
+        row = self._execute(
+            "INSERT INTO cache (key, value, expires_at) VALUES (?, 1, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "value = CASE WHEN expires_at < ? THEN 1 ELSE CAST(value AS INTEGER) + 1 END, "
+            "expires_at = CASE WHEN expires_at < ? THEN excluded.expires_at ELSE expires_at END "
+            "RETURNING value",
+            (key, now + ttl, now, now)
+        )[0]
+        return int(row[0])
+
+
+class RedisConnection:
+    def __init__(self, address, timeout):
+        self.sock = socket.create_connection(address, timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+    def _read(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("redis bağlantısı kapandı")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RuntimeError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2].decode()
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self._read() for _ in range(length)]
+        raise ConnectionError(f"beklenmeyen RESP yanıtı: {line!r}")
+
+    def command(self, *args):
+        parts = [f"*{len(args)}\r\n".encode()]
+        for arg in args:
+            data = str(arg).encode()
+            parts.append(f"${len(data)}\r\n".encode() + data + b"\r\n")
+        self.sock.sendall(b"".join(parts))
+        return self._read()
+
+
+class RedisBackend:
+    # Redis protokolü (RESP) konuşan en küçük istemci; redis-py bağımlılığı gerektirmez
+    name = "redis"
+
+    def __init__(self, host="localhost", port=6379, db=0, password=None, timeout=0.5):
+        self.address = (host, port)
+        self.db = db
+        self.password = password
+        self.timeout = timeout
+        self._pool = ConnectionPool(self._connect)
+
+    def _connect(self):
+        conn = RedisConnection(self.address, self.timeout)
+        if self.password:
+            conn.command("AUTH", self.password)
+        if self.db:
+            conn.command("SELECT", self.db)
+        return conn
+
+    def execute(self, *args):
+        try:
+            with self._pool.connection() as conn:
+                return conn.command(*args)
+        except (OSError, ConnectionError):
+            # Havuzdaki bağlantı kopmuş olabilir: bir kez yeni bağlantıyla dene
+            with self._pool.connection() as conn:
+                return conn.command(*args)
+
+    def get_many(self, keys):
+        if not keys:
+            return []
+        return self.execute("MGET", *keys)
+
+    def set(self, key, value, ttl):
+        self.execute("SET", key, value, "EX", max(int(ttl), 1))
+
+    def add(self, key, value, ttl):
+        return self.execute("SET", key, value, "NX", "EX", max(int(ttl), 1)) == "OK"
+
+    def bump(self, key, seed, ttl):
+        ttl = max(int(ttl), 1)
+        if self.execute("SET", key, seed, "NX", "EX", ttl) == "OK":
+            return int(seed)
+        value = self.execute("INCR", key)
+        self.execute("EXPIRE", key, ttl)
+        return value
+
+    def incr(self, key, ttl):
+        value = self.execute("INCR", key)
+        if value == 1:
+            self.execute("EXPIRE", key, max(int(ttl), 1))
+        return value
+
+
+def backend_from_url(url, max_entries=1024):
+    parsed = urlparse(url or "memory://")
+    if parsed.scheme == "memory":
+        return MemoryBackend(max_entries)
+    if parsed.scheme == "null":
+        return NullBackend()
+    if parsed.scheme == "sqlite":
+        return SQLiteBackend(parsed.path or os.path.join(os.getcwd(), "hotel-cache.db"))
+    if parsed.scheme == "redis":
+        return RedisBackend(
+            host=parsed.hostname or "localhost",
+            port=parsed.port or 6379,
+            db=int(parsed.path.lstrip("/") or 0),
+            password=parsed.password
+        )
+    raise ValueError(f"Desteklenmeyen CACHE_URL: {url}")
+
+
+class Cache:
+    # Uygulama önbelleği. Anahtarlar "<prefix>:<ad>:<parçalar>" biçimindedir; geçersiz kılma
+    # sürüm sayaçlarıyla yapılır: bir sürüm artınca ona bağlı anahtarlar artık okunmaz.
+    # Arka uç hataları isteği düşürmez, önbellek ıskası gibi davranır.
+
+    # Arka uç hata verince bu kadar saniye hiç denenmez (her istekte bağlantı zaman aşımı beklenmesin)
+    RETRY_AFTER = 5
+
+    def __init__(self):
+        self.backend = MemoryBackend()
+        self.prefix = "hotel"
+        self.default_ttl = 60
+        self.version_ttl = 86400
+        self.recent_write_ttl = 5
+        self._reset_stats()
+
+    def _reset_stats(self):
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        # Bu süreçte yapılan bump sayısı; sürümler okunamıyorken yerel geçersiz kılma için
+        self.bumps = 0
+        self._down_until = 0
+
+    def _available(self):
+        return time.monotonic() >= self._down_until
+
+    def _failed(self, action):
+        logger.warning("cache %s failed (%s), bypassing for %ss", action, self.backend.name, self.RETRY_AFTER,
+                       exc_info=True)
+        self.errors += 1
+        self._down_until = time.monotonic() + self.RETRY_AFTER
+
+    def init_app(self, app):
+        app.config.setdefault("CACHE_URL", "memory://")
+        app.config.setdefault("CACHE_DEFAULT_TTL", 60)
+        app.config.setdefault("CACHE_MAX_ENTRIES", 1024)
+        app.config.setdefault("CACHE_KEY_PREFIX", "hotel")
+        app.config.setdefault("CACHE_VERSION_TTL", 86400)
+        app.config.setdefault("REPLICA_MAX_LAG", 5)
+        self.backend = backend_from_url(app.config["CACHE_URL"], app.config["CACHE_MAX_ENTRIES"])
+        self.default_ttl = app.config["CACHE_DEFAULT_TTL"]
+        self.prefix = app.config["CACHE_KEY_PREFIX"]
+        # Sürüm sayaçları da süreli: var olmayan id'ler için açılan sayaçlar birikmesin.
+        # CACHE_DEFAULT_TTL'den uzun olmalı; süresi dolan sayaç yeni bir değerle başlar
+        self.version_ttl = max(app.config["CACHE_VERSION_TTL"], self.default_ttl)
+        self.recent_write_ttl = app.config["REPLICA_MAX_LAG"]
+        self._reset_stats()
+
+    def key(self, name, *parts):
+        raw = json.dumps(parts, default=str, separators=(",", ":"), ensure_ascii=False)
+        if len(raw) > 64:
+            raw = hashlib.sha1(raw.encode()).hexdigest()
+        return f"{self.prefix}:{name}:{raw}"
+
+    def _version_key(self, name):
+        return f"{self.prefix}:version:{name}"
+
+    def _written_key(self, name):
+        return f"{self.prefix}:written:{name}"
+
+    def get(self, key):
+        raw = None
+        if self._available():
+            try:
+                raw = self.backend.get_many([key])[0]
+            except Exception:
+                self._failed("get")
+        if raw is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return fastjson.loads(raw)
+
+    def get_values(self, keys):
+        # get'in çoklu hali: tek arka uç çağrısı; bulunmayanlar None
+        raws = [None] * len(keys)
+        if keys and self._available():
+            try:
+                raws = self.backend.get_many(keys)
+            except Exception:
+                self._failed("get")
+        values = []
+        for raw in raws:
+            if raw is None:
+                self.misses += 1
+                values.append(None)
+            else:
+                self.hits += 1
+                values.append(fastjson.loads(raw))
+        return values
+
+    def set(self, key, value, ttl=None):
+        if not self._available():
+            return
+        try:
+            self.backend.set(key, fastjson.dumps(value), ttl or self.default_ttl)
+        except Exception:
+            self._failed("set")
+
+    @staticmethod
+    def _version_seed():
+        # İlk kullanımda (ya da sayacın süresi dolmuşsa) zaman tabanlı bir başlangıç değeri:
+        # eski sürümlü kayıtlarla karışmasın
+        return time.time_ns() // 1000
+
+    def versions(self, names, create=True):
+        # Sürüm okunamazsa None döner; çağıran önbelleği atlamalı. create=False iken olmayan
+        # sayaçlar açılmaz, listede None olarak döner (kaydı henüz doğrulanmamış id'ler için)
+        if not self._available():
+            return None
+        keys = [self._version_key(name) for name in names]
+        try:
+            values = self.backend.get_many(keys)
+            missing = [key for key, value in zip(keys, values) if value is None]
+            if missing and create:
+                seed = self._version_seed()
+                for key in missing:
+                    self.backend.add(key, seed, self.version_ttl)
+                values = self.backend.get_many(keys)
+            elif missing and self.backend.name == "null":
+                return None
+            if create and any(value is None for value in values):
+                # null:// ya da sayaç okunamadı
+                return None
+            return [None if value is None else int(value) for value in values]
+        except Exception:
+            self._failed("version read")
+            return None
+
+    def incr(self, key, ttl):
+        # Süreli sayaç; arka uç yoksa None döner (çağıran sınırsız kabul etmeli)
+        if not self._available():
+            return None
+        try:
+            return self.backend.incr(key, ttl)
+        except Exception:
+            self._failed("incr")
+            return None
+
+    def get_many(self, keys):
+        if not self._available():
+            return [None] * len(keys)
+        try:
+            return self.backend.get_many(keys)
+        except Exception:
+            self._failed("get")
+            return [None] * len(keys)
+
+    def bump(self, *names):
+        # Yazmalardan sonra çağrılır; arka uç kapalı olsa da denenir ki geçersiz kılma kaybolmasın
+        self.bumps += 1
+        for name in names:
+            try:
+                self.backend.bump(self._version_key(name), self._version_seed(), self.version_ttl)
+                if self.recent_write_ttl > 0:
+                    # Sayaç deposunda: değer LRU'su dolunca işaret erken atılmasın
+                    self.backend.bump(self._written_key(name), 1, self.recent_write_ttl)
+            except Exception:
+                self._failed("version bump")
+
+    def written_recently(self, names):
+        # Son recent_write_ttl saniyede bump edilen ad var mı (replika bu yazmayı henüz
+        # görmemiş olabilir). Okunamazsa var sayılır
+        if self.recent_write_ttl <= 0 or not names:
+            return False
+        if not self._available():
+            return True
+        try:
+            return any(value is not None for value in self.backend.get_many([self._written_key(name) for name in names]))
+        except Exception:
+            self._failed("get")
+            return True
+
+    def stats(self):
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "bypassed": not self._available(),
+        }
@@ -0,0 +1,28 @@
+# Toplu yorum aktarımı (ör. partner sitesinden yorum taşıma). Yorumlar ve puanları
+# batch_size'lık executemany insert'lerle yazılır, ORM nesnesi kurulmaz; etkilenen
+# otellerin istatistikleri satır satır değil sonda tek seferde hesaplanır.
+# Commit çağıran tarafta yapılır.
+from sqlalchemy import insert
+
+from app.extensions import db
+from app.models import Comment, Rating
+from app.utils.review_stats import rebuild_review_stats
+
+
+def insert_comments(records, batch_size=1000):
+    # records: (yorum sütunları, puan sütunları) sözlük çiftleri. Yorum id'leri RETURNING ile
+    # girdi sırasında döner, puanlar aynı batch'te bu id'lere bağlanır
+    for start in range(0, len(records), batch_size):
+        batch = records[start:start + batch_size]
+        comment_ids = db.session.scalars(
+            insert(Comment).returning(Comment.id, sort_by_parameter_order=True),
+            [comment for comment, _ in batch]
+        ).all()
+        db.session.execute(insert(Rating), [
+            {"comment_id": comment_id, **rating} for comment_id, (_, rating) in zip(comment_ids, batch)
+        ])
+
+    hotel_ids = sorted({comment["hotel_id"] for comment, _ in records})
+    if hotel_ids:
+        rebuild_review_stats(hotel_ids)
+    return hotel_ids
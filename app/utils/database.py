@@ -0,0 +1,160 @@
+# Veri tabanı bağlantı havuzu ayarları, havuz metrikleri ve okuma replikasına yönlendirme.
+import math
+import os
+import threading
+import time
+
+from flask import current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeout
+from sqlalchemy.pool import QueuePool
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value not in (None, "") else default
+
+
+def _env_bool(name, default):
+    value = os.getenv(name)
+    return default if value in (None, "") else value.lower() not in ("0", "false", "no")
+
+
+def worker_concurrency():
+    # Bir gunicorn worker'ının aynı anda işleyebileceği istek sayısı (gunicorn.conf.py ile aynı varsayılanlar)
+    worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+    if worker_class == "gthread":
+        return _env_int("GUNICORN_THREADS", 8)
+    if worker_class == "gevent":
+        return _env_int("GUNICORN_WORKER_CONNECTIONS", 200)
+    return 1
+
+
+def default_pool_size():
+    # gthread: her thread bir bağlantı tutabilir. gevent: yüzlerce greenlet olabilir ama
+    # Postgres bağlantıları pahalı; 20 ile sınırlanır, fazlası havuzda sırada bekler.
+    return max(1, min(worker_concurrency(), 20))
+
+
+def connection_budget():
+    # Bu worker'ın bir DB'ye açabileceği en fazla bağlantı: DB_MAX_CONNECTIONS (tüm worker'lar
+    # toplamı, ör. Postgres/Supabase max_connections'ın uygulamaya ayrılan kısmı) worker sayısına
+    # bölünür. Worker sayısı gunicorn.conf.py'den WEB_CONCURRENCY olarak gelir
+    workers = max(1, _env_int("WEB_CONCURRENCY", 1))
+    return max(1, _env_int("DB_MAX_CONNECTIONS", 40) // workers)
+
+
+def engine_options(url):
+    if not url:
+        return {}
+    sa_url = make_url(url)
+    if sa_url.get_backend_name() == "sqlite" and sa_url.database in (None, "", ":memory:"):
+        # Bellek içi SQLite tek bağlantılı StaticPool kullanır; havuz ayarı uygulanamaz
+        return {}
+
+    budget = connection_budget()
+    pool_size = min(_env_int("DB_POOL_SIZE", default_pool_size()), budget)
+    options = {
+        "poolclass": InstrumentedQueuePool,
+        "pool_size": pool_size,
+        # Taşma dahil worker başına bağlantı bütçeyi aşmaz
+        "max_overflow": min(_env_int("DB_MAX_OVERFLOW", math.ceil(pool_size / 4)), budget - pool_size),
+        # Havuz doluysa en fazla bu kadar saniye bekle (sonra TimeoutError -> 500)
+        "pool_timeout": _env_int("DB_POOL_TIMEOUT", 10),
+        # Boşta kapanan (Supabase / PgBouncer) bağlantılar yüzünden ilk sorgu takılmasın
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", True),
+        "pool_recycle": _env_int("DB_POOL_RECYCLE", 1800),
+    }
+    statement_timeout = _env_int("DB_STATEMENT_TIMEOUT_MS", 25000)
+    if sa_url.get_backend_name() == "postgresql" and statement_timeout:
+        options["connect_args"] = {"options": f"-c statement_timeout={statement_timeout}"}
+    return options
+
+
+class InstrumentedQueuePool(QueuePool):
+    # Bağlantı alırken geçen bekleme süresini ve zaman aşımlarını sayar
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._stats_lock = threading.Lock()
+        self.checkouts = 0
+        self.waited = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.timeouts = 0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeout:
+            with self._stats_lock:
+                self.timeouts += 1
+            raise
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._stats_lock:
+                self.checkouts += 1
+                # 1 ms altı: havuzdan hemen alındı, bekleme sayılmaz
+                if elapsed > 0.001:
+                    self.waited += 1
+                    self.wait_total += elapsed
+                    self.wait_max = max(self.wait_max, elapsed)
+
+    def stats(self):
+        capacity = self.size() + self._max_overflow
+        checked_out = self.checkedout()
+        return {
+            "pool_size": self.size(),
+            "max_overflow": self._max_overflow,
+            "checked_out": checked_out,
+            "idle": self.checkedin(),
+            "overflow": max(0, self.overflow()),
+            "saturation": round(checked_out / capacity, 2) if capacity > 0 else None,
+            "checkouts": self.checkouts,
+            "waited": self.waited,
+            "wait_avg_ms": round(self.wait_total / self.waited * 1000, 2) if self.waited else 0,
+            "wait_max_ms": round(self.wait_max * 1000, 2),
+            "timeouts": self.timeouts,
+        }
+
+
+def pool_stats(db):
+    def collect():
+        stats = {}
+        for bind_key, engine in db.engines.items():
+            pool = engine.pool
+            name = bind_key or "primary"
+            stats[name] = pool.stats() if isinstance(pool, InstrumentedQueuePool) else {"pool": type(pool).__name__}
+        return stats
+    return collect
+
+
+def use_replica():
+    # Bu istekteki okumalar (varsa) replikaya gider; yazma/flush her zaman birincil DB'de
+    g.use_replica = True
+
+
+def use_primary():
+    # İstekteki sonraki okumalar birincil DB'den. Az önce yazılan bir sürüme bağlanacak veri
+    # için: replika gecikirse eski veri yeni sürümle önbelleğe / ETag'e girerdi
+    g.use_replica = False
+
+
+def reading_replica():
+    # Bu istekteki okumalar şu an replikaya mı gidiyor (replika tanımlı ve use_replica açık)
+    return bool(g.get("use_replica")) and "replica" in current_app.extensions["sqlalchemy"].engines
+
+
+def reset_replica_routing():
+    # g uygulama bağlamına aittir; dışarıda açık bir app context varken önceki istekten kalmasın
+    g.pop("use_replica", None)
+
+
+class RoutingSession(Session):
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context() and g.get("use_replica"):
+            engine = self._db.engines.get("replica")
+            if engine is not None:
+                return engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
@@ -0,0 +1,58 @@
+# JSON kodlama: orjson kuruluysa onu, değilse stdlib json'u kullanır. Yanıtlar Flask'ın
+# varsayılan sağlayıcısıyla aynı içerikte (sıralı anahtarlar; datetime, Decimal vb. Flask'ın
+# default'u ile), yalnızca Türkçe karakterler \u kaçışı yerine UTF-8 yazılır.
+import json
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    # str olmayan sözlük anahtarları stdlib gibi metne çevrilir; datetime ve dataclass default'a bırakılır
+    _OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def dumps(value):
+    # Önbellek değerleri için (sıralama yok, bilinmeyen tipler str)
+    if orjson is None:
+        return json.dumps(value, default=str, separators=(",", ":"))
+    return orjson.dumps(value, default=str, option=_OPTIONS).decode()
+
+
+def loads(raw):
+    if orjson is None:
+        return json.loads(raw)
+    return orjson.loads(raw)
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    def _options(self, indent=False):
+        option = _OPTIONS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        # json.dumps'a özel argüman verilmişse (cls, indent...) stdlib yoluna düş
+        if orjson is None or kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def loads(self, s, **kwargs):
+        if orjson is None or kwargs:
+            return super().loads(s, **kwargs)
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        if orjson is None:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = self.compact is False or (self.compact is None and self._app.debug)
+        # str'ye çevirmeden doğrudan bytes gövde
+        body = orjson.dumps(obj, default=self.default, option=self._options(indent))
+        return self._app.response_class(body + b"\n", mimetype=self.mimetype)
@@ -0,0 +1,96 @@
+import math
+import threading
+import time
+from app.extensions import db
+from app.models import Hotel
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = 111.32
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+class GridIndex:
+    # Otel koordinatları için bellek içi ızgara index'i; hücre = cell_deg x cell_deg derece.
+    # Her worker'da ayrı kopya: paylaşılan bir sürüm verilirse o değişince yeniden yüklenir
+
+    def __init__(self, cell_deg=0.25, ttl=300):
+        self.cell_deg = cell_deg
+        self.ttl = ttl
+        self._cells = None
+        self._loaded_at = 0
+        self._version = None
+        self._lock = threading.Lock()
+
+    def _cell(self, lat, lng):
+        return int(math.floor(lat / self.cell_deg)), int(math.floor(lng / self.cell_deg))
+
+    def load(self, points, version=None):
+        cells = {}
+        for hotel_id, lat, lng in points:
+            cells.setdefault(self._cell(lat, lng), []).append((hotel_id, lat, lng))
+        self._cells = cells
+        self._loaded_at = time.monotonic()
+        self._version = version
+
+    def invalidate(self):
+        self._cells = None
+
+    def _fresh(self, version):
+        return (self._cells is not None and time.monotonic() - self._loaded_at < self.ttl
+                and (version is None or version == self._version))
+
+    def ensure_loaded(self, loader, version=None):
+        # version None (önbellek yok): yalnızca ttl ve yerel invalidate
+        if self._fresh(version):
+            return
+        with self._lock:
+            if not self._fresh(version):
+                self.load(loader(), version)
+
+    def nearby(self, lat, lng, radius_km):
+        # Bounding box'a düşen hücrelerdeki noktalar; (mesafe_km, hotel_id) listesi, yakından uzağa
+        cells = self._cells or {}
+        dlat = radius_km / KM_PER_DEGREE
+        # Boylam genişliği kutunun ekvatordan en uzak kenarına göre; kutup kutuya girerse tüm boylamlar
+        edge = abs(lat) + dlat
+        dlng = 180 if edge >= 89.9 else radius_km / (KM_PER_DEGREE * math.cos(math.radians(edge)))
+        lat_lo, lng_lo = self._cell(max(lat - dlat, -90), lng - min(dlng, 180))
+        lat_hi, lng_hi = self._cell(min(lat + dlat, 90), lng + min(dlng, 180))
+        columns = int(round(360 / self.cell_deg))
+        wrap = columns // 2
+
+        # 180. meridyeni aşan hücreleri karşı tarafa sar
+        keys = {
+            (i, (j + wrap) % columns - wrap)
+            for i in range(lat_lo, lat_hi + 1)
+            for j in range(lng_lo, lng_hi + 1)
+        }
+        result = []
+        for key in keys:
+            for hotel_id, p_lat, p_lng in cells.get(key, ()):
+                distance = haversine_km(lat, lng, p_lat, p_lng)
+                if distance <= radius_km:
+                    result.append((distance, hotel_id))
+        result.sort()
+        return result
+
+
+hotel_grid = GridIndex()
+
+
+def _load_hotel_points():
+    return db.session.query(Hotel.id, Hotel.latitude, Hotel.longitude).filter(
+        Hotel.latitude.isnot(None), Hotel.longitude.isnot(None)
+    ).all()
+
+
+def nearby_hotels(lat, lng, radius_km, version=None):
+    hotel_grid.ensure_loaded(_load_hotel_points, version)
+    return hotel_grid.nearby(lat, lng, radius_km)
@@ -0,0 +1,136 @@
+# Google ID token doğrulaması: imza sertifikaları bellekte tutulur,
+# Cache-Control max-age süresince yeniden çekilmez ve süre dolmadan
+# arka planda yenilenir. Login isteği ağ beklemez (ilk çekim hariç).
+import json
+import logging
+import re
+import threading
+import time
+import urllib.request
+
+from google.auth import jwt as google_jwt
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = "https://www.googleapis.com/oauth2/v1/certs"
+GOOGLE_ISSUERS = ("accounts.google.com", "https://accounts.google.com")
+
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+
+
+class HttpCertSource:
+    # Google'ın {key id: PEM sertifika} uç noktasından okur
+    def __init__(self, url=GOOGLE_CERTS_URL, timeout=5, default_max_age=3600):
+        self.url = url
+        self.timeout = timeout
+        self.default_max_age = default_max_age
+
+    def __call__(self):
+        with urllib.request.urlopen(self.url, timeout=self.timeout) as response:
+            certs = json.loads(response.read().decode("utf-8"))
+            match = _MAX_AGE.search(response.headers.get("Cache-Control", ""))
+        max_age = int(match.group(1)) if match else self.default_max_age
+        return certs, max_age
+
+
+class StaticCertSource:
+    # Testler / yerel geliştirme için sabit anahtar seti ({key id: PEM})
+    def __init__(self, certs, max_age=3600):
+        self.certs = dict(certs)
+        self.max_age = max_age
+
+    def __call__(self):
+        return self.certs, self.max_age
+
+
+class GoogleCertCache:
+    def __init__(self, source=None, refresh_before=300, min_refresh_interval=30):
+        self.source = source or HttpCertSource()
+        # Süre dolmadan bu kadar saniye önce arka planda yenilemeye başla
+        self.refresh_before = refresh_before
+        # Bilinmeyen kid / hata sonrası kaynağa en sık bu aralıkla gidilir
+        self.min_refresh_interval = min_refresh_interval
+        self._certs = None
+        self._expires_at = 0
+        self._last_attempt = 0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self.fetches = 0
+        self.errors = 0
+
+    def init_app(self, app):
+        self.configure(HttpCertSource(app.config.get("GOOGLE_CERTS_URL", GOOGLE_CERTS_URL)))
+
+    def configure(self, source):
+        with self._lock:
+            self.source = source
+            self._certs = None
+            self._expires_at = 0
+            self._last_attempt = 0
+
+    def _fetch(self):
+        self._last_attempt = time.monotonic()
+        try:
+            certs, max_age = self.source()
+        except Exception:
+            self.errors += 1
+            raise
+        self.fetches += 1
+        self._certs = certs
+        self._expires_at = time.monotonic() + max_age
+
+    def _refresh_in_background(self):
+        with self._lock:
+            if self._refreshing or time.monotonic() - self._last_attempt < self.min_refresh_interval:
+                return
+            self._refreshing = True
+
+        def run():
+            try:
+                with self._lock:
+                    self._fetch()
+            except Exception:
+                # Eski sertifikalarla devam edilir; Google anahtarları örtüşerek döndürür
+                logger.warning("Google sertifikaları yenilenemedi", exc_info=True)
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="google-cert-refresh", daemon=True).start()
+
+    def certs(self, key_id=None):
+        if self._certs is None:
+            # İlk çekim senkron yapılmak zorunda
+            with self._lock:
+                if self._certs is None:
+                    self._fetch()
+        elif time.monotonic() >= self._expires_at - self.refresh_before:
+            self._refresh_in_background()
+
+        certs = self._certs
+        if key_id and key_id not in certs:
+            # Google yeni anahtara geçmiş olabilir: beklemeden bir kez yeniden çek
+            with self._lock:
+                if key_id not in self._certs and time.monotonic() - self._last_attempt >= self.min_refresh_interval:
+                    self._fetch()
+                certs = self._certs
+        return certs
+
+    def stats(self):
+        return {
+            "keys": len(self._certs or {}),
+            "expires_in": max(0, int(self._expires_at - time.monotonic())) if self._certs else None,
+            "fetches": self.fetches,
+            "errors": self.errors,
+        }
+
+
+google_certs = GoogleCertCache()
+
+
+def verify_google_id_token(token, audience=None, clock_skew_in_seconds=10):
+    header = google_jwt.decode_header(token)
+    certs = google_certs.certs(header.get("kid"))
+    claims = google_jwt.decode(token, certs=certs, audience=audience, clock_skew_in_seconds=clock_skew_in_seconds)
+    if claims.get("iss") not in GOOGLE_ISSUERS:
+        raise ValueError("Geçersiz token yayıncısı")
+    return claims
@@ -0,0 +1,82 @@
+# Koşullu GET ve yanıt sıkıştırma.
+# ETag'ler önbellekteki yazma sürümlerinden (cache.versions) türetilir: istemcinin
+# If-None-Match'i eşleşirse 304 döner ve gövde hiç kurulmaz. Önbellek kapalıysa
+# (null:// ya da arka uç erişilemiyor) ETag verilmez, yanıt her zaman 200'dür.
+# Sürüme bağlanan veri birincil DB'den okunur (hotel_routes._versions), replikadan değil.
+import gzip
+import hashlib
+import json
+
+from flask import current_app, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_TYPES = {"application/json", "application/x-ndjson", "text/html", "text/plain", "text/css",
+                      "application/javascript"}
+
+
+def make_etag(*parts):
+    raw = json.dumps(parts, default=str, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha1(raw.encode()).hexdigest()[:24]
+
+
+def _mark(response, etag):
+    # Zayıf ETag: sıkıştırılmış ve düz gövde aynı etiketi taşır
+    response.set_etag(etag, weak=True)
+    # Saklanabilir ama her kullanımda yeniden doğrulanmalı
+    response.headers["Cache-Control"] = "no-cache"
+    return response
+
+
+def not_modified(etag):
+    # If-None-Match eşleşiyorsa 304 yanıtı, değilse None
+    if etag is None or not request.if_none_match.contains_weak(etag):
+        return None
+    return _mark(current_app.response_class(status=304), etag)
+
+
+def with_etag(response, etag):
+    if etag is not None:
+        _mark(response, etag)
+    return response
+
+
+def compress_response(response):
+    # after_request: COMPRESS_MIN_SIZE üstündeki 200 yanıtlarını br (varsa) ya da gzip ile sıkıştır
+    config = current_app.config
+    if response.status_code == 304 and response.get_etag()[0]:
+        # 304, karşılığı olan 200 ile aynı Vary'yi taşımalı
+        response.vary.add("Accept-Encoding")
+    if not config.get("COMPRESS_ENABLED", True) or response.status_code != 200 \
+            or response.direct_passthrough or response.is_streamed \
+            or "Content-Encoding" in response.headers or response.mimetype not in COMPRESSIBLE_TYPES:
+        return response
+
+    response.vary.add("Accept-Encoding")
+    accepted = request.accept_encodings
+    if brotli is not None and accepted["br"]:
+        encoding = "br"
+    elif accepted["gzip"]:
+        encoding = "gzip"
+    else:
+        return response
+
+    body = response.get_data()
+    if len(body) < config.get("COMPRESS_MIN_SIZE", 1024):
+        return response
+    if encoding == "br":
+        compressed = brotli.compress(body, quality=config.get("COMPRESS_BROTLI_QUALITY", 4))
+    else:
+        compressed = gzip.compress(body, compresslevel=config.get("COMPRESS_LEVEL", 6))
+    if len(compressed) >= len(body):
+        return response
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag and not weak:
+        response.set_etag(etag, weak=True)
+    return response
@@ -0,0 +1,10 @@
+# Basit metrik kayıt defteri: modüller isimli bir fonksiyon kaydeder, /metrics hepsini toplar
+_providers = {}
+
+
+def register_metrics(name, provider):
+    _providers[name] = provider
+
+
+def collect_metrics():
+    return {name: provider() for name, provider in _providers.items()}
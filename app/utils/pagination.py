@@ -0,0 +1,45 @@
+import base64
+import json
+from flask import current_app, request
+from sqlalchemy import and_, or_
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(*values):
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursor(cursor)
+    if not isinstance(values, list):
+        raise InvalidCursor(cursor)
+    return values
+
+
+def page_size(default_key="PAGE_SIZE", max_key="MAX_PAGE_SIZE"):
+    # ?limit= parametresi; config'teki üst sınırı aşamaz
+    default = current_app.config.get(default_key, 10)
+    maximum = current_app.config.get(max_key, 50)
+    limit = request.args.get("limit", default, type=int)
+    return max(1, min(limit, maximum))
+
+
+def keyset_filter(key, id_column, last_key, last_id, descending):
+    # (key, id) çifti üzerinde OFFSET'siz sayfalama koşulu
+    if descending:
+        return or_(key < last_key, and_(key == last_key, id_column < last_id))
+    return or_(key > last_key, and_(key == last_key, id_column > last_id))
+
+
+def keyset_order(key, id_column, descending):
+    if descending:
+        return key.desc(), id_column.desc()
+    return key.asc(), id_column.asc()
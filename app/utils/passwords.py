@@ -0,0 +1,107 @@
+# Parola hash'leme: PBKDF2 istek thread'inde değil, sınırlı bir havuzda çalışır.
+# hashlib.pbkdf2_hmac GIL'i bıraktığı için thread havuzu yeterli. Havuz ve
+# kuyruk doluysa iş beklemeye alınmaz, PasswordHasherBusy fırlatılır (503).
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError
+
+from werkzeug.security import generate_password_hash, check_password_hash, DEFAULT_PBKDF2_ITERATIONS
+
+
+class PasswordHasherBusy(Exception):
+    pass
+
+
+def _executor_class():
+    # gevent worker'larında threading yamalanır ve havuz greenlet'lere döner; PBKDF2 o zaman
+    # event loop'u kilitler. Bu durumda gevent'in gerçek OS thread havuzu kullanılır.
+    try:
+        from gevent import monkey
+    except ImportError:
+        return ThreadPoolExecutor
+    if monkey.is_module_patched("threading"):
+        from gevent.threadpool import ThreadPoolExecutor as GeventThreadPoolExecutor
+        return GeventThreadPoolExecutor
+    return ThreadPoolExecutor
+
+
+class PasswordHasher:
+    def __init__(self):
+        self._executor = None
+        self._slots = None
+        self.method = f"pbkdf2:sha256:{DEFAULT_PBKDF2_ITERATIONS}"
+        self.workers = 0
+        self.capacity = 0
+        self.timeout = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.rehashed = 0
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+        self.method = f"pbkdf2:sha256:{app.config.get('PASSWORD_HASH_ITERATIONS', DEFAULT_PBKDF2_ITERATIONS)}"
+        self.workers = app.config.get("PASSWORD_HASH_WORKERS", 2)
+        # Çalışan + kuyrukta bekleyebilecek iş sayısı; fazlası hemen reddedilir
+        self.capacity = self.workers + app.config.get("PASSWORD_HASH_QUEUE", 8)
+        self.timeout = app.config.get("PASSWORD_HASH_TIMEOUT", 10)
+        self._executor = _executor_class()(max_workers=self.workers)
+        self._slots = threading.BoundedSemaphore(self.capacity)
+
+    def _run(self, fn, *args):
+        if self._executor is None:
+            return fn(*args)
+        if not self._slots.acquire(blocking=False):
+            with self._lock:
+                self.rejected += 1
+            raise PasswordHasherBusy()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._executor.submit(fn, *args)
+        except Exception:
+            self._done(None)
+            raise
+        # Slot iş bitince bırakılır; zaman aşımında bile kapasite aşılmaz
+        future.add_done_callback(self._done)
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise PasswordHasherBusy()
+
+    def _done(self, future):
+        self._slots.release()
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def needs_rehash(self, pwhash):
+        # Hash'in başındaki "pbkdf2:sha256:<iterasyon>" ayarlarla uyuşmuyorsa
+        return pwhash.split("$", 1)[0] != self.method
+
+    def rehash(self, password):
+        pwhash = self.hash(password)
+        with self._lock:
+            self.rehashed += 1
+        return pwhash
+
+    def verify(self, pwhash, password):
+        # Google kullanıcılarının parolası yok; havuza hiç gitme
+        if not pwhash:
+            return False
+        return self._run(check_password_hash, pwhash, password)
+
+    def stats(self):
+        return {
+            "iterations": int(self.method.rsplit(":", 1)[1]),
+            "workers": self.workers,
+            "capacity": self.capacity,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "rehashed": self.rehashed,
+        }
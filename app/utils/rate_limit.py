@@ -0,0 +1,153 @@
+# Kayan pencere hız sınırlayıcı. Her anahtar için yalnızca [pencere, önceki, şimdiki]
+# sayaçları tutulur; tahmin = önceki * (pencerenin kalan oranı) + şimdiki.
+# Reddedilen istekler route'a hiç girmez (DB sorgusu / parola hash'i yok).
+import math
+import threading
+import time
+from functools import wraps
+
+from cachetools import LRUCache
+from flask import request, jsonify, current_app
+
+from app.extensions import cache
+
+
+def client_ip():
+    # Proxy arkasında ProxyFix'in X-Forwarded-For'dan düzelttiği adres (TRUSTED_PROXY_COUNT)
+    return request.remote_addr or "unknown"
+
+
+def json_email():
+    data = request.get_json(silent=True) or {}
+    email = data.get("email")
+    return email.strip().lower() if isinstance(email, str) and email.strip() else None
+
+
+def _estimate(previous, current, elapsed, window):
+    return previous * (window - elapsed) / window + current
+
+
+class MemoryLimiterStore:
+    name = "memory"
+
+    def __init__(self, max_keys=100_000):
+        self._windows = LRUCache(maxsize=max_keys)
+        self._lock = threading.Lock()
+
+    def hit(self, key, limit, window, now):
+        index, elapsed = divmod(now, window)
+        with self._lock:
+            entry = self._windows.get(key)
+            if entry is None or entry[0] < index - 1:
+                entry = [index, 0, 0]
+            elif entry[0] == index - 1:
+                entry = [index, entry[2], 0]
+            if _estimate(entry[1], entry[2], elapsed, window) >= limit:
+                self._windows[key] = entry
+                return False
+            entry[2] += 1
+            self._windows[key] = entry
+            return True
+
+    def state(self, limits, now):
+        # Anahtar başına anlık tahmin; metrics için (en fazla max_keys kadar gezilir)
+        with self._lock:
+            items = list(self._windows.items())
+        tracked = {}
+        limited = {}
+        for (name, _), (index, previous, current) in items:
+            limit, window = limits.get(name, (None, None))
+            if limit is None:
+                continue
+            now_index, elapsed = divmod(now, window)
+            if index < now_index - 1:
+                continue
+            if index == now_index - 1:
+                previous, current = current, 0
+            tracked[name] = tracked.get(name, 0) + 1
+            if _estimate(previous, current, elapsed, window) >= limit:
+                limited[name] = limited.get(name, 0) + 1
+        return {"tracked_keys": tracked, "limited_keys": limited}
+
+
+class CacheLimiterStore:
+    # Paylaşılan önbellek arka ucu (sqlite/redis) üzerinden: tüm worker'lar aynı sayacı görür.
+    # Okuma ile artırma atomik değil; sınır birkaç istek aşılabilir.
+    name = "cache"
+
+    def hit(self, key, limit, window, now):
+        index, elapsed = divmod(now, window)
+        base = cache.key("ratelimit", *key)
+        previous, current = cache.get_many([f"{base}:{int(index) - 1}", f"{base}:{int(index)}"])
+        if _estimate(int(previous or 0), int(current or 0), elapsed, window) >= limit:
+            return False
+        cache.incr(f"{base}:{int(index)}", window * 2)
+        return True
+
+    def state(self, limits, now):
+        return {}
+
+
+class RateLimiter:
+    def __init__(self):
+        self.store = MemoryLimiterStore()
+        self.enabled = True
+        self.limits = {}
+        self.allowed = {}
+        self.rejected = {}
+
+    def init_app(self, app):
+        self.enabled = app.config.get("RATE_LIMIT_ENABLED", True)
+        if app.config.get("RATE_LIMIT_STORAGE", "memory") == "cache":
+            self.store = CacheLimiterStore()
+        else:
+            self.store = MemoryLimiterStore(app.config.get("RATE_LIMIT_MAX_KEYS", 100_000))
+        self.limits = {}
+        self.allowed = {}
+        self.rejected = {}
+
+    def _limit_for(self, name, limit, window):
+        # RATE_LIMITS = {"login_ip": (20, 60)} ile config'ten değiştirilebilir
+        limit, window = current_app.config.get("RATE_LIMITS", {}).get(name, (limit, window))
+        self.limits[name] = (limit, window)
+        return limit, window
+
+    def hit(self, name, key, limit, window):
+        limit, window = self._limit_for(name, limit, window)
+        now = time.time()
+        allowed = self.store.hit((name, key), limit, window, now)
+        counter = self.allowed if allowed else self.rejected
+        counter[name] = counter.get(name, 0) + 1
+        # Retry-After: yaklaşık olarak mevcut pencerenin sonu
+        return allowed, max(1, math.ceil(window - now % window))
+
+    def stats(self):
+        state = {
+            "enabled": self.enabled,
+            "storage": self.store.name,
+            "limits": {name: f"{limit}/{window}s" for name, (limit, window) in self.limits.items()},
+            "allowed": dict(self.allowed),
+            "rejected": dict(self.rejected),
+        }
+        state.update(self.store.state(self.limits, time.time()))
+        return state
+
+
+limiter = RateLimiter()
+
+
+def rate_limit(name, limit, window, key=client_ip):
+    # key() None dönerse (ör. email yok) bu sınır uygulanmaz
+    def decorator(f):
+        @wraps(f)
+        def decorated(*args, **kwargs):
+            if limiter.enabled:
+                value = key()
+                if value is not None:
+                    allowed, retry_after = limiter.hit(name, value, limit, window)
+                    if not allowed:
+                        return jsonify({"error": "Too many requests, please try again later"}), 429, \
+                            {"Retry-After": str(retry_after)}
+            return f(*args, **kwargs)
+        return decorated
+    return decorator
@@ -0,0 +1,74 @@
+from sqlalchemy import func, insert, delete, select
+from app.extensions import db
+from app.models import Comment, Rating, HotelReviewStats
+from app.utils.availability import _upsert
+
+RATING_FIELDS = ("cleanliness", "service", "facilities", "location", "eco_friendliness")
+
+
+def record_comment(hotel_id, rating=None):
+    # Yeni yorumu istatistik satırına ekler; commit çağıran tarafta yapılır. Tek upsert:
+    # satırı olmayan otele aynı anda iki yorum gelirse ikisi de INSERT'e düşüp biri
+    # birincil anahtarda hata almasın
+    table = HotelReviewStats.__table__
+    values = {"hotel_id": hotel_id, "comment_count": 1, "rating_count": 0}
+    for field in RATING_FIELDS:
+        values[f"{field}_sum"] = getattr(rating, field) if rating is not None else 0
+    if rating is not None:
+        values["rating_count"] = 1
+        values["rating_average"] = sum(getattr(rating, f) for f in RATING_FIELDS) / 5.0
+
+    stmt = _upsert(table).values(**values)
+    excluded = stmt.excluded
+    updates = {
+        "comment_count": table.c.comment_count + excluded.comment_count,
+        "rating_count": table.c.rating_count + excluded.rating_count,
+    }
+    for field in RATING_FIELDS:
+        updates[f"{field}_sum"] = table.c[f"{field}_sum"] + excluded[f"{field}_sum"]
+    if rating is not None:
+        old_total = sum(table.c[f"{f}_sum"] for f in RATING_FIELDS)
+        new_total = sum(excluded[f"{f}_sum"] for f in RATING_FIELDS)
+        updates["rating_average"] = (old_total + new_total) / ((table.c.rating_count + 1) * 5.0)
+    db.session.execute(stmt.on_conflict_do_update(index_elements=[table.c.hotel_id], set_=updates))
+
+
+def rebuild_review_stats(hotel_ids=None):
+    # Comment/Rating tablolarından istatistikleri baştan hesaplar
+    dimension_sums = [func.coalesce(func.sum(getattr(Rating, f)), 0) for f in RATING_FIELDS]
+    rating_count = func.count(Rating.id)
+    total = sum(getattr(Rating, f) for f in RATING_FIELDS)
+
+    source = select(
+        Comment.hotel_id,
+        func.count(Comment.id),
+        rating_count,
+        *dimension_sums,
+        func.avg(total / 5.0),
+    ).outerjoin(Rating, Rating.comment_id == Comment.id)\
+        .where(Comment.hotel_id.isnot(None))\
+        .group_by(Comment.hotel_id)
+
+    cleanup = delete(HotelReviewStats)
+    if hotel_ids is not None:
+        source = source.where(Comment.hotel_id.in_(hotel_ids))
+        cleanup = cleanup.where(HotelReviewStats.hotel_id.in_(hotel_ids))
+
+    columns = ["hotel_id", "comment_count", "rating_count"] + [f"{f}_sum" for f in RATING_FIELDS] + ["rating_average"]
+    db.session.execute(cleanup)
+    result = db.session.execute(insert(HotelReviewStats).from_select(columns, source))
+    return result.rowcount
+
+
+def stats_for(hotel_ids):
+    # hotel_id -> HotelReviewStats; tek sorgu
+    if not hotel_ids:
+        return {}
+    rows = HotelReviewStats.query.filter(HotelReviewStats.hotel_id.in_(hotel_ids)).all()
+    return {row.hotel_id: row for row in rows}
+
+
+def average_ratings(stats):
+    if not stats or not stats.rating_count:
+        return {}
+    return {f: round(getattr(stats, f"{f}_sum") / stats.rating_count, 1) for f in RATING_FIELDS}
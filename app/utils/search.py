@@ -0,0 +1,69 @@
+import difflib
+import weakref
+from sqlalchemy import func, or_, false, text, select, literal_column, table, column
+from app.extensions import db
+from app.models import Hotel
+from app.utils.text import normalize_search_text, search_tokens
+
+hotel_search = table('hotel_search', column('rowid'), column('rank'))
+
+
+_fts_engines = weakref.WeakSet()
+
+
+def _sqlite_has_fts():
+    # Sadece olumlu sonuç önbelleğe alınır; tablo sonradan migration ile gelebilir
+    engine = db.engine
+    if engine in _fts_engines:
+        return True
+    found = db.session.execute(text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'hotel_search'"
+    )).first() is not None
+    if found:
+        _fts_engines.add(engine)
+    return found
+
+
+def _correct_tokens(tokens):
+    # Sözlükte bu önekle başlayan terim yoksa en yakın terimi kullan (yazım hatası toleransı)
+    vocabulary = [row[0] for row in db.session.execute(text("SELECT term FROM hotel_search_vocab"))]
+    corrected = []
+    for token in tokens:
+        if any(term.startswith(token) for term in vocabulary):
+            corrected.append(token)
+            continue
+        close = difflib.get_close_matches(token, vocabulary, n=1, cutoff=0.7)
+        corrected.append(close[0] if close else token)
+    return corrected
+
+
+def location_search(query, city):
+    # (filtrelenmiş sorgu, (sıralama ifadesi, azalan mı)); eşleşme kalitesine göre sıralama için
+    term = normalize_search_text(city).strip()
+    tokens = search_tokens(city)
+    if not tokens:
+        return query.filter(false()), (Hotel.id, False)
+
+    dialect = db.engine.dialect.name
+
+    if dialect == "postgresql":
+        # %> : pg_trgm word similarity (yazım hatası toleranslı); LIKE alt dize/önek eşleşmesi
+        similarity = func.word_similarity(term, Hotel.search_text)
+        query = query.filter(or_(
+            Hotel.search_text.contains(term, autoescape=True),
+            Hotel.search_text.op("%>")(term)
+        ))
+        return query, (similarity, True)
+
+    if dialect == "sqlite" and _sqlite_has_fts():
+        match = " ".join(f'"{token}"*' for token in _correct_tokens(tokens))
+        matches = select(literal_column("rowid").label("hotel_id"), hotel_search.c.rank)\
+            .select_from(hotel_search)\
+            .where(text("hotel_search MATCH :match").bindparams(match=match))\
+            .subquery()
+        query = query.join(matches, Hotel.id == matches.c.hotel_id)
+        # bm25 puanı: küçük olan daha iyi eşleşme
+        return query, (matches.c.rank, False)
+
+    query = query.filter(Hotel.search_text.contains(term, autoescape=True))
+    return query, (func.length(Hotel.search_text), False)
@@ -0,0 +1,65 @@
+# Otel ve yorum çıktıları tek yerde. Tam ORM nesnesi yerine yalnızca gereken kolonları
+# seçen hafif satırlarla (Row) çalışır; alanlar kolon sırasıyla okunur (Row'da isimle
+# erişim her seferinde eşleme arar, sıra ile okumaktan birkaç kat yavaş).
+from sqlalchemy import String, type_coerce
+
+from app.extensions import db
+from app.models import Hotel, Comment, User, Rating
+from app.utils.pagination import keyset_order
+from app.utils.review_stats import RATING_FIELDS
+
+HOTEL_COLUMNS = (
+    Hotel.id, Hotel.name, Hotel.location, Hotel.price, Hotel.rating, Hotel.image_url,
+    Hotel.latitude, Hotel.longitude, Hotel.is_flagged, Hotel.discount_percent,
+)
+HOTEL_KEYS = tuple(column.key for column in HOTEL_COLUMNS)
+
+# Yorum sayfalaması (created_at, id) üzerinde. created_at DB'deki haliyle okunup karşılaştırılır:
+# SQLite'ta metin olarak saklanır ve biçimi satıra göre değişebilir (server default'ta
+# mikrosaniye yok), datetime parametresiyle eşitlik tutmaz. Postgres değeri kendisi çevirir.
+COMMENT_SORT_KEY = type_coerce(Comment.created_at, String)
+
+COMMENT_COLUMNS = (
+    Comment.id, COMMENT_SORT_KEY.label("sort_key"),
+    User.first_name, User.last_name, Comment.comment, Comment.created_at,
+    *(getattr(Rating, field) for field in RATING_FIELDS),
+)
+
+
+def hotel_rows():
+    # Hotel.query gibi filtrelenebilir; satırlar HOTEL_COLUMNS ile başlar (sonuna
+    # add_columns ile sıralama anahtarı vb. eklenebilir)
+    return Hotel.query.with_entities(*HOTEL_COLUMNS)
+
+
+def hotel_fields(row):
+    return dict(zip(HOTEL_KEYS, row))
+
+
+def hotel_summary(row, review_stats, amenities, digits=1):
+    # review_stats: (yorum sayısı, ortalama rating)
+    comment_count, avg_rating = review_stats
+    item = hotel_fields(row)
+    item["rating_average"] = round(avg_rating, digits) if avg_rating else None
+    item["comment_count"] = comment_count
+    item["amenities"] = amenities
+    return item
+
+
+def comment_rows(hotel_id):
+    # Sadece puanlı yorumlar, en yeniden eskiye; kullanıcı ve puan aynı sorguda (yorum başına ek sorgu yok)
+    return db.session.query(*COMMENT_COLUMNS).select_from(Comment)\
+        .join(User, Comment.user_id == User.id)\
+        .join(Rating, Rating.comment_id == Comment.id)\
+        .filter(Comment.hotel_id == hotel_id)\
+        .order_by(*keyset_order(COMMENT_SORT_KEY, Comment.id, True))
+
+
+def comment_item(row):
+    _, _, first_name, last_name, comment, created_at, *ratings = row
+    return {
+        "user": f"{first_name} {last_name}",
+        "comment": comment,
+        "created_at": created_at.strftime("%Y-%m-%d %H:%M:%S"),
+        "ratings": dict(zip(RATING_FIELDS, ratings))
+    }
@@ -0,0 +1,17 @@
+import re
+import unicodedata
+
+_TOKEN = re.compile(r"\w+")
+
+
+def normalize_search_text(value):
+    # Küçük harf + aksan katlama: "İzmir, Çeşme" -> "izmir, cesme"
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    folded = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return folded.replace("ı", "i")
+
+
+def search_tokens(value):
+    return _TOKEN.findall(normalize_search_text(value) or "")
@@ -0,0 +1,131 @@
+# "Bu haftasonu" vitrini: önümüzdeki Cumartesi ve Pazar günleri gerçekten müsait
+# (HotelAvailabilityMonth) en yüksek puanlı oteller; genel ve ülke bazında. Liste süreç
+# belleğinde tutulur, istekler sorgu çalıştırmaz. Otel, müsaitlik ve yorum yazmaları önbellek
+# sürümlerini artırdığı için sonraki istek listeyi yeniden kurar (önbellek paylaşılıyorsa
+# tüm worker'larda). Önbellek kapalıysa liste bu süreçteki bir yazmada ya da max_age
+# saniyede bir yenilenir.
+import threading
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import func, select
+
+from app.extensions import db, cache
+from app.models import Hotel
+from app.utils.availability import available_hotel_ids
+from app.utils.database import use_primary
+from app.utils.serializers import HOTEL_COLUMNS
+
+
+def upcoming_weekend(today=None):
+    # Cumartesi bugünse bu haftasonu; Pazar günü (haftasonu bitmek üzere) gelecek haftasonu
+    today = today or date.today()
+    saturday = today + timedelta(days=(5 - today.weekday()) % 7)
+    return saturday, saturday + timedelta(days=1)
+
+
+def weekend_rows(saturday, sunday, size):
+    # Her ülkenin ilk `size` müsait oteli; genel ilk `size` de bunların içindedir (tek sorgu)
+    rating = func.coalesce(Hotel.rating, 0)
+    ranked = select(
+        Hotel.id,
+        func.row_number().over(partition_by=Hotel.country, order_by=(rating.desc(), Hotel.id))
+        .label("country_rank")
+    ).where(Hotel.id.in_(available_hotel_ids(saturday, sunday))).subquery()
+    return db.session.query(*HOTEL_COLUMNS, Hotel.country)\
+        .join(ranked, ranked.c.id == Hotel.id)\
+        .filter(ranked.c.country_rank <= size)\
+        .order_by(rating.desc(), Hotel.id)
+
+
+class WeekendFeed:
+    def __init__(self, size=3, max_age=300):
+        self.size = size
+        self.max_age = max_age
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self.builds = 0
+        self.served = 0
+
+    def init_app(self, app):
+        self.size = app.config.get("WEEKEND_FEED_SIZE", 3)
+        self.max_age = app.config.get("WEEKEND_FEED_MAX_AGE", 300)
+        self._snapshot = None
+        self.builds = 0
+        self.served = 0
+
+    def _fresh(self, snapshot):
+        if snapshot["weekend"] != upcoming_weekend()[0]:
+            return False
+        if snapshot["versions"] is None:
+            return snapshot["bumps"] == cache.bumps and time.monotonic() - snapshot["built_at"] < self.max_age
+        return cache.versions(snapshot["version_names"]) == snapshot["versions"]
+
+    def _build(self, build_items):
+        # Liste sürümlere bağlanıp süreçte tutulur: gecikmeli replikadan kurulmasın
+        use_primary()
+        saturday, sunday = upcoming_weekend()
+        bumps = cache.bumps
+        # Genel sürümler veriden önce okunur: kurulum sırasında gelen yazma bir sonraki istekte fark edilir
+        global_versions = cache.versions(["hotels", "availability"])
+
+        rows = weekend_rows(saturday, sunday, self.size).all()
+
+        items = build_items(rows)
+        by_country = {}
+        for row, item in zip(rows, items):
+            if row.country:
+                by_country.setdefault(row.country, []).append(item)
+
+        version_names = ["hotels", "availability", *(f"hotel:{row.id}" for row in rows)]
+        hotel_versions = cache.versions(version_names[2:])
+        versions = None
+        if global_versions is not None and hotel_versions is not None:
+            versions = global_versions + hotel_versions
+        return {
+            "weekend": saturday,
+            "global": items[:self.size],
+            "by_country": by_country,
+            "version_names": version_names,
+            "versions": versions,
+            "bumps": bumps,
+            "built_at": time.monotonic(),
+        }
+
+    def _refresh(self, build_items, stale):
+        # Eski liste varsa yalnızca bir istek yeniden kurar, diğerleri eski listeyi döner
+        if not self._lock.acquire(blocking=stale is None):
+            return stale
+        try:
+            if self._snapshot is not stale:
+                return self._snapshot
+            self._snapshot = self._build(build_items)
+            self.builds += 1
+            return self._snapshot
+        finally:
+            self._lock.release()
+
+    def items(self, build_items, country=None):
+        # build_items(satırlar) -> otel sözlükleri; yalnızca liste yeniden kurulurken çağrılır
+        snapshot = self._snapshot
+        if snapshot is None or not self._fresh(snapshot):
+            snapshot = self._refresh(build_items, snapshot)
+        self.served += 1
+        if country:
+            return snapshot["by_country"].get(country, [])
+        return snapshot["global"]
+
+    def stats(self):
+        snapshot = self._snapshot
+        return {
+            "size": self.size,
+            "builds": self.builds,
+            "served": self.served,
+            "weekend": snapshot["weekend"].isoformat() if snapshot else None,
+            "age_seconds": round(time.monotonic() - snapshot["built_at"], 1) if snapshot else None,
+            "hotels": len(snapshot["version_names"]) - 2 if snapshot else 0,
+            "countries": len(snapshot["by_country"]) if snapshot else 0,
+        }
+
+
+weekend_feed = WeekendFeed()
@@ -0,0 +1,168 @@
+# Önbellek arka uçlarını (memory, sqlite, redis) karşılaştırır. Redis yerine yerel bir
+# RESP sunucusu (RespStandIn) çalıştırılır; gerçek bir Redis için --redis-url verin.
+#
+#   python benchmarks/cache_backends.py
+import argparse
+import os
+import socketserver
+import tempfile
+import threading
+import time
+
+from common import make_app, seed
+from app.extensions import db, cache
+from app.utils.cache import Cache, backend_from_url
+
+
+class RespStandIn(socketserver.ThreadingTCPServer):
+    # GET/SET(EX, NX)/MGET/INCR/EXPIRE/DEL/PING/SELECT komutlarını bilen bellek içi RESP sunucusu
+    allow_reuse_address = True
+    daemon_threads = True
+
+    def __init__(self):
+        self.data = {}
+        self.lock = threading.Lock()
+        super().__init__(("127.0.0.1", 0), RespHandler)
+
+
+class RespHandler(socketserver.StreamRequestHandler):
+    def read_command(self):
+        header = self.rfile.readline()
+        if not header:
+            return None
+        args = []
+        for _ in range(int(header[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2].decode())
+        return args
+
+    def bulk(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        data = str(value).encode()
+        return b"$%d\r\n%s\r\n" % (len(data), data)
+
+    def handle(self):
+        server = self.server
+        while True:
+            args = self.read_command()
+            if args is None:
+                return
+            name = args[0].upper()
+            now = time.time()
+            with server.lock:
+                def live(key):
+                    entry = server.data.get(key)
+                    if entry and entry[1] is not None and entry[1] < now:
+                        server.data.pop(key)
+                        return None
+                    return entry and entry[0]
+
+                if name in ("PING", "SELECT", "AUTH"):
+                    reply = b"+OK\r\n" if name != "PING" else b"+PONG\r\n"
+                elif name == "GET":
+                    reply = self.bulk(live(args[1]))
+                elif name == "MGET":
+                    reply = b"*%d\r\n" % (len(args) - 1) + b"".join(self.bulk(live(k)) for k in args[1:])
+                elif name == "SET":
+                    options = [a.upper() for a in args[3:]]
+                    if "NX" in options and live(args[1]) is not None:
+                        reply = b"$-1\r\n"
+                    else:
+                        expires = now + int(args[options.index("EX") + 4]) if "EX" in options else None
+                        server.data[args[1]] = (args[2], expires)
+                        reply = b"+OK\r\n"
+                elif name == "INCR":
+                    value = int(live(args[1]) or 0) + 1
+                    expires = server.data[args[1]][1] if args[1] in server.data else None
+                    server.data[args[1]] = (str(value), expires)
+                    reply = b":%d\r\n" % value
+                elif name == "EXPIRE":
+                    exists = live(args[1]) is not None
+                    if exists:
+                        server.data[args[1]] = (server.data[args[1]][0], now + int(args[2]))
+                    reply = b":%d\r\n" % exists
+                elif name == "DEL":
+                    reply = b":%d\r\n" % sum(1 for k in args[1:] if server.data.pop(k, None))
+                else:
+                    reply = b"-ERR unknown command\r\n"
+            self.wfile.write(reply)
+
+
+def check_backend(url):
+    # İki ayrı Cache örneği = iki worker; sürüm artışı diğerinde de görünmeli
+    # (memory:// süreçler arası paylaşılmaz; aynı arka ucu kullanan iki örnekle sınanır)
+    worker_a, worker_b = Cache(), Cache()
+    worker_a.backend = backend_from_url(url)
+    worker_b.backend = worker_a.backend if url.startswith("memory") else backend_from_url(url)
+    worker_a.prefix = worker_b.prefix = f"bench{time.time_ns()}"
+
+    version = worker_a.versions(["hotel:1"])[0]
+    key = worker_a.key("hotel", 1, version)
+    worker_a.set(key, {"id": 1})
+    assert worker_b.get(worker_b.key("hotel", 1, worker_b.versions(["hotel:1"])[0])) == {"id": 1}
+    worker_b.bump("hotel:1")
+    assert worker_a.versions(["hotel:1"])[0] == version + 1
+
+    # Olmayan kayıt için sayaç açılmaz; süresi dolan sayaç yeni (farklı) değerle başlar
+    assert worker_a.versions(["hotel:404"], create=False) == [None]
+    assert worker_b.versions(["hotel:404"], create=False) == [None]
+    worker_a.version_ttl = 1
+    short = worker_a.versions(["hotel:2"])[0]
+    time.sleep(1.1)
+    assert worker_a.versions(["hotel:2"], create=False) == [None]
+    worker_a.bump("hotel:2")
+    assert worker_a.versions(["hotel:2"])[0] not in (None, short, short + 1)
+
+    started = time.perf_counter()
+    for i in range(2000):
+        worker_a.set(worker_a.key("x", i % 100), {"i": i})
+        worker_a.get(worker_a.key("x", i % 100))
+    return (time.perf_counter() - started) / 2000 * 1000
+
+
+def time_endpoint(app, url, repeat=200):
+    client = app.test_client()
+    client.get(url)
+    started = time.perf_counter()
+    for _ in range(repeat):
+        client.get(url)
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--redis-url")
+    args = parser.parse_args()
+
+    stand_in = None
+    redis_url = args.redis_url
+    if not redis_url:
+        stand_in = RespStandIn()
+        threading.Thread(target=stand_in.serve_forever, daemon=True).start()
+        redis_url = "redis://127.0.0.1:%d/0" % stand_in.server_address[1]
+
+    tmpdir = tempfile.mkdtemp()
+    urls = ["null://", "memory://", f"sqlite:///{os.path.join(tmpdir, 'cache.db')}", redis_url]
+
+    for url in urls[1:]:
+        print(f"{url:50} set+get {check_backend(url):.3f} ms (cross-worker invalidation ok)")
+    print()
+
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        seed(hotels=200, comments_per_hotel=3, availability_days=5)
+        for url in urls:
+            app.config["CACHE_URL"] = url
+            cache.init_app(app)
+            hotels_ms = time_endpoint(app, "/hotels?city=izmir&guests=2")
+            detail_ms = time_endpoint(app, "/hotels/1")
+            print(f"{url:50} GET /hotels {hotels_ms:.2f} ms, GET /hotels/1 {detail_ms:.2f} ms, {cache.stats()}")
+
+    if stand_in:
+        stand_in.shutdown()
+
+
+if __name__ == "__main__":
+    main()
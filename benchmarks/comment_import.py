@@ -0,0 +1,136 @@
+# POST /comments ve POST /comments/import yazma maliyeti. Tek yorum eklemek tek commit
+# olmalı; hatalı istek yarım yorum bırakmamalı. Toplu aktarımda sorgu sayısı satır
+# sayısıyla değil batch sayısıyla artmalı, hatalı satırlar errors'ta dönmeli ve sondaki
+# toplu istatistik güncellemesi sıfırdan hesaplanan istatistiklerle aynı olmalı.
+# Karşılaştırma için aynı yorumlar POST /comments ile tek tek de eklenir.
+#
+#   python benchmarks/comment_import.py
+import sys
+import time
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+from common import make_app, seed, count_queries
+from app.extensions import db
+from app.models import Comment, Hotel, HotelReviewStats
+from app.utils.auth import generate_token, publish_token_version
+from app.utils.review_stats import RATING_FIELDS, rebuild_review_stats
+
+IMPORT_ROWS = 5000
+ONE_BY_ONE_ROWS = 500
+
+
+@contextmanager
+def count_commits():
+    commits = []
+
+    def on_commit(conn):
+        commits.append(conn)
+
+    event.listen(db.engine, "commit", on_commit)
+    try:
+        yield commits
+    finally:
+        event.remove(db.engine, "commit", on_commit)
+
+
+def review(index, hotel_ids):
+    return {
+        "hotel_id": hotel_ids[index % len(hotel_ids)],
+        "comment": f"Partner yorumu {index}",
+        "created_at": f"2024-{index % 12 + 1:02d}-15T10:{index % 60:02d}:00+03:00",
+        **{field: 5 + (index + offset) % 6 for offset, field in enumerate(RATING_FIELDS)},
+    }
+
+
+def stats_snapshot():
+    db.session.expire_all()
+    return sorted(
+        (row.hotel_id, row.comment_count, row.rating_count, round(row.rating_average or 0, 6),
+         *(getattr(row, f"{field}_sum") for field in RATING_FIELDS))
+        for row in HotelReviewStats.query
+    )
+
+
+def main():
+    app = make_app()
+    failed = False
+    with app.app_context():
+        db.create_all()
+        admin = seed(hotels=40, comments_per_hotel=2, availability_days=0)
+        admin.is_admin = True
+        db.session.commit()
+        publish_token_version(admin.id, admin.token_version)
+        headers = {"Authorization": "Bearer " + generate_token(admin)}
+        hotel_ids = [hotel.id for hotel in Hotel.query.order_by(Hotel.id)]
+        client = app.test_client()
+
+        # Tek yorum: tek commit
+        with count_commits() as commits, count_queries() as statements:
+            response = client.post("/comments", headers=headers, json=review(0, hotel_ids))
+        ok = response.status_code == 201 and len(commits) == 1
+        failed |= not ok
+        print(f"{'ok' if ok else 'FAIL':4} POST /comments: {len(commits)} commit, {len(statements)} statements")
+
+        before = Comment.query.count()
+        response = client.post("/comments", headers=headers,
+                               json={k: v for k, v in review(1, hotel_ids).items() if k != "service"})
+        ok = response.status_code == 400 and Comment.query.count() == before
+        failed |= not ok
+        print(f"{'ok' if ok else 'FAIL':4} POST /comments without rating field: {response.status_code}, "
+              f"{Comment.query.count() - before} comments written")
+
+        # Tek tek ekleme (karşılaştırma)
+        start = time.perf_counter()
+        for index in range(ONE_BY_ONE_ROWS):
+            client.post("/comments", headers=headers, json=review(index, hotel_ids))
+        one_by_one = ONE_BY_ONE_ROWS / (time.perf_counter() - start)
+
+        # Toplu aktarım: her 100. satır hatalı (bilinmeyen otel, eksik puan, bozuk tarih sırayla)
+        rows = [review(index, hotel_ids) for index in range(IMPORT_ROWS)]
+        bad = {}
+        for index in range(0, IMPORT_ROWS, 100):
+            kind = index // 100 % 3
+            if kind == 0:
+                rows[index]["hotel_id"] = 999999
+            elif kind == 1:
+                rows[index]["service"] = "çok iyi"
+            else:
+                rows[index]["created_at"] = "dün"
+            bad[index] = kind
+        before = Comment.query.count()
+        with count_commits() as commits, count_queries() as statements:
+            response = client.post("/comments/import", headers=headers, json={"comments": rows})
+        body = response.get_json()
+
+        # Doğrulama (2) + batch başına yorum ve puan insert'i + istatistik (2). SQLite'ta sıralı
+        # RETURNING batch'lenemez, yorum insert'leri satır başına çalışır (aynı transaction'da)
+        batches = -(-(IMPORT_ROWS - len(bad)) // app.config["COMMENTS_IMPORT_BATCH"])
+        comment_inserts = IMPORT_ROWS - len(bad) if db.engine.dialect.name == "sqlite" else batches
+        query_limit = 2 + comment_inserts + batches + 2
+        imported = Comment.query.count() - before
+        imported_stats = stats_snapshot()
+        rebuild_review_stats()
+        db.session.commit()
+        ok = response.status_code == 200 and body["imported"] == imported == IMPORT_ROWS - len(bad) \
+            and [error["index"] for error in body["errors"]] == sorted(bad) \
+            and len(statements) <= query_limit and len(commits) == 1 \
+            and imported_stats == stats_snapshot()
+        failed |= not ok
+        print(f"{'ok' if ok else 'FAIL':4} POST /comments/import: {body.get('imported')} imported, "
+              f"{len(body.get('errors', []))} errors, {len(statements)} statements (limit {query_limit}), "
+              f"{len(commits)} commit, stats {'match' if imported_stats == stats_snapshot() else 'DIFFER'}")
+        print(f"     throughput: import {body.get('rows_per_second')} rows/s "
+              f"({body.get('elapsed_ms')} ms), one by one {one_by_one:.0f} rows/s")
+        if not ok:
+            print("     ", body.get("errors", body)[:5])
+
+        response = client.post("/comments/import", json={"comments": []})
+        print(f"{'ok' if response.status_code in (401, 403) else 'FAIL':4} without token: {response.status_code}")
+        failed |= response.status_code not in (401, 403)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# GET /comments/<id> sayfalaması ve ?format=ndjson dışa aktarımı. 50k yorumlu bir otelde
+# tüm sayfalar cursor ile gezilir: sayfa başına sorgu sayısı sabit kalmalı, yorumlar
+# atlanmadan ve tekrarlanmadan gelmeli (aynı created_at'i paylaşan yorumlar dahil).
+# NDJSON akışı tüm puanlı yorumları vermeli; tepe bellek yorum sayısıyla değil
+# COMMENTS_EXPORT_CHUNK ile sınırlı olmalı (10k ve 50k yorumda yakın).
+#
+#   python benchmarks/comments_export.py
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+os.environ.setdefault("CACHE_URL", "null://")  # her sayfa DB'den okunsun
+
+from sqlalchemy import func, insert
+
+from common import make_app, seed, count_queries
+from app.extensions import db
+from app.models import Comment, Rating, Hotel, User
+from app.utils.review_stats import RATING_FIELDS, rebuild_review_stats
+
+REVIEW_COUNTS = [10000, 50000]
+PAGE_SIZE = 50
+MAX_PAGE_QUERIES = 2
+
+
+def add_reviews(hotel_id, user_id, count):
+    # Her 100 yorum aynı created_at'i paylaşır (cursor'daki id eşitlik bozucusunu zorlar);
+    # her 10. yorum server default zaman damgasıyla, her 7. yorum puansız
+    start = db.session.query(func.coalesce(func.max(Comment.id), 0)).scalar() + 1
+    base = datetime(2025, 1, 1, 12, 0, 0, 500000)
+    rows = []
+    for i in range(count):
+        row = {"id": start + i, "user_id": user_id, "hotel_id": hotel_id, "comment": f"Yorum {i}"}
+        if i % 10:
+            row["created_at"] = base + timedelta(minutes=i // 100)
+        rows.append(row)
+    db.session.execute(insert(Comment), rows)
+    db.session.execute(insert(Rating), [
+        {"comment_id": start + i, **{f: 5 + (i + j) % 6 for j, f in enumerate(RATING_FIELDS)}}
+        for i in range(count) if i % 7
+    ])
+    rebuild_review_stats([hotel_id])
+    db.session.commit()
+    return sum(1 for i in range(count) if i % 7)
+
+
+def page_through(client, hotel_id):
+    seen, worst, pages, cursor = [], 0, 0, None
+    while True:
+        url = f"/comments/{hotel_id}?limit={PAGE_SIZE}" + (f"&cursor={cursor}" if cursor else "")
+        db.session.remove()
+        with count_queries() as statements:
+            body = client.get(url).get_json()
+        worst = max(worst, len(statements))
+        pages += 1
+        seen.extend(item["comment"] for item in body["comments"])
+        cursor = body["next_cursor"]
+        if not cursor:
+            return seen, worst, pages
+
+
+def export(client, hotel_id):
+    db.session.remove()
+    tracemalloc.start()
+    start = time.perf_counter()
+    lines = 0
+    response = client.get(f"/comments/{hotel_id}?format=ndjson", buffered=False)
+    for chunk in response.response:
+        lines += chunk.count(b"\n") if isinstance(chunk, bytes) else chunk.count("\n")
+    response.close()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return lines, peak / 1024, elapsed
+
+
+def main():
+    app = make_app()
+    failed = False
+    with app.app_context():
+        db.create_all()
+        seed(hotels=len(REVIEW_COUNTS), comments_per_hotel=0, availability_days=0)
+        user_id = User.query.first().id
+        hotel_ids = [hotel.id for hotel in Hotel.query.order_by(Hotel.id)]
+        client = app.test_client()
+
+        print(f"{'reviews':>8} | {'pages':>6} {'max queries':>11} {'unique':>7} | "
+              f"{'ndjson lines':>12} {'peak KB':>8} {'ms':>8} | result")
+        for hotel_id, count in zip(hotel_ids, REVIEW_COUNTS):
+            rated = add_reviews(hotel_id, user_id, count)
+            seen, worst, pages = page_through(client, hotel_id)
+            lines, peak, ms = export(client, hotel_id)
+            ok = len(seen) == len(set(seen)) == rated and worst <= MAX_PAGE_QUERIES and lines == rated
+            failed |= not ok
+            print(f"{count:>8} | {pages:>6} {worst:>11} {len(set(seen)):>7} | "
+                  f"{lines:>12} {peak:>8.0f} {ms:>8.1f} | {'ok' if ok else 'FAIL'} (rated {rated})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
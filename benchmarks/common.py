@@ -0,0 +1,103 @@
+# Benchmark scriptleri için ortak yardımcılar: SQLite üzerinde app kurar,
+# örnek veri basar ve çalıştırılan SQL ifadelerini sayar.
+import os
+import random
+import sys
+from contextlib import contextmanager
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+# Benchmark'lar aynı IP'den çok sayıda login yapar; hız sınırını ölçen script kendisi açar
+os.environ.setdefault("RATE_LIMIT_ENABLED", "0")
+
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+from app.models import User, Hotel, Amenity, HotelAmenity, Comment, Rating, HotelAvailabilityMonth
+from app.utils.availability import month_masks
+from app.utils.review_stats import rebuild_review_stats
+
+CITIES = ["İstanbul", "Ankara", "İzmir", "Antalya", "Muğla", "Mersin", "Çanakkale", "Eskişehir"]
+AMENITIES = ["Havuz", "Spa", "Ücretsiz Wi-Fi", "Otopark", "Spor salonu", "Kahvaltı"]
+
+
+def make_app():
+    app = create_app()
+    app.config["TESTING"] = True
+    return app
+
+
+def seed(hotels=200, comments_per_hotel=5, availability_days=30, start=None, rng=None):
+    rng = rng or random.Random(42)
+    start = start or date.today()
+
+    user = User(email="bench@example.com", password_hash="", first_name="Bench", last_name="User")
+    db.session.add(user)
+
+    amenities = [Amenity(name=name) for name in AMENITIES]
+    db.session.add_all(amenities)
+    db.session.flush()
+
+    for i in range(hotels):
+        city = CITIES[i % len(CITIES)]
+        hotel = Hotel(
+            name=f"Hotel {i}",
+            location=f"{city}, Türkiye",
+            price=rng.randint(500, 5000),
+            rating=round(rng.uniform(5, 10), 1),
+            latitude=36 + rng.random() * 6,
+            longitude=26 + rng.random() * 18,
+            is_flagged=i % 3 == 0,
+            discount_percent=rng.choice([0, 10, 15]),
+            available_on_weekend=i % 2 == 0,
+            country="Türkiye",
+        )
+        db.session.add(hotel)
+        db.session.flush()
+
+        for amenity in rng.sample(amenities, 3):
+            db.session.add(HotelAmenity(hotel_id=hotel.id, amenity_id=amenity.id))
+
+        for _ in range(comments_per_hotel):
+            comment = Comment(user_id=user.id, hotel_id=hotel.id, comment="Güzel otel")
+            comment.rating = Rating(
+                cleanliness=rng.randint(5, 10),
+                service=rng.randint(5, 10),
+                facilities=rng.randint(5, 10),
+                location=rng.randint(5, 10),
+                eco_friendliness=rng.randint(5, 10),
+            )
+            db.session.add(comment)
+
+        masks = {}
+        for d in range(availability_days):
+            day = start + timedelta(days=d)
+            if rng.random() > 0.1:
+                for month, bits in month_masks(day, day).items():
+                    masks[month] = masks.get(month, 0) | bits
+        for month, mask in masks.items():
+            db.session.add(HotelAvailabilityMonth(hotel_id=hotel.id, month=month, available_mask=mask))
+
+    db.session.flush()
+    rebuild_review_stats()
+    db.session.commit()
+    return user
+
+
+@contextmanager
+def count_queries():
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
@@ -0,0 +1,85 @@
+# ETag / If-None-Match ve sıkıştırmayı ölçer: her uç için düz, gzip, br ve 304
+# yanıtlarının gövde boyutu, süresi ve çalıştırdığı SQL sayısı. 304 yolu sorgu
+# çalıştırmamalı ve gövde kurmamalı; yorum eklenince ETag değişmeli.
+#
+#   python benchmarks/conditional_get.py
+import sys
+import time
+
+from common import make_app, seed, count_queries
+from app.extensions import db
+from app.models import User
+from app.utils import http_cache
+from app.utils.auth import generate_token
+
+URLS = ["/hotels?limit=50", "/hotels/1", "/comments/1", "/hotels/1/amenities"]
+ROUNDS = 50
+
+
+def timed(client, url, headers):
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        response = client.get(url, headers=headers)
+    return response, (time.perf_counter() - start) / ROUNDS * 1000
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        seed(hotels=200, comments_per_hotel=20, availability_days=0)
+        token = generate_token(User.query.first())
+        client = app.test_client()
+        failed = run(client, token)
+    return 1 if failed else 0
+
+
+def run(client, token):
+    failed = False
+
+    encodings = [("identity", "identity"), ("gzip", "gzip")]
+    if http_cache.brotli is not None:
+        encodings.append(("br", "br, gzip"))
+
+    for url in URLS:
+        # Otelin ilk okuması sürüm sayacını açar, ETag ikinci istekten itibaren verilir
+        client.get(url)
+        first = client.get(url)
+        etag = first.headers.get("ETag")
+        if first.status_code != 200 or not etag:
+            print(f"FAIL {url}: {first.status_code} etag={etag}")
+            failed = True
+            continue
+        parts = []
+        for label, accept in encodings:
+            response, ms = timed(client, url, {"Accept-Encoding": accept})
+            parts.append(f"{label} {len(response.data):6} B {ms:5.2f} ms")
+        with count_queries() as statements:
+            response, ms = timed(client, url, {"If-None-Match": etag})
+        parts.append(f"304 {len(response.data)} B {ms:5.2f} ms")
+        ok = response.status_code == 304 and not statements
+        print(f"{'ok' if ok else 'FAIL':4} {url:22} " + " | ".join(parts))
+        if not ok:
+            failed = True
+
+    # Kişiselleştirilmiş liste: giriş yapan kullanıcı anonim ETag ile 304 almamalı
+    etag = client.get("/hotels").headers["ETag"]
+    response = client.get("/hotels", headers={"If-None-Match": etag, "Authorization": f"Bearer {token}"})
+    print(f"personalized /hotels with anonymous ETag: {response.status_code}")
+    failed |= response.status_code != 200
+
+    # Yazma sonrası: yorum eklenince otel ve yorum ETag'leri değişmeli
+    etags = {url: client.get(url).headers["ETag"] for url in ("/hotels/1", "/comments/1")}
+    response = client.post("/comments", headers={"Authorization": f"Bearer {token}"}, json={
+        "hotel_id": 1, "comment": "Yeni yorum",
+        "cleanliness": 9, "service": 9, "facilities": 9, "location": 9, "eco_friendliness": 9
+    })
+    for url, etag in etags.items():
+        revalidated = client.get(url, headers={"If-None-Match": etag})
+        print(f"after comment {url}: {revalidated.status_code}")
+        failed |= response.status_code != 201 or revalidated.status_code != 200
+    return failed
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+# Bağlantı havuzu boyutunun etkisini gösterir: threaded sunucuya CLIENTS eşzamanlı
+# istemci GET /hotels atar; her sorguya LATENCY_MS eklenir (bağlantı o süre boyunca
+# tutulur). Her havuz boyutu için throughput ve /metrics "db_pool" bekleme değerleri yazılır.
+#
+#   python benchmarks/db_pool.py
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+
+from sqlalchemy import event
+from werkzeug.serving import make_server
+
+POOL_SIZES = [2, 8, 16]
+CLIENTS = 16
+DURATION = 5
+LATENCY_MS = 10
+
+tmp = tempfile.TemporaryDirectory()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(tmp.name, 'pool.db')}"
+os.environ["CACHE_URL"] = "null://"
+
+from common import make_app, seed  # noqa: E402
+from app.extensions import db  # noqa: E402
+
+
+def run(pool_size):
+    os.environ["DB_POOL_SIZE"] = str(pool_size)
+    os.environ["DB_MAX_OVERFLOW"] = "0"
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        if not db.session.execute(db.text("select count(*) from hotels")).scalar():
+            seed(hotels=100, comments_per_hotel=2, availability_days=0)
+
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def _latency(*args):
+            time.sleep(LATENCY_MS / 1000)
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+    done = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + DURATION
+
+    def client():
+        while time.monotonic() < deadline:
+            with urllib.request.urlopen(base + "/hotels?limit=5", timeout=30) as response:
+                response.read()
+            with lock:
+                done[0] += 1
+
+    threads = [threading.Thread(target=client) for _ in range(CLIENTS)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    with urllib.request.urlopen(base + "/metrics") as response:
+        stats = json.loads(response.read())["db_pool"]["primary"]
+    server.shutdown()
+    with app.app_context():
+        db.engine.dispose()
+
+    print(f"pool_size={pool_size:<3} {done[0] / DURATION:7.1f} req/s  waited {stats['waited']}/{stats['checkouts']} "
+          f"checkouts, avg wait {stats['wait_avg_ms']} ms, max wait {stats['wait_max_ms']} ms, "
+          f"timeouts {stats['timeouts']}")
+
+
+def main():
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    print(f"{CLIENTS} clients, +{LATENCY_MS} ms per query, {DURATION}s")
+    for pool_size in POOL_SIZES:
+        run(pool_size)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,98 @@
+# GET /hotels/<id> maliyetinin yorum sayısıyla değişmediğini gösterir. Yorum sayısı
+# 10'dan 10000'e çıkarken ilk sürümdeki hesap (tüm yorumları yükle, her yorumun
+# rating'ini ayrı sorguyla al, Python'da ortala) ile önceden hesaplanmış
+# HotelReviewStats satırından okuyan uç karşılaştırılır: sorgu sayısı, tepe bellek
+# ve süre. Uçtan dönen sayı/ortalama canlı bir SQL aggregate ile doğrulanır.
+#
+#   python benchmarks/detail_aggregates.py
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("CACHE_URL", "null://")  # her istek DB'den okunsun
+
+from sqlalchemy import func, insert
+
+from common import make_app, seed, count_queries
+from app.extensions import db
+from app.models import Comment, Rating, Hotel, User
+from app.utils.review_stats import RATING_FIELDS, rebuild_review_stats
+
+REVIEW_COUNTS = [10, 1000, 10000]
+
+
+def legacy_detail(hotel_id):
+    # İlk sürümdeki get_hotel_by_id hesabı (comment_count * 5 ile bölme dahil)
+    comments = Comment.query.filter_by(hotel_id=hotel_id).all()
+    comment_count = len(comments)
+    rating_avg = None
+    if comment_count > 0:
+        rating_avg = sum(
+            sum(getattr(c.rating, f) for f in RATING_FIELDS) for c in comments if c.rating
+        ) / (comment_count * 5)
+    return comment_count, round(rating_avg, 2) if rating_avg else None
+
+
+def sql_aggregate(hotel_id):
+    total = sum(getattr(Rating, f) for f in RATING_FIELDS)
+    count, average = db.session.query(func.count(Comment.id), func.avg(total / 5.0))\
+        .outerjoin(Rating, Rating.comment_id == Comment.id)\
+        .filter(Comment.hotel_id == hotel_id).one()
+    return count, round(average, 2) if average else None
+
+
+def add_reviews(hotel_id, user_id, count):
+    # Hızlı olsun diye toplu insert; her 10. yorum puansız (eski hesabı bozan durum)
+    start = db.session.query(func.coalesce(func.max(Comment.id), 0)).scalar() + 1
+    db.session.execute(insert(Comment), [
+        {"id": start + i, "user_id": user_id, "hotel_id": hotel_id, "comment": "Yorum"} for i in range(count)
+    ])
+    db.session.execute(insert(Rating), [
+        {"comment_id": start + i, **{f: 5 + (i + j) % 6 for j, f in enumerate(RATING_FIELDS)}}
+        for i in range(count) if i % 10
+    ])
+    rebuild_review_stats([hotel_id])
+    db.session.commit()
+
+
+def measure(fn):
+    db.session.remove()
+    tracemalloc.start()
+    start = time.perf_counter()
+    with count_queries() as statements:
+        result = fn()
+    elapsed = (time.perf_counter() - start) * 1000
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, len(statements), peak / 1024, elapsed
+
+
+def main():
+    app = make_app()
+    failed = False
+    with app.app_context():
+        db.create_all()
+        seed(hotels=len(REVIEW_COUNTS), comments_per_hotel=0, availability_days=0)
+        user_id = User.query.first().id
+        hotel_ids = [hotel.id for hotel in Hotel.query.order_by(Hotel.id)]
+        client = app.test_client()
+
+        print(f"{'reviews':>8} | {'legacy: queries':>15} {'peak KB':>9} {'ms':>8} | "
+              f"{'endpoint: queries':>17} {'peak KB':>8} {'ms':>6} | result")
+        for hotel_id, count in zip(hotel_ids, REVIEW_COUNTS):
+            add_reviews(hotel_id, user_id, count)
+            legacy, legacy_queries, legacy_peak, legacy_ms = measure(lambda: legacy_detail(hotel_id))
+            response, queries, peak, ms = measure(lambda: client.get(f"/hotels/{hotel_id}").get_json())
+            expected = sql_aggregate(hotel_id)
+            got = (response["comment_count"], response["rating_average"])
+            ok = got == expected and queries <= 3
+            failed |= not ok
+            print(f"{count:>8} | {legacy_queries:>15} {legacy_peak:>9.0f} {legacy_ms:>8.1f} | "
+                  f"{queries:>17} {peak:>8.0f} {ms:>6.1f} | {'ok' if ok else 'FAIL'} {got} "
+                  f"(SQL {expected}, legacy {legacy})")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
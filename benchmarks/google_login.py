@@ -0,0 +1,145 @@
+# Google login doğrulamasını ölçer: sertifikaları her istekte çekmek
+# (eski id_token.verify_oauth2_token yolu) ile bellekte tutulan sertifikalar.
+# Google yerine yavaş yanıt veren yerel bir sertifika sunucusu kullanılır;
+# test anahtarı burada üretilir, ağa çıkılmaz.
+#
+#   python benchmarks/google_login.py
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import rsa
+from google.auth import crypt, jwt as google_jwt
+from google.auth.transport import requests as grequests
+from google.oauth2 import id_token
+
+from common import make_app
+from app.extensions import db
+from app.utils.google_auth import google_certs, HttpCertSource
+
+LATENCY = 0.15  # sertifika uç noktasının yanıt süresi (sn)
+MAX_AGE = 3
+LOGINS = 20
+
+
+def make_key(key_id):
+    public_key, private_key = rsa.newkeys(2048)
+    signer = crypt.RSASigner.from_string(private_key.save_pkcs1().decode(), key_id=key_id)
+    return signer, public_key.save_pkcs1().decode()
+
+
+def make_token(signer, email="google@example.com"):
+    now = int(time.time())
+    return google_jwt.encode(signer, {
+        "iss": "https://accounts.google.com",
+        "aud": "client-id",
+        "sub": "1234",
+        "email": email,
+        "given_name": "Google",
+        "family_name": "User",
+        "iat": now,
+        "exp": now + 3600,
+    }).decode()
+
+
+class CertServer:
+    def __init__(self, certs):
+        self.certs = certs
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                time.sleep(LATENCY)
+                body = json.dumps(server.certs).encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Cache-Control", f"public, max-age={MAX_AGE}, must-revalidate")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.httpd.server_port}/certs"
+        threading.Thread(target=self.httpd.serve_forever, daemon=True).start()
+
+
+def timed(fn, n):
+    start = time.perf_counter()
+    worst = 0
+    for _ in range(n):
+        t = time.perf_counter()
+        fn()
+        worst = max(worst, time.perf_counter() - t)
+    return (time.perf_counter() - start) / n * 1000, worst * 1000
+
+
+def main():
+    signer, public_pem = make_key("key-1")
+    server = CertServer({"key-1": public_pem})
+    token = make_token(signer)
+    failed = False
+
+    app = make_app()
+    app.config["GOOGLE_CLIENT_ID"] = "client-id"
+    google_certs.configure(HttpCertSource(server.url))
+    # Testte yenileme penceresini kısalt: süre dolmadan 1 sn önce arka planda yenile
+    google_certs.refresh_before = 1
+    google_certs.min_refresh_interval = 0.5
+    client = app.test_client()
+
+    with app.app_context():
+        db.create_all()
+
+    # Eski yol: her doğrulamada sertifika isteği
+    old_avg, old_worst = timed(lambda: id_token.verify_token(token, grequests.Request(), audience="client-id",
+                                                             certs_url=server.url), 5)
+    server.requests = 0
+
+    def login():
+        response = client.post("/auth/google-login", json={"id_token": token})
+        assert response.status_code == 200, response.get_json()
+
+    login()  # ilk çekim senkron
+    new_avg, new_worst = timed(login, LOGINS)
+    print(f"fetch per login : {old_avg:7.2f} ms avg, {old_worst:7.2f} ms worst")
+    print(f"cached certs    : {new_avg:7.2f} ms avg, {new_worst:7.2f} ms worst, "
+          f"{server.requests} cert fetches for {LOGINS + 1} logins")
+    if server.requests != 1:
+        failed = True
+
+    # max-age dolmak üzereyken login arka plan yenilemesini tetikler ama beklemez
+    time.sleep(MAX_AGE - 0.8)
+    avg, worst = timed(login, 1)
+    time.sleep(LATENCY * 3)
+    print(f"refresh window  : {worst:7.2f} ms, cert fetches {server.requests}")
+    if worst > LATENCY * 1000 or server.requests != 2:
+        failed = True
+
+    # Anahtar döndürme: bilinmeyen kid hemen yeniden çekilir
+    signer2, public_pem2 = make_key("key-2")
+    server.certs = {"key-1": public_pem, "key-2": public_pem2}
+    time.sleep(google_certs.min_refresh_interval)
+    response = client.post("/auth/google-login", json={"id_token": make_token(signer2)})
+    print(f"rotated key     : {response.status_code}, cert fetches {server.requests}")
+    if response.status_code != 200:
+        failed = True
+
+    forged_signer, _ = make_key("key-1")
+    response = client.post("/auth/google-login", json={"id_token": make_token(forged_signer)})
+    print(f"forged token    : {response.status_code}")
+    if response.status_code != 401:
+        failed = True
+
+    print(client.get("/metrics").get_json()["google_certs"])
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+# Sıcak sorguların planlarını ve sürelerini index'ler olmadan ve index'lerle karşılaştırır.
+#
+#   python benchmarks/index_plans.py --hotels 5000
+#
+# DATABASE_URL verilmezse SQLite (bellekte) kullanılır. Unique constraint'lerin
+# arkasındaki index'ler SQLite'ta düşürülemediği için "önce" ölçümünde de yer alır.
+import argparse
+import time
+from datetime import date, timedelta
+
+from common import make_app, seed
+from sqlalchemy import select, text
+from app.extensions import db
+from app.models import Hotel, Comment, Rating, HotelAmenity, Amenity
+from app.utils.availability import available_hotel_ids
+from app.utils.pagination import keyset_order
+from app.utils.weekend_feed import weekend_rows, upcoming_weekend
+
+
+def hot_queries(hotel_id, hotel_ids, start, end):
+    rating_key = db.func.coalesce(Hotel.rating, 0)
+    price_key = db.func.coalesce(Hotel.price, 0)
+    return {
+        "hotels by rating (page 1)": select(Hotel.id)
+            .order_by(*keyset_order(rating_key, Hotel.id, True)).limit(11),
+        "hotels by price (page 1)": select(Hotel.id)
+            .order_by(*keyset_order(price_key, Hotel.id, False)).limit(11),
+        "hotels available for stay": select(Hotel.id)
+            .where(Hotel.id.in_(available_hotel_ids(start, end)))
+            .order_by(*keyset_order(rating_key, Hotel.id, True)).limit(11),
+        "weekend feed (top 3 per country)": weekend_rows(*upcoming_weekend(), 3).statement,
+        "comments of hotel (newest first)": select(Comment.id)
+            .where(Comment.hotel_id == hotel_id).order_by(Comment.created_at.desc(), Comment.id.desc()).limit(20),
+        "ratings joined to comments": select(Rating.cleanliness)
+            .join(Comment, Rating.comment_id == Comment.id).where(Comment.hotel_id == hotel_id),
+        "amenities of page": select(HotelAmenity.hotel_id, Amenity.name)
+            .join(Amenity, HotelAmenity.amenity_id == Amenity.id).where(HotelAmenity.hotel_id.in_(hotel_ids)),
+        "amenity by name": select(Amenity.id).where(Amenity.name == "Spa"),
+    }
+
+
+def explain(statement):
+    dialect = db.engine.dialect
+    sql = str(statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True}))
+    prefix = "EXPLAIN QUERY PLAN " if dialect.name == "sqlite" else "EXPLAIN "
+    rows = db.session.execute(text(prefix + sql)).all()
+    if dialect.name == "sqlite":
+        return [row[-1] for row in rows]
+    return [row[0] for row in rows]
+
+
+def timed(statement, repeat):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        db.session.execute(statement).all()
+    return (time.perf_counter() - started) / repeat * 1000
+
+
+def measure(queries, repeat):
+    return {name: (timed(stmt, repeat), explain(stmt)) for name, stmt in queries.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--hotels", type=int, default=5000)
+    parser.add_argument("--comments", type=int, default=5)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        started = time.perf_counter()
+        seed(hotels=args.hotels, comments_per_hotel=args.comments, availability_days=args.days)
+        print(f"seeded {args.hotels} hotels in {time.perf_counter() - started:.1f}s\n")
+
+        start = date.today() + timedelta(days=5)
+        queries = hot_queries(args.hotels // 2, list(range(1, 11)), start, start + timedelta(days=3))
+        indexes = [ix for table in db.metadata.sorted_tables for ix in table.indexes]
+
+        for ix in indexes:
+            ix.drop(db.engine)
+        before = measure(queries, args.repeat)
+
+        for ix in indexes:
+            ix.create(db.engine)
+        db.session.execute(text("ANALYZE"))
+        after = measure(queries, args.repeat)
+
+    for name in queries:
+        before_ms, before_plan = before[name]
+        after_ms, after_plan = after[name]
+        print(f"{name}: {before_ms:.3f} ms -> {after_ms:.3f} ms")
+        for line in before_plan:
+            print(f"    before: {line}")
+        for line in after_plan:
+            print(f"    after:  {line}")
+        print()
+
+
+if __name__ == "__main__":
+    main()
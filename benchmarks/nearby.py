@@ -0,0 +1,60 @@
+# /hotels/nearby için ızgara index'i ile tam tarama (her otel için haversine) karşılaştırması.
+#
+#   python benchmarks/nearby.py --points 100000
+import argparse
+import random
+import time
+
+from common import make_app, seed
+from app.extensions import db
+from app.utils.geo import GridIndex, haversine_km, hotel_grid
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--points", type=int, default=100000)
+    parser.add_argument("--radius", type=float, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--hotels", type=int, default=2000, help="uç nokta ölçümü için veritabanına basılacak otel")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    # Türkiye sınırları içinde rastgele noktalar
+    points = [(i, rng.uniform(36, 42), rng.uniform(26, 45)) for i in range(args.points)]
+    queries = [(rng.uniform(36, 42), rng.uniform(26, 45)) for _ in range(args.queries)]
+
+    grid = GridIndex()
+    started = time.perf_counter()
+    grid.load(points)
+    print(f"grid load: {(time.perf_counter() - started) * 1000:.1f} ms for {args.points} points")
+
+    started = time.perf_counter()
+    for lat, lng in queries:
+        grid.nearby(lat, lng, args.radius)
+    grid_ms = (time.perf_counter() - started) / len(queries) * 1000
+
+    started = time.perf_counter()
+    for lat, lng in queries[:20]:
+        sorted(d for d in (haversine_km(lat, lng, p_lat, p_lng) for _, p_lat, p_lng in points) if d <= args.radius)
+    scan_ms = (time.perf_counter() - started) / 20 * 1000
+
+    print(f"grid nearby ({args.radius} km): {grid_ms:.3f} ms/query")
+    print(f"full haversine scan:        {scan_ms:.3f} ms/query")
+
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        seed(hotels=args.hotels, comments_per_hotel=1, availability_days=1)
+        client = app.test_client()
+        hotel_grid.invalidate()
+        client.get("/hotels/nearby?lat=38&lng=30")
+
+        started = time.perf_counter()
+        for lat, lng in queries[:50]:
+            client.get(f"/hotels/nearby?lat={lat}&lng={lng}&radius_km=50")
+        endpoint_ms = (time.perf_counter() - started) / 50 * 1000
+        print(f"GET /hotels/nearby ({args.hotels} hotels, 50 km): {endpoint_ms:.2f} ms/request")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# Farklı hash havuzu boyutlarında login throughput'unu ölçer. Gerçek bir
+# threaded werkzeug sunucusu açılır; CLIENTS kadar istemci sürekli login
+# olurken bir okuyucu GET /hotels gecikmesini ölçer. 503'ler havuzun
+# doyduğunu (backpressure) gösterir.
+#
+#   python benchmarks/password_hashing.py [iterasyon]
+import json
+import logging
+import os
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+from werkzeug.serving import make_server
+
+from common import make_app, seed
+from app.extensions import db, password_hasher
+from app.models import User
+
+POOL_SIZES = [1, 2, 4]
+CLIENTS = 16
+DURATION = 5
+
+
+def request(url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={"Content-Type": "application/json"})
+    try:
+        with urllib.request.urlopen(req, timeout=30) as response:
+            response.read()
+            return response.status
+    except urllib.error.HTTPError as e:
+        return e.code
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * p))] * 1000 if values else float("nan")
+
+
+def run(workers, iterations):
+    os.environ["PASSWORD_HASH_WORKERS"] = str(workers)
+    os.environ["PASSWORD_HASH_QUEUE"] = str(workers * 2)
+    os.environ["PASSWORD_HASH_ITERATIONS"] = str(iterations)
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        seed(hotels=50, comments_per_hotel=1, availability_days=0)
+        db.session.add(User(email="login@example.com", password_hash=password_hasher.hash("secret")))
+        db.session.commit()
+
+    server = make_server("127.0.0.1", 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    statuses = {}
+    read_latencies = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + DURATION
+
+    def login_client():
+        while time.monotonic() < deadline:
+            status = request(base + "/auth/login", {"email": "login@example.com", "password": "secret"})
+            with lock:
+                statuses[status] = statuses.get(status, 0) + 1
+            if status == 503:
+                time.sleep(0.05)
+
+    def reader():
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            request(base + "/hotels?limit=5")
+            read_latencies.append(time.perf_counter() - start)
+            time.sleep(0.02)
+
+    threads = [threading.Thread(target=login_client) for _ in range(CLIENTS)] + [threading.Thread(target=reader)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    server.shutdown()
+
+    ok = statuses.get(200, 0)
+    print(f"workers={workers:<2} logins/s={ok / DURATION:7.1f}  503={statuses.get(503, 0):<5} "
+          f"other={sum(v for k, v in statuses.items() if k not in (200, 503)):<3} "
+          f"read p50={percentile(read_latencies, 0.5):6.1f} ms p95={percentile(read_latencies, 0.95):6.1f} ms")
+    return statuses
+
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"pbkdf2:sha256 {iterations} iterations, {CLIENTS} clients, {DURATION}s, {os.cpu_count()} CPU")
+    logging.getLogger("werkzeug").setLevel(logging.ERROR)
+    failed = False
+    for workers in POOL_SIZES:
+        statuses = run(workers, iterations)
+        if not statuses.get(200) or set(statuses) - {200, 503}:
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
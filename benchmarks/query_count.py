@@ -0,0 +1,87 @@
+# GET /hotels (ve token'lı okuma) isteği başına çalışan SQL ifadesi sayısını ölçer.
+# Önbellek boşken sayı MAX_QUERIES sınırını aşarsa ya da önbellekten dönen
+# istek sorgu çalıştırırsa sıfırdan farklı kodla çıkar; N+1 sorgular
+# geri gelirse CI'da yakalanır.
+#
+#   python benchmarks/query_count.py
+import sys
+from datetime import date, timedelta
+
+from common import make_app, seed, count_queries
+from app.extensions import db, cache
+from app.models import User, Hotel
+from app.utils.auth import generate_token
+
+MAX_QUERIES = {
+    "/hotels": 3,
+    # SQLite'ta FTS5 sözlük sorgusu (yazım hatası düzeltme) bir ifade ekler
+    "/hotels?city=İzmir": 4,
+    "/hotels?start_date={start}&end_date={end}&guests=2": 3,
+    # Haftasonu vitrini yeniden kurulurken: oteller + yorum istatistikleri + olanaklar
+    "/hotels/weekend": 3,
+    # Kaç id istenirse istensin sabit: oteller + yorum istatistikleri + olanaklar
+    "/hotels/batch?ids=" + ",".join(str(i) for i in range(1, 41)): 3,
+}
+
+# Token'lı istekler: kimlik doğrulama claim'lerden okunur, kullanıcı sorgusu eklenmemeli;
+# haftasonu listesi bellekten döner
+AUTHENTICATED_MAX_QUERIES = {
+    "/hotels/available-weekend": 0,
+}
+
+
+def main():
+    app = make_app()
+    failed = False
+    with app.app_context():
+        db.create_all()
+        seed(hotels=50, comments_per_hotel=4, availability_days=10)
+
+        hotel_versions = [f"hotel:{hotel_id}" for (hotel_id,) in db.session.query(Hotel.id)]
+        start = date.today()
+        end = start + timedelta(days=3)
+        client = app.test_client()
+
+        for url, limit in MAX_QUERIES.items():
+            url = url.format(start=start.isoformat(), end=end.isoformat())
+            # Süreç başına bir kez yapılan hazırlık sorguları sayılmasın diye önce ısındır
+            client.get(url)
+            # Isınmanın doldurduğu kayıtlar (otel detayları dahil) geçersiz olsun: ölçülen istek DB'ye gitmeli
+            cache.bump("hotels", "availability", *hotel_versions)
+            db.session.remove()
+            with count_queries() as statements:
+                response = client.get(url)
+            # Aynı istek önbellekten dönmeli ve hiç sorgu çalıştırmamalı
+            with count_queries() as cached_statements:
+                client.get(url)
+
+            # Hiç sorgu yoksa ölçülen yol önbellekten dönmüştür, bütçe bir şey kanıtlamaz
+            ok = 0 < len(statements) <= limit and not cached_statements
+            status = "ok" if ok else "FAIL"
+            print(f"{status:4} {url:60} {response.status_code} {len(statements)} queries (limit {limit}), "
+                  f"{len(cached_statements)} cached")
+            if not ok:
+                failed = True
+                for statement in statements + cached_statements:
+                    print("     ", " ".join(statement.split())[:120])
+
+        headers = {"Authorization": "Bearer " + generate_token(User.query.first())}
+        for url, limit in AUTHENTICATED_MAX_QUERIES.items():
+            # İlk istek token sürümünü önbelleğe alır
+            client.get(url, headers=headers)
+            with count_queries() as statements:
+                response = client.get(url, headers=headers)
+
+            ok = response.status_code == 200 and len(statements) <= limit
+            status = "ok" if ok else "FAIL"
+            print(f"{status:4} {url + ' (token)':60} {response.status_code} {len(statements)} queries (limit {limit})")
+            if not ok:
+                failed = True
+                for statement in statements:
+                    print("     ", " ".join(statement.split())[:120])
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
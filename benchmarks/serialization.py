@@ -0,0 +1,105 @@
+# 1000 otellik bir liste için yükleme + sözlük kurma + JSON kodlama maliyeti:
+# ORM nesneleri ve elle kurulan sözlük + Flask'ın stdlib sağlayıcısı (eski yol) ile
+# hafif satırlar + ortak serializer + stdlib / orjson sağlayıcıları karşılaştırılır.
+# Yorum/olanak haritaları önceden hesaplanır, süreye girmez.
+#
+#   python benchmarks/serialization.py
+import sys
+import time
+
+from flask.json.provider import DefaultJSONProvider
+
+from common import make_app, seed
+from app.extensions import db
+from app.models import Hotel
+from app.routes.hotel_routes import _review_stats_for, _amenity_names_for
+from app.utils import fastjson
+from app.utils.fastjson import FastJSONProvider
+from app.utils.serializers import hotel_rows, hotel_summary
+
+HOTELS = 1000
+ROUNDS = 20
+
+
+def legacy_items(hotels, review_stats, amenity_map):
+    # Değişiklikten önceki route'lardaki elle kurulan sözlük
+    items = []
+    for hotel in hotels:
+        comment_count, avg_rating = review_stats.get(hotel.id, (0, None))
+        items.append({
+            "id": hotel.id,
+            "name": hotel.name,
+            "location": hotel.location,
+            "price": hotel.price,
+            "rating": hotel.rating,
+            "rating_average": round(avg_rating, 1) if avg_rating else None,
+            "comment_count": comment_count,
+            "amenities": amenity_map.get(hotel.id, []),
+            "image_url": hotel.image_url,
+            "latitude": hotel.latitude,
+            "longitude": hotel.longitude,
+            "is_flagged": hotel.is_flagged,
+            "discount_percent": hotel.discount_percent
+        })
+    return items
+
+
+def best(fn):
+    times = []
+    for _ in range(ROUNDS):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main():
+    app = make_app()
+    with app.app_context():
+        db.create_all()
+        seed(hotels=HOTELS, comments_per_hotel=2, availability_days=0)
+        hotel_ids = [hotel_id for (hotel_id,) in db.session.query(Hotel.id)]
+        review_stats = _review_stats_for(hotel_ids)
+        amenity_map = _amenity_names_for(hotel_ids)
+        stdlib = DefaultJSONProvider(app)
+        fast = FastJSONProvider(app)
+
+        def orm_load():
+            db.session.expunge_all()
+            return Hotel.query.all()
+
+        def row_load():
+            return hotel_rows().all()
+
+        orm_hotels = orm_load()
+        rows = row_load()
+        legacy = legacy_items(orm_hotels, review_stats, amenity_map)
+        items = [hotel_summary(row, review_stats.get(row.id, (0, None)), amenity_map.get(row.id, [])) for row in rows]
+        if stdlib.loads(stdlib.dumps(legacy)) != fast.loads(fast.dumps(items)):
+            print("serializer output differs from the legacy dicts")
+            return 1
+
+        results = [
+            ("load: ORM objects", best(orm_load)),
+            ("load: column rows", best(row_load)),
+            ("build: legacy dicts (ORM)", best(lambda: legacy_items(orm_hotels, review_stats, amenity_map))),
+            ("build: hotel_summary (rows)", best(lambda: [
+                hotel_summary(row, review_stats.get(row.id, (0, None)), amenity_map.get(row.id, [])) for row in rows
+            ])),
+            ("encode: Flask stdlib provider", best(lambda: stdlib.response(items))),
+            ("encode: FastJSONProvider", best(lambda: fast.response(items))),
+            ("cache value: fastjson.dumps+loads", best(lambda: fastjson.loads(fastjson.dumps(items)))),
+        ]
+
+    print(f"per {HOTELS} hotels, best of {ROUNDS} (orjson {'on' if fastjson.orjson else 'not installed'})")
+    for label, ms in results:
+        print(f"  {label:<36} {ms:8.2f} ms")
+    old = results[0][1] + results[2][1] + results[4][1]
+    new = results[1][1] + results[3][1] + results[5][1]
+    print(f"  {'total old path':<36} {old:8.2f} ms")
+    print(f"  {'total new path':<36} {new:8.2f} ms  ({old / new:.1f}x)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,19 @@
+# serving_modes.py'nin gunicorn'a verdiği uygulama. BENCH_DB_LATENCY_MS verilirse her
+# SQL ifadesinden önce o kadar beklenir: yerel SQLite'ı ağ üzerindeki Postgres gibi
+# davrandırır (gevent altında time.sleep yamalı olduğu için bekleme de yield eder).
+import os
+import time
+
+from sqlalchemy import event
+
+from app import create_app
+from app.extensions import db
+
+app = create_app()
+
+latency = float(os.getenv("BENCH_DB_LATENCY_MS", 0)) / 1000
+if latency:
+    with app.app_context():
+        @event.listens_for(db.engine, "before_cursor_execute")
+        def _simulate_network_round_trip(*args):
+            time.sleep(latency)
@@ -0,0 +1,146 @@
+# gunicorn worker türlerini (sync / gthread / gevent) GET /hotels üzerinde karşılaştırır.
+# Veri tabanı yerel bir SQLite dosyasıdır; Postgres ağ gecikmesini taklit etmek için her
+# sorguya BENCH_DB_LATENCY_MS eklenir. Önbellek kapalıdır (CACHE_URL=null://), her istek DB'ye gider.
+#
+#   python benchmarks/serving_modes.py [--latency-ms 5] [--concurrency 64] [--duration 10]
+#   python benchmarks/serving_modes.py --database-url postgresql://...   (gerçek Postgres ile)
+import argparse
+import http.client
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def prepare_database(url):
+    env = dict(os.environ, DATABASE_URL=url)
+    code = (
+        "from common import make_app, seed\n"
+        "from app.extensions import db\n"
+        "app = make_app()\n"
+        "with app.app_context():\n"
+        "    db.create_all()\n"
+        "    seed(hotels=300, comments_per_hotel=3, availability_days=10)\n"
+    )
+    subprocess.run([sys.executable, "-c", code], cwd=os.path.join(ROOT, "benchmarks"), env=env, check=True)
+
+
+def start_server(mode, port, args):
+    env = dict(
+        os.environ,
+        DATABASE_URL=args.database_url,
+        SECRET_KEY="benchmark-secret",
+        CACHE_URL="null://",
+        RATE_LIMIT_ENABLED="0",
+        GUNICORN_WORKER_CLASS=mode,
+        WEB_CONCURRENCY=str(args.workers),
+        BENCH_DB_LATENCY_MS=str(args.latency_ms),
+    )
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "benchmarks.serving_app:app", "-c", "gunicorn.conf.py",
+         "-b", f"127.0.0.1:{port}", "--log-level", "warning"],
+        cwd=ROOT, env=env,
+    )
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            conn.request("GET", "/hotels?limit=1")
+            if conn.getresponse().status == 200:
+                conn.close()
+                return process
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError(f"{mode} sunucusu açılamadı")
+
+
+def load(port, concurrency, duration, path):
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client():
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        local = []
+        while time.monotonic() < deadline:
+            start = time.perf_counter()
+            try:
+                conn.request("GET", path)
+                response = conn.getresponse()
+                response.read()
+                if response.status != 200:
+                    raise OSError(response.status)
+                local.append(time.perf_counter() - start)
+            except (OSError, http.client.HTTPException):
+                with lock:
+                    errors[0] += 1
+                conn.close()
+                conn = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client) for _ in range(concurrency)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    latencies.sort()
+    return latencies, errors[0]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--modes", default="sync,gthread,gevent")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--duration", type=float, default=10)
+    parser.add_argument("--latency-ms", type=float, default=5)
+    parser.add_argument("--path", default="/hotels?limit=10")
+    parser.add_argument("--database-url")
+    args = parser.parse_args()
+
+    tmp = tempfile.TemporaryDirectory()
+    if not args.database_url:
+        args.database_url = f"sqlite:///{os.path.join(tmp.name, 'bench.db')}"
+    prepare_database(args.database_url)
+
+    print(f"GET {args.path}, {args.workers} workers, {args.concurrency} clients, {args.duration:g}s, "
+          f"+{args.latency_ms:g} ms per query, {os.cpu_count()} CPU")
+    for mode in args.modes.split(","):
+        if mode == "gevent":
+            try:
+                import gevent  # noqa: F401
+            except ImportError:
+                print(f"{mode:8} atlandı (pip install -r requirements-gevent.txt)")
+                continue
+        port = free_port()
+        process = start_server(mode, port, args)
+        try:
+            latencies, errors = load(port, args.concurrency, args.duration, args.path)
+        finally:
+            process.terminate()
+            process.wait()
+        if not latencies:
+            print(f"{mode:8} başarılı istek yok, {errors} hata")
+            continue
+        pick = lambda p: latencies[min(len(latencies) - 1, int(len(latencies) * p))] * 1000
+        print(f"{mode:8} {len(latencies) / args.duration:8.1f} req/s  p50 {pick(0.5):7.1f} ms  "
+              f"p99 {pick(0.99):7.1f} ms  errors {errors}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,85 @@
+# Açılış süresini ölçer: `import app`, create_app() ve ilk /apidocs + /apispec_1.json
+# isteği. Her ölçüm temiz bir python sürecinde yapılır (modül önbelleği paylaşılmaz).
+# Veri tabanı migrate edilmiş bir SQLite dosyasıdır (eski create_all yolu için gerçekçi).
+# Başka bir checkout verilirse (ör. `git worktree add /tmp/old <commit>`) iki ağaç yan yana yazılır.
+#
+#   python benchmarks/startup.py [--runs 5] [--compare /tmp/old]
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MEASURE = r"""
+import json, sys, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+application = app.create_app()
+t2 = time.perf_counter()
+# create_app bittiğinde (ilk istekten önce) flasgger yüklenmiş mi
+flasgger_at_boot = "flasgger" in sys.modules
+client = application.test_client()
+assert client.get("/apidocs/").status_code == 200
+spec = client.get("/apispec_1.json")
+assert spec.status_code == 200 and spec.get_json()["paths"]
+t3 = time.perf_counter()
+client.get("/apidocs/")
+client.get("/apispec_1.json")
+t4 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "create_app": t2 - t1, "first_apidocs": t3 - t2,
+                  "cached_apidocs": t4 - t3, "flasgger_at_boot": flasgger_at_boot}))
+"""
+
+
+def migrated_database(path):
+    url = f"sqlite:///{path}"
+    env = dict(os.environ, DATABASE_URL=url, SECRET_KEY="benchmark-secret", FLASK_APP="wsgi.py")
+    subprocess.run([sys.executable, "-m", "flask", "db", "upgrade"], cwd=ROOT, env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return url
+
+
+def measure(tree, url, runs):
+    env = dict(os.environ, DATABASE_URL=url, SECRET_KEY="benchmark-secret", RATE_LIMIT_ENABLED="0")
+    samples = []
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", MEASURE], cwd=tree, env=env, check=True,
+                             capture_output=True, text=True).stdout
+        samples.append(json.loads(out.strip().splitlines()[-1]))
+    return samples
+
+
+def report(label, samples):
+    row = {key: statistics.median(s[key] for s in samples) * 1000
+           for key in ("import", "create_app", "first_apidocs", "cached_apidocs")}
+    print(f"{label:<10} import {row['import']:7.1f} ms  create_app {row['create_app']:7.1f} ms  "
+          f"boot total {row['import'] + row['create_app']:7.1f} ms  "
+          f"first /apidocs {row['first_apidocs']:7.1f} ms  cached {row['cached_apidocs']:5.1f} ms  "
+          f"flasgger at boot: {samples[0]['flasgger_at_boot']}")
+    return row
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--compare", help="karşılaştırılacak başka bir checkout dizini")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        url = migrated_database(os.path.join(tmp, "startup.db"))
+        print(f"median of {args.runs} runs, fresh interpreter each")
+        current = report("current", measure(ROOT, url, args.runs))
+        if args.compare:
+            other = report("compare", measure(args.compare, url, args.runs))
+            saved = other["import"] + other["create_app"] - current["import"] - current["create_app"]
+            print(f"boot time saved: {saved:.1f} ms per process")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
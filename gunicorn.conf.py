@@ -0,0 +1,36 @@
+# gunicorn ayarları; "gunicorn wsgi:app" bu dosyayı çalışma dizininden otomatik okur.
+#
+# GUNICORN_WORKER_CLASS:
+#   gthread (varsayılan) - worker başına GUNICORN_THREADS thread; DB/HTTP beklerken diğer istekler sürer
+#   gevent               - worker başına GUNICORN_WORKER_CONNECTIONS greenlet (requirements-gevent.txt gerekir)
+#   sync                 - eski davranış: worker başına tek istek
+import os
+
+
+def _available_cpus():
+    # Süreç için ayrılan CPU'lar (cpuset); cpu_count() konteynerde makinenin tamamını görür
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+# Varsayılan en fazla 2 worker: her worker ayrı bağlantı havuzu ve bellek demek, eşzamanlılık thread'lerden gelir
+workers = int(os.getenv("WEB_CONCURRENCY", min(2, _available_cpus())))
+# Her worker en az bir DB bağlantısı alabilmeli (DB_MAX_CONNECTIONS, app/utils/database.py)
+workers = max(1, min(workers, int(os.getenv("DB_MAX_CONNECTIONS", 40))))
+# Worker'lar havuz boyutunu toplam bağlantı sınırına göre bölerken bu sayıyı okur
+os.environ["WEB_CONCURRENCY"] = str(workers)
+threads = int(os.getenv("GUNICORN_THREADS", 8)) if worker_class == "gthread" else 1
+worker_connections = int(os.getenv("GUNICORN_WORKER_CONNECTIONS", 200))
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", 5))
+accesslog = os.getenv("GUNICORN_ACCESSLOG")
+
+
+def post_worker_init(worker):
+    if worker_class == "gevent":
+        # psycopg2 C kütüphanesi soketi kendisi bekler; gevent'e devretmesi için
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
@@ -45,6 +45,22 @@ target_db = current_app.extensions['migrate'].db
 # ... etc.
 
 
+# Modelde tablo olarak görünmeyen, SQLite'ta trigger'larla yönetilen FTS5 tablosu ve
+# gölge tabloları (hotel_search_data, _idx, _docsize, _config, _vocab)
+FTS_TABLE = 'hotel_search'
+# ddl_if ile yalnızca Postgres'te oluşturulan index'ler
+POSTGRES_ONLY_INDEXES = {'ix_hotels_search_text_trgm'}
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    # autogenerate / "flask db check" bunları fark olarak görüp silmeye ya da eklemeye çalışmasın
+    if type_ == 'table' and (name == FTS_TABLE or name.startswith(FTS_TABLE + '_')):
+        return False
+    if type_ == 'index' and name in POSTGRES_ONLY_INDEXES:
+        return context.get_context().dialect.name == 'postgresql'
+    return True
+
+
 def get_metadata():
     if hasattr(target_db, 'metadatas'):
         return target_db.metadatas[None]
@@ -65,7 +81,8 @@ def run_migrations_offline():
     """
     url = config.get_main_option("sqlalchemy.url")
     context.configure(
-        url=url, target_metadata=get_metadata(), literal_binds=True
+        url=url, target_metadata=get_metadata(), literal_binds=True,
+        include_object=include_object
     )
 
     with context.begin_transaction():
@@ -93,6 +110,7 @@ def run_migrations_online():
     conf_args = current_app.extensions['migrate'].configure_args
     if conf_args.get("process_revision_directives") is None:
         conf_args["process_revision_directives"] = process_revision_directives
+    conf_args.setdefault("include_object", include_object)
 
     connectable = get_engine()
 
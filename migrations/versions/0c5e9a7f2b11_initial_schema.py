@@ -0,0 +1,115 @@
+"""initial schema (tables previously created by db.create_all on boot)
+
+Revision ID: 0c5e9a7f2b11
+Revises: 
+Create Date: 2025-06-28 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0c5e9a7f2b11'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # create_all ile kurulmuş veri tabanlarında tablolar zaten var; sadece eksikleri oluştur
+    existing = set(sa.inspect(op.get_bind()).get_table_names())
+
+    if 'users' not in existing:
+        op.create_table(
+            'users',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('first_name', sa.String(length=100), nullable=True),
+            sa.Column('last_name', sa.String(length=100), nullable=True),
+            sa.Column('email', sa.String(length=150), nullable=False),
+            sa.Column('password_hash', sa.Text(), nullable=False),
+            sa.Column('country', sa.String(length=100), nullable=True),
+            sa.Column('city', sa.String(length=100), nullable=True),
+            sa.Column('profile_image_url', sa.Text(), nullable=True),
+            sa.Column('is_google_user', sa.Boolean(), nullable=True),
+            sa.Column('is_admin', sa.Boolean(), nullable=True),
+            sa.PrimaryKeyConstraint('id'),
+            sa.UniqueConstraint('email')
+        )
+    if 'hotels' not in existing:
+        op.create_table(
+            'hotels',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=150), nullable=True),
+            sa.Column('location', sa.String(length=150), nullable=True),
+            sa.Column('price', sa.Float(), nullable=True),
+            sa.Column('rating', sa.Float(), nullable=True),
+            sa.Column('image_url', sa.Text(), nullable=True),
+            sa.Column('latitude', sa.Float(), nullable=True),
+            sa.Column('longitude', sa.Float(), nullable=True),
+            sa.Column('is_flagged', sa.Boolean(), nullable=True),
+            sa.Column('discount_percent', sa.Integer(), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'amenities' not in existing:
+        op.create_table(
+            'amenities',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('name', sa.String(length=100), nullable=True),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'hotel_amenities' not in existing:
+        op.create_table(
+            'hotel_amenities',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('hotel_id', sa.Integer(), nullable=True),
+            sa.Column('amenity_id', sa.Integer(), nullable=True),
+            sa.ForeignKeyConstraint(['amenity_id'], ['amenities.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['hotel_id'], ['hotels.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'comments' not in existing:
+        op.create_table(
+            'comments',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('user_id', sa.Integer(), nullable=True),
+            sa.Column('hotel_id', sa.Integer(), nullable=True),
+            sa.Column('comment', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(), server_default=sa.text('CURRENT_TIMESTAMP'), nullable=True),
+            sa.ForeignKeyConstraint(['hotel_id'], ['hotels.id'], ondelete='CASCADE'),
+            sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'ratings' not in existing:
+        op.create_table(
+            'ratings',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('comment_id', sa.Integer(), nullable=True),
+            sa.Column('cleanliness', sa.Float(), nullable=True),
+            sa.Column('service', sa.Float(), nullable=True),
+            sa.Column('facilities', sa.Float(), nullable=True),
+            sa.Column('location', sa.Float(), nullable=True),
+            sa.Column('eco_friendliness', sa.Float(), nullable=True),
+            sa.ForeignKeyConstraint(['comment_id'], ['comments.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id')
+        )
+    if 'hotel_availabilities' not in existing:
+        op.create_table(
+            'hotel_availabilities',
+            sa.Column('id', sa.Integer(), nullable=False),
+            sa.Column('hotel_id', sa.Integer(), nullable=True),
+            sa.Column('date', sa.Date(), nullable=False),
+            sa.Column('is_available', sa.Boolean(), nullable=True),
+            sa.ForeignKeyConstraint(['hotel_id'], ['hotels.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('id')
+        )
+
+
+def downgrade():
+    op.drop_table('hotel_availabilities')
+    op.drop_table('ratings')
+    op.drop_table('comments')
+    op.drop_table('hotel_amenities')
+    op.drop_table('amenities')
+    op.drop_table('hotels')
+    op.drop_table('users')
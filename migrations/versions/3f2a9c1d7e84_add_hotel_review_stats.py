@@ -0,0 +1,62 @@
+"""add hotel_review_stats table
+
+Revision ID: 3f2a9c1d7e84
+Revises: b63b189a669a
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f2a9c1d7e84'
+down_revision = 'b63b189a669a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    if not sa.inspect(op.get_bind()).has_table('hotel_review_stats'):
+        op.create_table(
+            'hotel_review_stats',
+            sa.Column('hotel_id', sa.Integer(), nullable=False),
+            sa.Column('comment_count', sa.Integer(), nullable=False),
+            sa.Column('rating_count', sa.Integer(), nullable=False),
+            sa.Column('cleanliness_sum', sa.Float(), nullable=False),
+            sa.Column('service_sum', sa.Float(), nullable=False),
+            sa.Column('facilities_sum', sa.Float(), nullable=False),
+            sa.Column('location_sum', sa.Float(), nullable=False),
+            sa.Column('eco_friendliness_sum', sa.Float(), nullable=False),
+            sa.Column('rating_average', sa.Float(), nullable=True),
+            sa.ForeignKeyConstraint(['hotel_id'], ['hotels.id'], ondelete='CASCADE'),
+            sa.PrimaryKeyConstraint('hotel_id')
+        )
+
+    # Mevcut yorumlardan istatistikleri doldur
+    op.execute("DELETE FROM hotel_review_stats")
+    op.execute("""
+        INSERT INTO hotel_review_stats (
+            hotel_id, comment_count, rating_count,
+            cleanliness_sum, service_sum, facilities_sum, location_sum, eco_friendliness_sum,
+            rating_average
+        )
+        SELECT
+            c.hotel_id,
+            COUNT(c.id),
+            COUNT(r.id),
+            COALESCE(SUM(r.cleanliness), 0),
+            COALESCE(SUM(r.service), 0),
+            COALESCE(SUM(r.facilities), 0),
+            COALESCE(SUM(r.location), 0),
+            COALESCE(SUM(r.eco_friendliness), 0),
+            AVG((r.cleanliness + r.service + r.facilities + r.location + r.eco_friendliness) / 5.0)
+        FROM comments c
+        LEFT OUTER JOIN ratings r ON r.comment_id = c.id
+        WHERE c.hotel_id IS NOT NULL
+        GROUP BY c.hotel_id
+    """)
+
+
+def downgrade():
+    op.drop_table('hotel_review_stats')
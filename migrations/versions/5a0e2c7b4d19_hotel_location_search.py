@@ -0,0 +1,106 @@
+"""add normalized location search column with trigram / FTS5 index
+
+Revision ID: 5a0e2c7b4d19
+Revises: d71b5e3a9f06
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+import unicodedata
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5a0e2c7b4d19'
+down_revision = 'd71b5e3a9f06'
+branch_labels = None
+depends_on = None
+
+hotels = sa.table(
+    'hotels',
+    sa.column('id', sa.Integer),
+    sa.column('location', sa.String),
+    sa.column('search_text', sa.String),
+)
+
+# Migration uygulama koduna bağlı kalmasın diye bu revizyondaki hâlleri burada sabit
+SQLITE_SEARCH_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS hotel_search USING fts5(search_text, content='hotels', content_rowid='id')",
+    "CREATE VIRTUAL TABLE IF NOT EXISTS hotel_search_vocab USING fts5vocab(hotel_search, 'row')",
+    "CREATE TRIGGER IF NOT EXISTS hotels_search_ai AFTER INSERT ON hotels BEGIN "
+    "INSERT INTO hotel_search(rowid, search_text) VALUES (new.id, new.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS hotels_search_ad AFTER DELETE ON hotels BEGIN "
+    "INSERT INTO hotel_search(hotel_search, rowid, search_text) VALUES ('delete', old.id, old.search_text); END",
+    "CREATE TRIGGER IF NOT EXISTS hotels_search_au AFTER UPDATE OF search_text ON hotels BEGIN "
+    "INSERT INTO hotel_search(hotel_search, rowid, search_text) VALUES ('delete', old.id, old.search_text); "
+    "INSERT INTO hotel_search(rowid, search_text) VALUES (new.id, new.search_text); END",
+]
+
+
+def _normalize(value):
+    # Küçük harf + aksan katlama: "İzmir, Çeşme" -> "izmir, cesme"
+    if value is None:
+        return None
+    decomposed = unicodedata.normalize("NFKD", value.lower())
+    folded = "".join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return folded.replace("ı", "i")
+
+
+def _sqlite_index_ddl(bind):
+    return dict(bind.execute(sa.text(
+        "SELECT name, sql FROM sqlite_master WHERE type = 'index' AND tbl_name = 'hotels' AND sql IS NOT NULL"
+    )).all())
+
+
+def upgrade():
+    bind = op.get_bind()
+    columns = {c['name'] for c in sa.inspect(bind).get_columns('hotels')}
+    if 'search_text' not in columns:
+        with op.batch_alter_table('hotels', schema=None) as batch_op:
+            batch_op.add_column(sa.Column('search_text', sa.String(length=150), nullable=True))
+
+    # Mevcut konumları normalize et (aksan katlama Python tarafında)
+    rows = [
+        {'hotel_id': hotel_id, 'search_text': _normalize(location)}
+        for hotel_id, location in bind.execute(sa.select(hotels.c.id, hotels.c.location))
+    ]
+    if rows:
+        bind.execute(
+            hotels.update().where(hotels.c.id == sa.bindparam('hotel_id'))
+            .values(search_text=sa.bindparam('search_text')),
+            rows
+        )
+
+    if bind.dialect.name == 'postgresql':
+        op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+        op.execute(
+            "CREATE INDEX IF NOT EXISTS ix_hotels_search_text_trgm "
+            "ON hotels USING gin (search_text gin_trgm_ops)"
+        )
+    elif bind.dialect.name == 'sqlite':
+        for statement in SQLITE_SEARCH_DDL:
+            op.execute(statement)
+        op.execute("INSERT INTO hotel_search(hotel_search) VALUES ('rebuild')")
+
+
+def downgrade():
+    bind = op.get_bind()
+    if bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_hotels_search_text_trgm")
+    elif bind.dialect.name == 'sqlite':
+        for trigger in ('hotels_search_ai', 'hotels_search_ad', 'hotels_search_au'):
+            op.execute(f"DROP TRIGGER IF EXISTS {trigger}")
+        op.execute("DROP TABLE IF EXISTS hotel_search_vocab")
+        op.execute("DROP TABLE IF EXISTS hotel_search")
+        # Batch tabloyu yeniden kurar; ifade / kısmi index'ler yansıtılamadığı için kaybolur
+        saved_indexes = _sqlite_index_ddl(bind)
+
+    with op.batch_alter_table('hotels', schema=None) as batch_op:
+        batch_op.drop_column('search_text')
+
+    if bind.dialect.name == 'sqlite':
+        existing = _sqlite_index_ddl(bind)
+        for name, ddl in saved_indexes.items():
+            if name not in existing:
+                op.execute(ddl)
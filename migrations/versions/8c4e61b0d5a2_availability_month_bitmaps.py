@@ -0,0 +1,97 @@
+"""store hotel availability as monthly bitmaps
+
+Revision ID: 8c4e61b0d5a2
+Revises: 3f2a9c1d7e84
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+from datetime import timedelta
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '8c4e61b0d5a2'
+down_revision = '3f2a9c1d7e84'
+branch_labels = None
+depends_on = None
+
+months = sa.table(
+    'hotel_availability_months',
+    sa.column('hotel_id', sa.Integer),
+    sa.column('month', sa.Date),
+    sa.column('available_mask', sa.Integer),
+)
+
+days = sa.table(
+    'hotel_availabilities',
+    sa.column('hotel_id', sa.Integer),
+    sa.column('date', sa.Date),
+    sa.column('is_available', sa.Boolean),
+)
+
+
+def _create_months_table():
+    op.create_table(
+        'hotel_availability_months',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('hotel_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.Date(), nullable=False),
+        sa.Column('available_mask', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['hotel_id'], ['hotels.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('hotel_id', 'month', name='uq_hotel_availability_months_hotel_month')
+    )
+
+
+def upgrade():
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('hotel_availability_months'):
+        _create_months_table()
+
+    if not inspector.has_table('hotel_availabilities'):
+        return
+
+    # Günlük satırları (otel, ay) başına tek bitmask'e topla
+    masks = {}
+    rows = op.get_bind().execute(
+        sa.select(days.c.hotel_id, days.c.date).where(days.c.is_available == sa.true(), days.c.hotel_id.isnot(None))
+    )
+    for hotel_id, day in rows:
+        key = (hotel_id, day.replace(day=1))
+        masks[key] = masks.get(key, 0) | (1 << (day.day - 1))
+
+    op.execute(months.delete())
+    if masks:
+        op.bulk_insert(months, [
+            {'hotel_id': hotel_id, 'month': month, 'available_mask': mask}
+            for (hotel_id, month), mask in masks.items()
+        ])
+
+    op.drop_table('hotel_availabilities')
+
+
+def downgrade():
+    op.create_table(
+        'hotel_availabilities',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('hotel_id', sa.Integer(), nullable=True),
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('is_available', sa.Boolean(), nullable=True),
+        sa.ForeignKeyConstraint(['hotel_id'], ['hotels.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    rows = []
+    for hotel_id, month, mask in op.get_bind().execute(
+        sa.select(months.c.hotel_id, months.c.month, months.c.available_mask)
+    ):
+        day = month
+        while day.month == month.month:
+            if mask & (1 << (day.day - 1)):
+                rows.append({'hotel_id': hotel_id, 'date': day, 'is_available': True})
+            day += timedelta(days=1)
+    if rows:
+        op.bulk_insert(days, rows)
+
+    op.drop_table('hotel_availability_months')
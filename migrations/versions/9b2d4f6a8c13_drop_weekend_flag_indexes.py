@@ -0,0 +1,43 @@
+"""drop partial indexes on hotels.available_on_weekend
+
+Revision ID: 9b2d4f6a8c13
+Revises: e4b8f2a61c37
+Create Date: 2026-10-19 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b2d4f6a8c13'
+down_revision = 'e4b8f2a61c37'
+branch_labels = None
+depends_on = None
+
+# Haftasonu vitrini artık gerçek müsaitlikten (hotel_availability_months) kuruluyor;
+# available_on_weekend'e göre filtreleyen sorgu kalmadı, bu index'ler yalnızca yazma maliyeti
+WEEKEND_INDEXES = {
+    'ix_hotels_weekend_rating': ['rating'],
+    'ix_hotels_weekend_country_rating': ['country', 'rating'],
+}
+
+
+def _existing_indexes():
+    return {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes('hotels')}
+
+
+def upgrade():
+    existing = _existing_indexes()
+    for name in WEEKEND_INDEXES:
+        if name in existing:
+            op.drop_index(name, table_name='hotels')
+
+
+def downgrade():
+    existing = _existing_indexes()
+    for name, columns in WEEKEND_INDEXES.items():
+        if name not in existing:
+            op.create_index(name, 'hotels', columns, unique=False,
+                            postgresql_where=sa.text('available_on_weekend = true'),
+                            sqlite_where=sa.text('available_on_weekend = 1'))
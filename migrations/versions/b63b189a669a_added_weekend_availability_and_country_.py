@@ -1,7 +1,7 @@
 """added weekend availability and country to Hotel
 
 Revision ID: b63b189a669a
-Revises: 
+Revises: 0c5e9a7f2b11
 Create Date: 2025-06-28 13:15:15.777477
 
 """
@@ -11,16 +11,20 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision = 'b63b189a669a'
-down_revision = None
+down_revision = '0c5e9a7f2b11'
 branch_labels = None
 depends_on = None
 
 
 def upgrade():
+    # create_all ile kurulmuş veri tabanlarında kolonlar zaten olabilir
+    columns = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('hotels')}
     # ### commands auto generated by Alembic - please adjust! ###
     with op.batch_alter_table('hotels', schema=None) as batch_op:
-        batch_op.add_column(sa.Column('available_on_weekend', sa.Boolean(), nullable=True))
-        batch_op.add_column(sa.Column('country', sa.String(length=100), nullable=True))
+        if 'available_on_weekend' not in columns:
+            batch_op.add_column(sa.Column('available_on_weekend', sa.Boolean(), nullable=True))
+        if 'country' not in columns:
+            batch_op.add_column(sa.Column('country', sa.String(length=100), nullable=True))
 
     # ### end Alembic commands ###
 
@@ -0,0 +1,111 @@
+"""add indexes and unique constraints for hot filter/join columns
+
+Revision ID: d71b5e3a9f06
+Revises: 8c4e61b0d5a2
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'd71b5e3a9f06'
+down_revision = '8c4e61b0d5a2'
+branch_labels = None
+depends_on = None
+
+
+def _create_index(name, table, columns, **kw):
+    # create_all ile yeni oluşturulan tablolarda index zaten olabilir
+    existing = {ix['name'] for ix in sa.inspect(op.get_bind()).get_indexes(table)}
+    if name not in existing:
+        op.create_index(name, table, columns, unique=False, **kw)
+
+
+def _dedupe():
+    # Tekil olması beklenen satırlardaki kopyaları temizle; en küçük id kalır
+    deleted_ratings = op.get_bind().execute(sa.text(
+        "DELETE FROM ratings WHERE comment_id IS NOT NULL AND id NOT IN "
+        "(SELECT MIN(id) FROM ratings WHERE comment_id IS NOT NULL GROUP BY comment_id)"
+    )).rowcount
+
+    op.execute(
+        "UPDATE hotel_amenities SET amenity_id = ("
+        "  SELECT MIN(a2.id) FROM amenities a2 WHERE a2.name = ("
+        "    SELECT a1.name FROM amenities a1 WHERE a1.id = hotel_amenities.amenity_id))"
+        " WHERE amenity_id NOT IN (SELECT MIN(id) FROM amenities GROUP BY name)"
+    )
+    op.execute(
+        "DELETE FROM amenities WHERE name IS NOT NULL AND id NOT IN "
+        "(SELECT MIN(id) FROM amenities WHERE name IS NOT NULL GROUP BY name)"
+    )
+    op.execute(
+        "DELETE FROM hotel_amenities WHERE id NOT IN "
+        "(SELECT MIN(id) FROM hotel_amenities GROUP BY hotel_id, amenity_id)"
+    )
+    return deleted_ratings
+
+
+def upgrade():
+    if _dedupe():
+        # Silinen kopya puanlar istatistiklerden de düşülsün
+        op.execute("DELETE FROM hotel_review_stats")
+        op.execute("""
+            INSERT INTO hotel_review_stats (
+                hotel_id, comment_count, rating_count,
+                cleanliness_sum, service_sum, facilities_sum, location_sum, eco_friendliness_sum,
+                rating_average
+            )
+            SELECT
+                c.hotel_id, COUNT(c.id), COUNT(r.id),
+                COALESCE(SUM(r.cleanliness), 0), COALESCE(SUM(r.service), 0), COALESCE(SUM(r.facilities), 0),
+                COALESCE(SUM(r.location), 0), COALESCE(SUM(r.eco_friendliness), 0),
+                AVG((r.cleanliness + r.service + r.facilities + r.location + r.eco_friendliness) / 5.0)
+            FROM comments c
+            LEFT OUTER JOIN ratings r ON r.comment_id = c.id
+            WHERE c.hotel_id IS NOT NULL
+            GROUP BY c.hotel_id
+        """)
+
+    with op.batch_alter_table('ratings', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_ratings_comment_id', ['comment_id'])
+
+    with op.batch_alter_table('amenities', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_amenities_name', ['name'])
+
+    with op.batch_alter_table('hotel_amenities', schema=None) as batch_op:
+        batch_op.create_unique_constraint('uq_hotel_amenities_hotel_amenity', ['hotel_id', 'amenity_id'])
+        batch_op.create_index('ix_hotel_amenities_amenity_id', ['amenity_id'], unique=False)
+
+    _create_index('ix_comments_hotel_id_created_at', 'comments', ['hotel_id', 'created_at', 'id'])
+    _create_index('ix_hotel_availability_months_month_hotel', 'hotel_availability_months',
+                  ['month', 'hotel_id', 'available_mask'])
+
+    _create_index('ix_hotels_rating_sort', 'hotels', [sa.text('coalesce(rating, 0)'), 'id'])
+    _create_index('ix_hotels_price_sort', 'hotels', [sa.text('coalesce(price, 0)'), 'id'])
+    _create_index('ix_hotels_weekend_rating', 'hotels', ['rating'],
+                  postgresql_where=sa.text('available_on_weekend = true'),
+                  sqlite_where=sa.text('available_on_weekend = 1'))
+    _create_index('ix_hotels_weekend_country_rating', 'hotels', ['country', 'rating'],
+                  postgresql_where=sa.text('available_on_weekend = true'),
+                  sqlite_where=sa.text('available_on_weekend = 1'))
+
+
+def downgrade():
+    op.drop_index('ix_hotels_weekend_country_rating', table_name='hotels')
+    op.drop_index('ix_hotels_weekend_rating', table_name='hotels')
+    op.drop_index('ix_hotels_price_sort', table_name='hotels')
+    op.drop_index('ix_hotels_rating_sort', table_name='hotels')
+    op.drop_index('ix_hotel_availability_months_month_hotel', table_name='hotel_availability_months')
+    op.drop_index('ix_comments_hotel_id_created_at', table_name='comments')
+
+    with op.batch_alter_table('hotel_amenities', schema=None) as batch_op:
+        batch_op.drop_index('ix_hotel_amenities_amenity_id')
+        batch_op.drop_constraint('uq_hotel_amenities_hotel_amenity', type_='unique')
+
+    with op.batch_alter_table('amenities', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_amenities_name', type_='unique')
+
+    with op.batch_alter_table('ratings', schema=None) as batch_op:
+        batch_op.drop_constraint('uq_ratings_comment_id', type_='unique')